@@ -18,17 +18,95 @@ CONTROLS:
   [B]         : Slow Motion (Cheat)
   [P]         : Pause
   [R]         : Restart
+  [O]         : Frame Timing Overlay
   [Arrow Keys]: Camera Control
+
+COMMAND LINE:
+  --renderer vbo|immediate : Geometry backend (default: vbo)
+  --headless               : Run AI sessions without a window or OpenGL
+  --runs N / --ticks N     : Headless session count and tick limit
+  --physics-hz HZ          : Fixed simulation rate (default: 120)
+  --seed N                 : Session seed for reproducible runs
+  --record PATH            : Record inputs to a replay file (interactive sessions only)
+  --headless --replay PATH : Replay a recorded session and verify it
+  --concurrent N           : Step N headless sessions side by side in one process
+  --vectorized             : Advance all headless AI runs in lockstep with the NumPy batch engine
+  --log-level LEVEL        : Event log level (DEBUG shows per-entity events)
+  --lod-quality Q          : Sphere/cylinder detail scale (0 = always full detail)
+  --profile-out PATH       : Write stage timings (p50/p95/p99) as .csv or .json on exit
+  --capture PATH           : Render a replay (--replay) or AI run offscreen to PNGs or a video
+  --capture-size WxH       : Capture resolution; --capture-fps, --capture-frames set rate/length
+  --bench [--headless]     : Run benchmark scenarios (offscreen EGL rendering unless headless)
+  --bench-out PATH         : Save benchmark results as JSON
+  --bench-baseline PATH    : Compare against saved results, exit 1 on regression
+  --bench-trials N         : Timed repetitions per scenario; the best one is reported
+  --balance GRID           : Monte Carlo AI runs over a JSON parameter grid (file or inline)
+  --balance-seeds N        : Seeds per parameter combination; --balance-workers sets processes
+  --balance-out PATH       : Save the balance report as .json or .csv
+  --env-bench              : Step vectorized reset/step environments with random actions
+  --env-count N            : Environments for --env-bench; --env-workers sets processes
 """
 
-from OpenGL.GL import *
-from OpenGL.GLU import *
-from OpenGL.GLUT import *
 import math
+import bisect
 import random
 import time
 import sys
-from OpenGL.GLUT import GLUT_BITMAP_HELVETICA_18
+import os
+import ctypes
+import argparse
+import struct
+import atexit
+import logging
+import logging.handlers
+import queue
+import json
+import csv
+import gc
+import tracemalloc
+import itertools
+import multiprocessing
+import multiprocessing.shared_memory
+import copy
+import threading
+import subprocess
+import zlib
+from collections import OrderedDict, deque
+import numpy as np
+
+def sniff_modes(argv):
+    # PYOPENGL_PLATFORM/EGL_PLATFORM must be set before the first OpenGL import, ahead of the real parser.
+    # The value-taking flags are optional here so '--capture PATH' and '--capture=PATH' both count.
+    sniffer = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    for flag in ('--headless', '--env-bench', '--bench'):
+        sniffer.add_argument(flag, action='store_true')
+    for flag in ('--balance', '--capture'):
+        sniffer.add_argument(flag, nargs='?', const='')
+    return sniffer.parse_known_args(argv)[0]
+
+startup_modes = sniff_modes(sys.argv[1:])
+HEADLESS = (startup_modes.headless or startup_modes.balance is not None or startup_modes.env_bench or
+            os.environ.get('CYBER_RUNNER_HEADLESS') == '1')
+OFFSCREEN = not HEADLESS and (startup_modes.bench or startup_modes.capture is not None)
+
+if OFFSCREEN:
+    os.environ.setdefault('PYOPENGL_PLATFORM', 'egl')
+    os.environ.setdefault('EGL_PLATFORM', 'surfaceless')
+
+if not HEADLESS:
+    from OpenGL.GL import *
+    from OpenGL.GLU import *
+    from OpenGL.GLUT import *
+    from OpenGL.GLUT import GLUT_BITMAP_HELVETICA_18
+else:
+    GLUT_LEFT_BUTTON = 0
+    GLUT_RIGHT_BUTTON = 2
+    GLUT_DOWN = 0
+    GLUT_UP = 1
+    GLUT_KEY_LEFT = 100
+    GLUT_KEY_UP = 101
+    GLUT_KEY_RIGHT = 102
+    GLUT_KEY_DOWN = 103
 
 
 WINDOW_WIDTH = 1200
@@ -64,10 +142,237 @@ COMBO_TIMEOUT = 3.0
 VICTORY_SCORE = 5000
 SHIELD_DURATION = 10.0
 SPEED_BOOST_DURATION = 5.0
+PROJECTILE_HIT_RADIUS = 4.0
+PROJECTILE_SPEED = 180.0
+
+INITIAL_OBSTACLE_SPAWN_RATE = 0.02
+MAX_OBSTACLE_SPAWN_RATE = 0.08
+OBSTACLE_SPAWN_RATE_STEP = 0.008
+DIFFICULTY_SCORE_STEP = 500
+
+OBSTACLE_TYPES = ('barrier', 'spike', 'beam', 'hazard', 'crusher')
+COLLECTIBLE_TYPES = ('gem_green', 'gem_blue', 'gem_purple', 'gem_gold', 'shield', 'speed', 'grenade')
+COLLECTIBLE_POINTS = (10, 25, 50, 100, 75, 60, 50)
+POWERUP_TYPES = ('shield', 'speed', 'grenade')
+POWERUP_QUOTA = 2
+POWERUP_QUOTA_DISTANCE = 2000
+POWERUP_QUOTA_CHANCE = 0.6
+EARLY_COLLECTIBLE_ODDS = (
+    ('gem_green', 0.20), ('gem_blue', 0.40), ('gem_purple', 0.55), ('gem_gold', 0.70),
+    ('shield', 0.80), ('speed', 0.90), ('grenade', 1.0),
+)
+LATE_COLLECTIBLE_ODDS = (
+    ('gem_green', 0.15), ('gem_blue', 0.30), ('gem_purple', 0.42), ('gem_gold', 0.52),
+    ('shield', 0.68), ('speed', 0.84), ('grenade', 1.0),
+)
+
+
+class Entity:
+    __slots__ = ('alive',)
+    
+    def __init__(self):
+        self.alive = True
+
+class Obstacle(Entity):
+    __slots__ = ('type', 'x', 'y', 'z', 'hp', 'dir', 'rot', 'phase', 'scale')
+    
+    def __init__(self, obs_type, x, y, z, hp, direction, rot, phase):
+        super().__init__()
+        self.type = obs_type
+        self.x = x
+        self.y = y
+        self.z = z
+        self.hp = hp
+        self.dir = direction
+        self.rot = rot
+        self.phase = phase
+        self.scale = 1.0
+
+class Collectible(Entity):
+    __slots__ = ('type', 'x', 'y', 'z', 'rot')
+    
+    def __init__(self, col_type, x, y, z):
+        super().__init__()
+        self.type = col_type
+        self.x = x
+        self.y = y
+        self.z = z
+        self.rot = 0
+
+class Projectile(Entity):
+    __slots__ = ('type', 'x', 'y', 'z', 'life', 'vy', 'rot')
+    
+    def __init__(self, proj_type, x, y, z, life, vy):
+        super().__init__()
+        self.type = proj_type
+        self.x = x
+        self.y = y
+        self.z = z
+        self.life = life
+        self.vy = vy
+        self.rot = 0
+
+class Building(Entity):
+    __slots__ = ('x', 'z', 'width', 'height', 'color')
+    
+    def __init__(self, x, z, width, height, color):
+        super().__init__()
+        self.x = x
+        self.z = z
+        self.width = width
+        self.height = height
+        self.color = color
+
+class Platform(Entity):
+    __slots__ = ('x', 'y', 'z', 'size', 'rot', 'color')
+    
+    def __init__(self, x, y, z, size, rot, color):
+        super().__init__()
+        self.x = x
+        self.y = y
+        self.z = z
+        self.size = size
+        self.rot = rot
+        self.color = color
+
+class TrackSlot:
+    __slots__ = ('kind', 'at', 'roll', 'params')
+    
+    def __init__(self, kind, at, roll, params):
+        self.kind = kind
+        self.at = at
+        self.roll = roll
+        self.params = params
+
+class TrackChunk:
+    __slots__ = ('index', 'start', 'end', 'slots')
+    
+    def __init__(self, index, start, end, slots):
+        self.index = index
+        self.start = start
+        self.end = end
+        self.slots = slots
+
+class ChunkStream:
+    __slots__ = ('generate', 'seed', 'index')
+    
+    def __init__(self, generate, seed):
+        self.generate = generate
+        self.seed = seed
+        self.index = 0
+    
+    def take(self):
+        chunk = self.generate(self.seed, self.index)
+        self.index += 1
+        return chunk
+
+class GameState:
+    # A global-swap shim, not real encapsulation: the update functions still read and write
+    # module globals, and activate() copies SESSION_GLOBALS out of the live state and into this
+    # one. Only one session is live per process at a time, and swapping is not thread-safe.
+    __slots__ = ('values',)
+    
+    def __init__(self, values=None):
+        self.values = copy.deepcopy(session_defaults) if values is None else values
+    
+    def __getattr__(self, name):
+        if name not in SESSION_GLOBALS:
+            raise AttributeError(name)
+        if active_state is self:
+            return globals()[name]
+        return self.values[name]
+    
+    def activate(self):
+        activate_state(self)
+
+class EntityStore:
+    __slots__ = ('items', 'pending_removal', 'factory', 'capacity', 'free', 'created', 'recycled', 'rejected', 'peak')
+    
+    def __init__(self, factory=None, capacity=None):
+        self.items = []
+        self.pending_removal = False
+        self.factory = factory
+        self.capacity = capacity
+        self.free = []
+        self.created = 0
+        self.recycled = 0
+        self.rejected = 0
+        self.peak = 0
+    
+    def __len__(self):
+        return len(self.items)
+    
+    def __iter__(self):
+        return iter(self.items)
+    
+    def add(self, entity):
+        self.items.append(entity)
+        if len(self.items) > self.peak:
+            self.peak = len(self.items)
+        return entity
+    
+    def spawn(self, *args, **kwargs):
+        if self.capacity is not None and len(self.items) >= self.capacity:
+            self.rejected += 1
+            return None
+        
+        if self.free:
+            entity = self.free.pop()
+            entity.__init__(*args, **kwargs)
+            self.recycled += 1
+        else:
+            entity = self.factory(*args, **kwargs)
+            self.created += 1
+        
+        self.add(entity)
+        return entity
+    
+    def remove(self, entity):
+        if entity.alive:
+            entity.alive = False
+            self.pending_removal = True
+    
+    def compact(self):
+        if self.pending_removal:
+            if self.factory is not None:
+                self.release(entity for entity in self.items if not entity.alive)
+            self.items = [entity for entity in self.items if entity.alive]
+            self.pending_removal = False
+    
+    def release(self, entities):
+        limit = self.capacity if self.capacity is not None else len(self.items)
+        for entity in entities:
+            if len(self.free) >= limit:
+                break
+            self.free.append(entity)
+    
+    def clear(self):
+        for entity in self.items:
+            entity.alive = False
+        if self.factory is not None:
+            self.release(self.items)
+        self.items = []
+        self.pending_removal = False
+    
+    def stats(self):
+        return {
+            'live': len(self.items),
+            'free': len(self.free),
+            'capacity': self.capacity,
+            'peak': self.peak,
+            'created': self.created,
+            'recycled': self.recycled,
+            'rejected': self.rejected,
+        }
 
 
 game_state = "menu"
+game_clock = time.time
 last_time = 0
+sim_tick = 0
+sim_time = 0.0
+session_seed = 0
+rng = random.Random()
 dt_accumulator = 0.0
 current_speed = INITIAL_SPEED
 total_distance = 0.0
@@ -103,23 +408,64 @@ player_perfect_dodge_count = 0
 combo_multiplier = 1
 combo_last_collect_time = 0.0
 
-obstacles = []
-collectibles = []
-projectiles = []
-particles = []
-environment_buildings = []
+OBSTACLE_CAPACITY = 64
+COLLECTIBLE_CAPACITY = 32
+PROJECTILE_CAPACITY = 128
+obstacles = EntityStore(Obstacle, OBSTACLE_CAPACITY)
+collectibles = EntityStore(Collectible, COLLECTIBLE_CAPACITY)
+projectiles = EntityStore(Projectile, PROJECTILE_CAPACITY)
+environment_buildings = EntityStore()
 environment_stars = []
-floating_platforms = []
+floating_platforms = EntityStore()
 
 difficulty_level = 1
 obstacle_spawn_rate = 0.04
+
+TRACK_CHUNK_LENGTH = 100.0
+TRACK_SLOT_SPACING = 20.0
+TRACK_SPAWN_DISTANCE = 600.0
+TRACK_OBSTACLE_DENSITY = 3.0
+TRACK_COLLECTIBLE_CHANCE = 0.5
+TRACK_OBSTACLE_LIMIT = 8
+TRACK_COLLECTIBLE_LIMIT = 6
+SCENERY_SPAWN_DISTANCE = 850.0
+SCENERY_BUILDINGS_PER_CHUNK = 4
+track_stream = None
+track_slots = deque()
+track_loaded = 0.0
+scenery_stream = None
+scenery_slots = deque()
+scenery_loaded = 0.0
+scenery_distance = 0.0
 last_speed_up_score = 0
 
 player_god_mode = False
 slow_motion = False
 
+PLANNER_HORIZON = 1.2
+PLANNER_BIN = 0.05
+PLANNER_DEPTH = 3
+PLANNER_MARGIN = 0.5
+PLANNER_CLEARANCE = 0.25
+PLANNER_LANE_LEAD = 0.25
+PLANNER_SLIDE_LEAD = 0.02
+PLANNER_ACTIONS = ('left', 'right', 'jump', 'slide')
+PLANNER_RESPONSES = {
+    'barrier': ('left', 'right', 'jump'),
+    'spike': ('jump', 'left', 'right'),
+    'beam': ('slide', 'left', 'right'),
+    'hazard': ('left', 'right', 'jump'),
+    'crusher': ('jump', 'left', 'right'),
+}
+PLANNER_CELL_CODES = len(OBSTACLE_TYPES) + 1
+planner_motion = {}
+ai_grid = None
+ai_plan = ()
+
 stats_obstacles_dodged = 0
 stats_gems_collected = 0
+stats_hits_by_type = {}
+stats_killed_by = None
 
 shield_spawn_count = 0
 speed_spawn_count = 0
@@ -128,6 +474,197 @@ grenade_spawn_count = 0
 on_screen_messages = []
 MESSAGE_DISPLAY_DURATION = 2.5
 
+PHYSICS_HZ = 120.0
+MAX_FRAME_TIME = 0.1
+physics_step = 1.0 / PHYSICS_HZ
+render_alpha = 1.0
+last_distance_delta = 0.0
+prev_player_x = 0.0
+prev_player_y = 0.0
+view_player_x = 0.0
+view_player_y = 0.0
+
+PARTICLE_CAPACITY = 2048
+particle_positions = np.zeros((PARTICLE_CAPACITY, 3))
+particle_velocities = np.zeros((PARTICLE_CAPACITY, 3))
+particle_life = np.zeros(PARTICLE_CAPACITY)
+particle_colors = np.zeros((PARTICLE_CAPACITY, 3))
+particle_count = 0
+particle_peak = 0
+particles_dropped = 0
+particle_rng = np.random.default_rng()
+
+SESSION_GLOBALS = (
+    'game_state', 'game_clock', 'last_time', 'sim_tick', 'sim_time', 'session_seed', 'rng', 'dt_accumulator',
+    'current_speed', 'total_distance', 'current_score', 'loading_countdown',
+    'camera_mode', 'camera_offset_y', 'camera_rotation', 'camera_cinematic_angle',
+    'player_x', 'player_y', 'player_z', 'player_lane_index', 'player_velocity_y',
+    'player_is_jumping', 'player_is_sliding', 'player_slide_timer', 'player_health', 'player_grenades',
+    'player_cheat_mode', 'player_has_shield', 'player_shield_timer',
+    'player_speed_boost_active', 'player_speed_boost_timer', 'player_charging', 'player_charge_start_time',
+    'player_animation_phase', 'player_damage_flash', 'player_perfect_dodge_count',
+    'combo_multiplier', 'combo_last_collect_time',
+    'obstacles', 'collectibles', 'projectiles', 'environment_buildings', 'environment_stars', 'floating_platforms',
+    'difficulty_level', 'obstacle_spawn_rate', 'last_speed_up_score',
+    'track_stream', 'track_slots', 'track_loaded', 'scenery_stream', 'scenery_slots', 'scenery_loaded', 'scenery_distance',
+    'player_god_mode', 'slow_motion', 'ai_grid', 'ai_plan',
+    'stats_obstacles_dodged', 'stats_gems_collected', 'stats_hits_by_type', 'stats_killed_by',
+    'shield_spawn_count', 'speed_spawn_count', 'grenade_spawn_count', 'on_screen_messages',
+    'render_alpha', 'last_distance_delta', 'prev_player_x', 'prev_player_y', 'view_player_x', 'view_player_y',
+    'particle_positions', 'particle_velocities', 'particle_life', 'particle_colors',
+    'particle_count', 'particle_peak', 'particles_dropped', 'particle_rng',
+)
+SESSION_BATCH_TICKS = 120
+BATCH_COMPACT_TICKS = 240
+BATCH_COMPACT_FRACTION = 0.25
+
+def capture_state():
+    module = globals()
+    return {name: module[name] for name in SESSION_GLOBALS}
+
+def activate_state(state):
+    global active_state
+    
+    if state is active_state:
+        return
+    active_state.values = capture_state()
+    globals().update(state.values)
+    active_state = state
+
+session_defaults = copy.deepcopy(capture_state())
+active_state = GameState(capture_state())
+
+REPLAY_MAGIC = b'CRRP'
+REPLAY_VERSION = 6
+REPLAY_HEADER = struct.Struct('<4sHId')
+REPLAY_EVENT = struct.Struct('<IBBB')
+REPLAY_FOOTER = struct.Struct('<dd')
+INPUT_KEY = 0
+INPUT_SPECIAL = 1
+INPUT_MOUSE = 2
+INPUT_END = 255
+replay_file = None
+
+ENV_ACTIONS = ('noop', 'left', 'right', 'jump', 'slide', 'shoot', 'grenade')
+ENV_ACTION_INPUTS = (
+    (),
+    ((INPUT_KEY, ord('a'), 0),),
+    ((INPUT_KEY, ord('d'), 0),),
+    ((INPUT_KEY, ord(' '), 0),),
+    ((INPUT_KEY, ord('s'), 0),),
+    ((INPUT_MOUSE, GLUT_LEFT_BUTTON, GLUT_DOWN), (INPUT_MOUSE, GLUT_LEFT_BUTTON, GLUT_UP)),
+    ((INPUT_MOUSE, GLUT_RIGHT_BUTTON, GLUT_DOWN),),
+)
+ENV_FRAME_SKIP = 4
+ENV_MAX_TICKS = 36000
+ENV_HIT_PENALTY = 100.0
+ENV_PLAYER_FEATURES = 12
+ENV_OCCUPANCY_BINS = 12
+ENV_OCCUPANCY_RANGE = 300.0
+ENV_OBSTACLE_FEATURES = 4 + len(OBSTACLE_TYPES)
+ENV_COLLECTIBLE_FEATURES = 3 + len(COLLECTIBLE_TYPES)
+ENV_OCCUPANCY_OFFSET = ENV_PLAYER_FEATURES
+ENV_OBSTACLE_OFFSET = ENV_OCCUPANCY_OFFSET + 3 * ENV_OCCUPANCY_BINS
+ENV_COLLECTIBLE_OFFSET = ENV_OBSTACLE_OFFSET + TRACK_OBSTACLE_LIMIT * ENV_OBSTACLE_FEATURES
+ENV_OBSERVATION_SIZE = ENV_COLLECTIBLE_OFFSET + TRACK_COLLECTIBLE_LIMIT * ENV_COLLECTIBLE_FEATURES
+ENV_BUFFERS = (
+    ('observations', np.float32, (ENV_OBSERVATION_SIZE,)),
+    ('final_observations', np.float32, (ENV_OBSERVATION_SIZE,)),
+    ('rewards', np.float32, ()),
+    ('terminated', np.bool_, ()),
+    ('truncated', np.bool_, ()),
+    ('actions', np.int32, ()),
+)
+ENV_BUFFER_ALIGN = 64
+ENV_BENCH_STEPS = 2000
+ENV_BENCH_COUNT = 8
+
+MESH_CACHE_SIZE = 512
+MESH_COLOR_STEPS = 64
+mesh_cache = OrderedDict()
+
+HUD_FONT_GLYPHS = 128
+HUD_TEXT_CACHE_SIZE = 256
+glyph_list_base = None
+text_cache = OrderedDict()
+
+RENDER_BACKENDS = ('vbo', 'immediate')
+VERTEX_STRIDE = 24
+render_backend = 'immediate'
+stream_buffer = None
+bound_buffer = None
+geometry_cache = {}
+
+CULL_RADII = {
+    'barrier': 6.0, 'spike': 4.5, 'beam': 16.1, 'crusher': 5.6, 'hazard': 1.5,
+    'gem_green': 1.0, 'gem_blue': 1.0, 'gem_purple': 1.0, 'gem_gold': 1.2,
+    'shield': 1.6, 'speed': 1.8, 'grenade': 1.6, 'laser': 2.0, 'charge': 1.2,
+}
+CUBE_BOUNDING_RADIUS = 0.87
+view_frustum = None
+cull_stats = {}
+
+LOD_LEVELS = (4, 6, 8, 10, 12)
+LOD_EDGE_PIXELS = 6.0
+lod_quality = 1.0
+lod_pixel_scale = None
+camera_eye = None
+lod_distance = None
+lod_scale = 1.0
+lod_stats = {}
+
+LOG_FORMAT = '[%(category)s] %(message)s'
+LOG_RATE = 20.0
+LOG_BURST = 40.0
+LOG_CATEGORY_RATES = {'DEBUG': 2.0, 'COLLECTIBLE': 5.0, 'MESSAGE': 5.0}
+LOG_CATEGORY_LEVELS = {
+    'DEBUG': logging.DEBUG,
+    'COLLECTIBLE': logging.DEBUG,
+    'COLLECT': logging.DEBUG,
+    'SPAWN': logging.DEBUG,
+    'SCORE': logging.DEBUG,
+    'COMBO': logging.DEBUG,
+    'BENCH': logging.WARNING,
+}
+log = logging.getLogger('cyber_runner')
+log.addHandler(logging.NullHandler())
+log_queue = queue.Queue()
+log_listener = None
+
+PROFILE_WINDOW = 600
+PROFILE_PERCENTILES = (50, 95, 99)
+profile_scopes = {}
+profile_enabled = True
+profile_overlay = False
+profile_last_frame = None
+
+BENCH_TICKS = 3000
+BENCH_FRAMES = 300
+BENCH_ALLOC_TICKS = 600
+BENCH_WIDTH = 640
+BENCH_HEIGHT = 480
+BENCH_TOLERANCE = 0.10
+BENCH_TRIALS = 3
+BENCH_NOISE_FLOOR_MS = 0.05
+BENCH_SETTINGS = ('bench_ticks', 'bench_frames', 'seed', 'physics_hz', 'renderer', 'bench_trials')
+BENCH_DENSE_OBSTACLES = 48
+BENCH_STORM_PARTICLES = 500
+BENCH_STORM_INTERVAL = 30
+BENCH_CRASH_INTERVAL = 240
+BENCH_GATES = {
+    'ticks_per_sec': 1,
+    'tick_p95_ms': -1,
+    'frames_per_sec': 1,
+    'frame_p95_ms': -1,
+}
+
+CAPTURE_FPS = 60.0
+CAPTURE_QUEUE_DEPTH = 16
+CAPTURE_PNG_WRITERS = 2
+CAPTURE_PNG_LEVEL = 1
+CAPTURE_FFMPEG = 'ffmpeg'
+CAPTURE_VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.webm', '.mov', '.avi')
+
 
 def lerp(a, b, t):
     return a + (b - a) * t
@@ -138,34 +675,189 @@ def clamp(value, min_val, max_val):
 def distance_3d(x1, y1, z1, x2, y2, z2):
     return math.sqrt((x2-x1)**2 + (y2-y1)**2 + (z2-z1)**2)
 
+def swept_gap(gap, travel):
+    return max(0.0, gap - travel, -gap)
+
 def color_lerp(c1, c2, t):
     return (lerp(c1[0], c2[0], t), lerp(c1[1], c2[1], t), lerp(c1[2], c2[2], t))
 
+def game_time():
+    return game_clock()
+
+def set_game_clock(clock):
+    global game_clock
+    game_clock = clock
+
+class RateLimitFilter(logging.Filter):
+    def __init__(self):
+        super().__init__()
+        self.buckets = {}
+    
+    def filter(self, record):
+        category = getattr(record, 'category', record.levelname)
+        rate = LOG_CATEGORY_RATES.get(category, LOG_RATE)
+        burst = max(1.0, min(LOG_BURST, rate * 2))
+        now = time.monotonic()
+        tokens, last, suppressed = self.buckets.get(category, (burst, now, 0))
+        tokens = min(burst, tokens + (now - last) * rate)
+        
+        if tokens < 1.0:
+            self.buckets[category] = (tokens, now, suppressed + 1)
+            return False
+        
+        if suppressed:
+            record.msg = f"{record.getMessage()} (+{suppressed} suppressed)"
+            record.args = None
+        self.buckets[category] = (tokens - 1.0, now, 0)
+        return True
+
+def init_logging(level=logging.INFO, stream=None):
+    global log_listener
+    shutdown_logging()
+    
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter())
+    output = logging.StreamHandler(stream if stream is not None else sys.stdout)
+    output.setFormatter(logging.Formatter(LOG_FORMAT))
+    
+    log.handlers[:] = [queue_handler]
+    log.setLevel(level)
+    log.propagate = False
+    log_listener = logging.handlers.QueueListener(log_queue, output)
+    log_listener.start()
+
+def shutdown_logging():
+    global log_listener
+    if log_listener is not None:
+        log_listener.stop()
+        log_listener = None
+
+atexit.register(shutdown_logging)
+
+def flush_logging():
+    if log_listener is not None:
+        log_queue.join()
+
+def log_enabled(category):
+    return log.isEnabledFor(LOG_CATEGORY_LEVELS.get(category, logging.INFO))
+
+def log_event(category, message):
+    level = LOG_CATEGORY_LEVELS.get(category, logging.INFO)
+    if log.isEnabledFor(level):
+        log.log(level, message, extra={'category': category})
+
+class ProfileScope:
+    __slots__ = ('name', 'start', 'samples', 'count', 'total_ms', 'max_ms')
+    
+    def __init__(self, name):
+        self.name = name
+        self.start = None
+        self.samples = deque(maxlen=PROFILE_WINDOW)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+    
+    def __enter__(self):
+        if profile_enabled:
+            self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if self.start is not None:
+            self.record((time.perf_counter() - self.start) * 1000.0)
+            self.start = None
+        return False
+    
+    def record(self, ms):
+        self.samples.append(ms)
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+def profile_scope(name):
+    scope = profile_scopes.get(name)
+    if scope is None:
+        scope = profile_scopes[name] = ProfileScope(name)
+    return scope
+
+def reset_profile():
+    global profile_last_frame
+    profile_scopes.clear()
+    profile_last_frame = None
+
+def profile_summary():
+    summary = []
+    for name in sorted(profile_scopes):
+        scope = profile_scopes[name]
+        if not scope.count:
+            continue
+        window = np.fromiter(scope.samples, dtype=np.float64, count=len(scope.samples))
+        p50, p95, p99 = np.percentile(window, PROFILE_PERCENTILES)
+        summary.append({
+            'stage': name,
+            'count': scope.count,
+            'mean_ms': scope.total_ms / scope.count,
+            'p50_ms': float(p50),
+            'p95_ms': float(p95),
+            'p99_ms': float(p99),
+            'max_ms': scope.max_ms,
+        })
+    return summary
+
+def export_profile(path):
+    summary = profile_summary()
+    if path.endswith('.json'):
+        with open(path, 'w') as f:
+            json.dump({'window': PROFILE_WINDOW, 'stages': summary}, f, indent=2)
+    else:
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=['stage', 'count', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'])
+            writer.writeheader()
+            writer.writerows(summary)
+    log_event('PROFILE', f"Wrote {len(summary)} stage timings to {path}")
+
 def show_message(message):
     global on_screen_messages
-    on_screen_messages.append((message, time.time()))
-    print(f"[MESSAGE] {message}")
+    on_screen_messages.append((message, game_time()))
+    log_event('MESSAGE', f"{message}")
 
 
-def init_game():
+def seed_session(seed):
+    global session_seed, particle_rng, ai_grid, ai_plan
+    
+    session_seed = seed
+    rng.seed(seed)
+    particle_rng = np.random.default_rng(seed)
+    ai_grid = None
+    ai_plan = ()
+
+def init_game(seed=None):
     global game_state, current_speed, total_distance, current_score, last_time
-    global obstacles, collectibles, projectiles, particles
+    global particle_count
     global environment_buildings, floating_platforms
     global difficulty_level, obstacle_spawn_rate, last_speed_up_score
     global combo_multiplier, combo_last_collect_time
-    global stats_obstacles_dodged, stats_gems_collected
+    global stats_obstacles_dodged, stats_gems_collected, stats_hits_by_type, stats_killed_by
     global loading_countdown, player_perfect_dodge_count
-    global on_screen_messages
+    global on_screen_messages, dt_accumulator, render_alpha, last_distance_delta
+    
+    if seed is None:
+        seed = rng.randrange(2**32)
+    seed_session(seed)
     
     game_state = "menu"
     current_speed = INITIAL_SPEED
     total_distance = 0.0
     current_score = 0
-    last_time = time.time()
+    last_time = game_time()
     loading_countdown = 3.0
+    dt_accumulator = 0.0
+    render_alpha = 1.0
+    last_distance_delta = 0.0
     
     difficulty_level = 1
-    obstacle_spawn_rate = 0.02
+    obstacle_spawn_rate = INITIAL_OBSTACLE_SPAWN_RATE
     last_speed_up_score = 0
     
     combo_multiplier = 1
@@ -173,6 +865,8 @@ def init_game():
     
     stats_obstacles_dodged = 0
     stats_gems_collected = 0
+    stats_hits_by_type = {}
+    stats_killed_by = None
     player_perfect_dodge_count = 0
     
     global shield_spawn_count, speed_spawn_count, grenade_spawn_count
@@ -184,15 +878,16 @@ def init_game():
     
     reset_player()
     
-    obstacles = []
-    collectibles = []
-    projectiles = []
-    particles = []
-    environment_buildings = []
-    floating_platforms = []
+    obstacles.clear()
+    collectibles.clear()
+    projectiles.clear()
+    particle_count = 0
+    environment_buildings = EntityStore()
+    floating_platforms = EntityStore()
     
+    start_streams(seed)
     init_environment()
-    print("[INIT] Game Initialized Successfully")
+    log_event('INIT', f"Game Initialized Successfully (seed {seed})")
 
 def reset_player():
     global player_x, player_y, player_z, player_lane_index
@@ -200,6 +895,7 @@ def reset_player():
     global player_health, player_grenades, player_has_shield
     global player_damage_flash, player_animation_phase
     global player_shield_timer, player_speed_boost_active, player_speed_boost_timer
+    global prev_player_x, prev_player_y
     
     player_x = 0.0
     player_y = 0.0
@@ -216,160 +912,445 @@ def reset_player():
     player_speed_boost_timer = 0.0
     player_damage_flash = 0.0
     player_animation_phase = 0.0
+    prev_player_x = 0.0
+    prev_player_y = 0.0
 
 def init_environment():
     global environment_stars, environment_buildings, floating_platforms
     
     environment_stars = []
-    environment_buildings = []
-    floating_platforms = []
+    environment_buildings = EntityStore()
+    floating_platforms = EntityStore()
     
     for i in range(300):
         star = {
-            'x': random.uniform(-400, 400),
-            'y': random.uniform(50, 250),
-            'z': random.uniform(-100, -800),
-            'size': random.uniform(1.5, 4.0),
-            'brightness': random.uniform(0.5, 1.0)
+            'x': rng.uniform(-400, 400),
+            'y': rng.uniform(50, 250),
+            'z': rng.uniform(-100, -800),
+            'size': rng.uniform(1.5, 4.0),
+            'brightness': rng.uniform(0.5, 1.0)
         }
         environment_stars.append(star)
     
-    for i in range(40):
-        spawn_building(initial=True)
+    stream_scenery()
     
     for i in range(20):
         spawn_floating_platform(initial=True)
 
 
-def draw_triangle_cube(x, y, z, size, color):
-    s = size / 2.0
+def quantize_color(color):
+    return tuple(round(c * MESH_COLOR_STEPS) / MESH_COLOR_STEPS for c in color)
+
+def init_renderer(backend):
+    global render_backend, stream_buffer
     
-    glPushMatrix()
-    glTranslatef(x, y, z)
+    if backend == 'vbo' and not bool(glGenBuffers):
+        log_event('RENDER', "Vertex buffers unavailable, falling back to immediate mode")
+        backend = 'immediate'
     
-    v = [
-        (-s, -s, -s), (s, -s, -s), (s, s, -s), (-s, s, -s),
-        (-s, -s, s), (s, -s, s), (s, s, s), (-s, s, s)
-    ]
+    render_backend = backend
     
-    glBegin(GL_TRIANGLES)
+    if render_backend == 'vbo':
+        stream_buffer = glGenBuffers(1)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
     
-    glColor3f(color[0], color[1], color[2])
-    glVertex3f(*v[4]); glVertex3f(*v[5]); glVertex3f(*v[6])
-    glVertex3f(*v[4]); glVertex3f(*v[6]); glVertex3f(*v[7])
+    log_event('RENDER', f"Using {render_backend} backend")
+
+def pack_vertices(vertices, colors):
+    return np.ascontiguousarray(np.hstack([vertices, colors]), dtype=np.float32)
+
+def bind_vertex_buffer(buffer_id):
+    global bound_buffer
     
-    dark = tuple(c * 0.4 for c in color)
-    glColor3f(*dark)
-    glVertex3f(*v[0]); glVertex3f(*v[3]); glVertex3f(*v[2])
-    glVertex3f(*v[0]); glVertex3f(*v[2]); glVertex3f(*v[1])
+    if buffer_id == bound_buffer:
+        return
     
-    light = tuple(min(1.0, c * 1.2) for c in color)
-    glColor3f(*light)
-    glVertex3f(*v[3]); glVertex3f(*v[7]); glVertex3f(*v[6])
-    glVertex3f(*v[3]); glVertex3f(*v[6]); glVertex3f(*v[2])
+    glBindBuffer(GL_ARRAY_BUFFER, buffer_id)
+    glVertexPointer(3, GL_FLOAT, VERTEX_STRIDE, ctypes.c_void_p(0))
+    glColorPointer(3, GL_FLOAT, VERTEX_STRIDE, ctypes.c_void_p(12))
+    bound_buffer = buffer_id
+
+def emit_geometry(primitive, vertices, colors):
+    glBegin(primitive)
+    for vertex, color in zip(vertices.tolist(), colors.tolist()):
+        glColor3f(*color)
+        glVertex3f(*vertex)
+    glEnd()
+
+def create_mesh(primitive, vertices, colors):
+    if render_backend == 'vbo':
+        data = pack_vertices(vertices, colors)
+        buffer_id = glGenBuffers(1)
+        bind_vertex_buffer(buffer_id)
+        glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_STATIC_DRAW)
+        return ('vbo', primitive, buffer_id, len(data))
+    
+    display_list = glGenLists(1)
+    glNewList(display_list, GL_COMPILE)
+    emit_geometry(primitive, vertices, colors)
+    glEndList()
+    return ('list', display_list)
+
+def draw_mesh(mesh):
+    if mesh[0] == 'vbo':
+        _, primitive, buffer_id, count = mesh
+        bind_vertex_buffer(buffer_id)
+        glDrawArrays(primitive, 0, count)
+    else:
+        glCallList(mesh[1])
+
+def delete_mesh(mesh):
+    global bound_buffer
     
-    glColor3f(*dark)
-    glVertex3f(*v[0]); glVertex3f(*v[1]); glVertex3f(*v[5])
-    glVertex3f(*v[0]); glVertex3f(*v[5]); glVertex3f(*v[4])
+    if mesh[0] == 'vbo':
+        glDeleteBuffers(1, [mesh[2]])
+        bound_buffer = None
+    else:
+        glDeleteLists(mesh[1], 1)
+
+def submit_geometry(primitive, vertices, colors):
+    if render_backend != 'vbo':
+        emit_geometry(primitive, vertices, colors)
+        return
     
-    med = tuple(c * 0.7 for c in color)
-    glColor3f(*med)
-    glVertex3f(*v[1]); glVertex3f(*v[2]); glVertex3f(*v[6])
-    glVertex3f(*v[1]); glVertex3f(*v[6]); glVertex3f(*v[5])
+    data = pack_vertices(vertices, colors)
+    bind_vertex_buffer(stream_buffer)
+    glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_STREAM_DRAW)
+    glDrawArrays(primitive, 0, len(data))
+
+def draw_cached_mesh(key, geometry_func, *args):
+    mesh = mesh_cache.get(key)
     
-    glColor3f(*med)
-    glVertex3f(*v[0]); glVertex3f(*v[4]); glVertex3f(*v[7])
-    glVertex3f(*v[0]); glVertex3f(*v[7]); glVertex3f(*v[3])
+    if mesh is None:
+        mesh = create_mesh(*geometry_func(*args))
+        mesh_cache[key] = mesh
+        
+        if len(mesh_cache) > MESH_CACHE_SIZE:
+            _, evicted = mesh_cache.popitem(last=False)
+            delete_mesh(evicted)
+    else:
+        mesh_cache.move_to_end(key)
     
-    glEnd()
-    glPopMatrix()
+    draw_mesh(mesh)
 
-def draw_triangle_sphere(radius, slices, stacks, color):
-    glBegin(GL_TRIANGLES)
+def cube_face_colors(tints):
+    tints = np.asarray(tints, dtype=np.float32)
+    dark = tints * 0.4
+    light = np.minimum(1.0, tints * 1.2)
+    med = tints * 0.7
+    shades = np.stack([tints, dark, light, dark, med, med], axis=-2)
+    return np.repeat(shades, 6, axis=-2)
+
+def cube_geometry(color):
+    s = 0.5
     
-    for i in range(stacks):
-        lat0 = math.pi * (-0.5 + float(i) / stacks)
-        z0 = math.sin(lat0)
-        zr0 = math.cos(lat0)
-        
-        lat1 = math.pi * (-0.5 + float(i + 1) / stacks)
-        z1 = math.sin(lat1)
-        zr1 = math.cos(lat1)
-        
-        for j in range(slices):
-            lng0 = 2 * math.pi * float(j) / slices
-            x0 = math.cos(lng0)
-            y0 = math.sin(lng0)
-            
-            lng1 = 2 * math.pi * float(j + 1) / slices
-            x1 = math.cos(lng1)
-            y1 = math.sin(lng1)
-            
-            v1 = (x0 * zr0 * radius, y0 * zr0 * radius, z0 * radius)
-            v2 = (x0 * zr1 * radius, y0 * zr1 * radius, z1 * radius)
-            v3 = (x1 * zr0 * radius, y1 * zr0 * radius, z0 * radius)
-            v4 = (x1 * zr1 * radius, y1 * zr1 * radius, z1 * radius)
-            
-            shade = 0.6 + 0.4 * z0
-            glColor3f(color[0] * shade, color[1] * shade, color[2] * shade)
-            
-            glVertex3f(*v1); glVertex3f(*v2); glVertex3f(*v3)
-            glVertex3f(*v3); glVertex3f(*v2); glVertex3f(*v4)
+    v = np.array([
+        (-s, -s, -s), (s, -s, -s), (s, s, -s), (-s, s, -s),
+        (-s, -s, s), (s, -s, s), (s, s, s), (-s, s, s)
+    ], dtype=np.float32)
+    
+    faces = [
+        (4, 5, 6, 4, 6, 7),
+        (0, 3, 2, 0, 2, 1),
+        (3, 7, 6, 3, 6, 2),
+        (0, 1, 5, 0, 5, 4),
+        (1, 2, 6, 1, 6, 5),
+        (0, 4, 7, 0, 7, 3),
+    ]
     
-    glEnd()
+    vertices = v[[i for face in faces for i in face]]
+    return GL_TRIANGLES, vertices, cube_face_colors(color)
 
-def draw_triangle_cylinder(base_radius, top_radius, height, slices, color):
-    glBegin(GL_TRIANGLES)
+def sphere_geometry(slices, stacks, color):
+    lat = math.pi * (-0.5 + np.arange(stacks + 1) / stacks)
+    lng = 2 * math.pi * np.arange(slices + 1) / slices
+    ring_z = np.sin(lat)
+    ring_r = np.cos(lat)
+    
+    i, j = np.meshgrid(np.arange(stacks), np.arange(slices), indexing='ij')
+    
+    def ring_point(lat_index, lng_index):
+        return np.stack([np.cos(lng[lng_index]) * ring_r[lat_index],
+                         np.sin(lng[lng_index]) * ring_r[lat_index],
+                         ring_z[lat_index]], axis=-1)
+    
+    v1 = ring_point(i, j)
+    v2 = ring_point(i + 1, j)
+    v3 = ring_point(i, j + 1)
+    v4 = ring_point(i + 1, j + 1)
+    vertices = np.stack([v1, v2, v3, v3, v2, v4], axis=2).reshape(-1, 3)
+    
+    shade = 0.6 + 0.4 * ring_z[i]
+    colors = np.repeat((shade[..., None] * np.array(color)).reshape(-1, 3), 6, axis=0)
+    return GL_TRIANGLES, vertices.astype(np.float32), colors.astype(np.float32)
+
+def cylinder_geometry(base_radius, top_radius, height, slices, color):
+    theta = 2.0 * math.pi * np.arange(slices + 1) / slices
+    cos_t = np.cos(theta)
+    sin_t = np.sin(theta)
+    zeros = np.zeros(slices + 1)
+    
+    base = np.stack([base_radius * cos_t, base_radius * sin_t, zeros], axis=-1)
+    top = np.stack([top_radius * cos_t, top_radius * sin_t, zeros + height], axis=-1)
+    b1, b2 = base[:-1], base[1:]
+    t1, t2 = top[:-1], top[1:]
+    base_center = np.zeros_like(b1)
+    top_center = np.zeros_like(t1)
+    top_center[:, 2] = height
+    
+    parts = [b1, b2, t1, b2, t2, t1, base_center, b2, b1]
+    if top_radius > 0:
+        parts += [top_center, t1, t2]
+    vertices = np.stack(parts, axis=1).reshape(-1, 3)
+    
+    shade = 0.5 + 0.5 * cos_t[:-1]
+    side = shade[:, None, None] * np.array(color)
+    dark = np.broadcast_to(np.array(color) * 0.3, (slices, len(parts) - 6, 3))
+    colors = np.concatenate([np.broadcast_to(side, (slices, 6, 3)), dark], axis=1).reshape(-1, 3)
+    return GL_TRIANGLES, vertices.astype(np.float32), colors.astype(np.float32)
+
+def cached_geometry(key, geometry_func, *args):
+    geometry = geometry_cache.get(key)
+    if geometry is None:
+        geometry = geometry_func(*args)
+        geometry_cache[key] = geometry
+    return geometry
+
+def group_by_type(entities):
+    groups = {}
+    for entity in entities:
+        groups.setdefault(entity.type, []).append(entity)
+    return groups
+
+def column(entities, key):
+    return np.fromiter((getattr(entity, key) for entity in entities), dtype=np.float64, count=len(entities))
+
+def update_view_frustum():
+    global view_frustum
+    
+    projection = np.array(glGetDoublev(GL_PROJECTION_MATRIX), dtype=np.float64).reshape(4, 4).T
+    modelview = np.array(glGetDoublev(GL_MODELVIEW_MATRIX), dtype=np.float64).reshape(4, 4).T
+    clip = projection @ modelview
+    
+    planes = np.array([
+        clip[3] + clip[0], clip[3] - clip[0],
+        clip[3] + clip[1], clip[3] - clip[1],
+        clip[3] + clip[2], clip[3] - clip[2],
+    ])
+    view_frustum = planes / np.linalg.norm(planes[:, :3], axis=1)[:, None]
+    cull_stats.clear()
+    update_lod_scale(projection, modelview)
+
+def update_lod_scale(projection, modelview):
+    global lod_pixel_scale, camera_eye, lod_distance
+    viewport_height = glGetIntegerv(GL_VIEWPORT)[3]
+    lod_pixel_scale = projection[1, 1] * viewport_height / 2.0
+    camera_eye = tuple((-modelview[:3, :3].T @ modelview[:3, 3]).tolist())
+    lod_distance = None
+    lod_stats.clear()
+
+def set_lod_origin(x, y, z, scale=1.0):
+    global lod_distance, lod_scale
+    lod_distance = math.dist(camera_eye, (x, y, z)) if camera_eye is not None else None
+    lod_scale = scale
+
+def lod_segments(distances, radii, max_segments):
+    if lod_pixel_scale is None or lod_quality <= 0:
+        return np.full(len(distances), max_segments)
+    pixel_radii = radii * lod_pixel_scale / np.maximum(distances, 1e-3)
+    needed = 2.0 * math.pi * pixel_radii * lod_quality / LOD_EDGE_PIXELS
+    levels = np.take(LOD_LEVELS, np.minimum(np.searchsorted(LOD_LEVELS, needed), len(LOD_LEVELS) - 1))
+    return np.minimum(levels, max_segments)
+
+def count_lod(kind, segments, max_segments):
+    stats = lod_stats.setdefault(kind, [0, 0])
+    stats[0] += int(np.count_nonzero(segments < max_segments))
+    stats[1] += len(segments)
+
+def instance_lod(matrices, radius, max_segments, kind):
+    modelview = np.array(glGetDoublev(GL_MODELVIEW_MATRIX), dtype=np.float64).reshape(4, 4).T
+    eye = matrices[:, :3, 3] @ modelview[:3, :3].T + modelview[:3, 3]
+    scales = np.linalg.norm(modelview[:3, :3] @ matrices[:, :3, 0].T, axis=0)
+    segments = lod_segments(np.linalg.norm(eye, axis=1), radius * scales, max_segments)
+    count_lod(kind, segments, max_segments)
+    return segments
+
+def current_lod(radius, max_segments, kind):
+    segments = max_segments
+    if lod_distance is not None and lod_pixel_scale is not None and lod_quality > 0:
+        pixel_radius = radius * lod_scale * lod_pixel_scale / max(lod_distance, 1e-3)
+        needed = 2.0 * math.pi * pixel_radius * lod_quality / LOD_EDGE_PIXELS
+        level = LOD_LEVELS[min(bisect.bisect_left(LOD_LEVELS, needed), len(LOD_LEVELS) - 1)]
+        segments = min(level, max_segments)
+    
+    stats = lod_stats.setdefault(kind, [0, 0])
+    stats[0] += segments < max_segments
+    stats[1] += 1
+    return segments
+
+def spheres_visible(centers, radii):
+    if view_frustum is None:
+        return np.ones(len(centers), dtype=bool)
+    distances = centers @ view_frustum[:, :3].T + view_frustum[:, 3]
+    return np.all(distances >= -np.reshape(radii, (-1, 1)), axis=1)
+
+def count_culled(category, drawn, total):
+    stats = cull_stats.setdefault(category, [0, 0])
+    stats[0] += drawn
+    stats[1] += total - drawn
+
+def entity_centers(entities, y=None, z_offset=0.0):
+    ys = column(entities, 'y') if y is None else y
+    return np.column_stack((column(entities, 'x'), np.broadcast_to(ys, len(entities)), column(entities, 'z') + z_offset))
+
+def type_radii(entities):
+    return np.fromiter((CULL_RADII[entity.type] for entity in entities), dtype=np.float64, count=len(entities))
+
+def cull_entities(category, entities, centers, radii):
+    if not entities:
+        return []
+    mask = spheres_visible(centers, radii)
+    visible = [entity for entity, keep in zip(entities, mask) if keep]
+    count_culled(category, len(visible), len(entities))
+    return visible
+
+def visible_obstacles():
+    entities = list(obstacles)
+    return cull_entities('obstacles', entities, entity_centers(entities, z_offset=render_scroll_offset()), type_radii(entities))
+
+def visible_collectibles():
+    entities = list(collectibles)
+    return cull_entities('collectibles', entities, entity_centers(entities, z_offset=render_scroll_offset()), type_radii(entities))
+
+def visible_projectiles():
+    entities = list(projectiles)
+    return cull_entities('projectiles', entities, entity_centers(entities, z_offset=projectile_lag()), type_radii(entities))
+
+def visible_buildings():
+    entities = list(environment_buildings)
+    if not entities:
+        return []
+    widths = column(entities, 'width')
+    centers = entity_centers(entities, y=column(entities, 'height') / 2, z_offset=render_scroll_offset())
+    return cull_entities('buildings', entities, centers, widths * CUBE_BOUNDING_RADIUS)
+
+def visible_platforms():
+    entities = list(floating_platforms)
+    if not entities:
+        return []
+    return cull_entities('platforms', entities, entity_centers(entities), column(entities, 'size') * CUBE_BOUNDING_RADIUS)
+
+def visible_particles():
+    positions = particle_positions[:particle_count]
+    mask = spheres_visible(positions, particle_life[:particle_count] * 0.5 * CUBE_BOUNDING_RADIUS)
+    count_culled('particles', int(np.count_nonzero(mask)), particle_count)
+    return mask
+
+def transform_stack(count):
+    return np.tile(np.eye(4), (count, 1, 1))
+
+def translate(matrices, x, y, z):
+    t = transform_stack(len(matrices))
+    t[:, 0, 3] = x
+    t[:, 1, 3] = y
+    t[:, 2, 3] = z
+    return matrices @ t
+
+def rotate(matrices, angle, axis):
+    a = np.radians(np.broadcast_to(angle, (len(matrices),)))
+    k = np.array(axis, dtype=np.float64)
+    k = k / np.linalg.norm(k)
+    c = np.cos(a)[:, None, None]
+    s = np.sin(a)[:, None, None]
+    cross = np.array([[0, -k[2], k[1]], [k[2], 0, -k[0]], [-k[1], k[0], 0]])
+    r = transform_stack(len(matrices))
+    r[:, :3, :3] = c * np.eye(3) + s * cross + (1 - c) * np.outer(k, k)
+    return matrices @ r
+
+def scale(matrices, sx, sy=None, sz=None):
+    sy = sx if sy is None else sy
+    sz = sx if sz is None else sz
+    t = transform_stack(len(matrices))
+    t[:, 0, 0] = sx
+    t[:, 1, 1] = sy
+    t[:, 2, 2] = sz
+    return matrices @ t
+
+def draw_instances(geometry, matrices, colors=None):
+    if len(matrices) == 0:
+        return
     
-    for i in range(slices):
-        theta1 = 2.0 * math.pi * i / slices
-        theta2 = 2.0 * math.pi * (i + 1) / slices
-        
-        x1_b = base_radius * math.cos(theta1)
-        y1_b = base_radius * math.sin(theta1)
-        x2_b = base_radius * math.cos(theta2)
-        y2_b = base_radius * math.sin(theta2)
-        
-        x1_t = top_radius * math.cos(theta1)
-        y1_t = top_radius * math.sin(theta1)
-        x2_t = top_radius * math.cos(theta2)
-        y2_t = top_radius * math.sin(theta2)
-        
-        shade = 0.5 + 0.5 * math.cos(theta1)
-        glColor3f(color[0] * shade, color[1] * shade, color[2] * shade)
-        
-        glVertex3f(x1_b, y1_b, 0)
-        glVertex3f(x2_b, y2_b, 0)
-        glVertex3f(x1_t, y1_t, height)
-        
-        glVertex3f(x2_b, y2_b, 0)
-        glVertex3f(x2_t, y2_t, height)
-        glVertex3f(x1_t, y1_t, height)
-        
-        dark = tuple(c * 0.3 for c in color)
-        glColor3f(*dark)
-        glVertex3f(0, 0, 0)
-        glVertex3f(x2_b, y2_b, 0)
-        glVertex3f(x1_b, y1_b, 0)
-        
-        if top_radius > 0:
-            glVertex3f(0, 0, height)
-            glVertex3f(x1_t, y1_t, height)
-            glVertex3f(x2_t, y2_t, height)
+    primitive, vertices, base_colors = geometry
+    transformed = np.einsum('mij,nj->mni', matrices[:, :3, :3], vertices) + matrices[:, None, :3, 3]
+    if colors is None:
+        colors = np.broadcast_to(base_colors, (len(matrices),) + base_colors.shape)
     
-    glEnd()
+    submit_geometry(primitive, transformed.reshape(-1, 3), colors.reshape(-1, 3))
+
+def draw_cube_instances(matrices, color):
+    color = quantize_color(color)
+    draw_instances(cached_geometry(('cube', color), cube_geometry, color), matrices)
+
+def draw_sphere_instances(matrices, radius, slices, stacks, color):
+    if len(matrices) == 0:
+        return
+    color = quantize_color(color)
+    matrices = scale(matrices, radius)
+    segments = instance_lod(matrices, 1.0, slices, 'spheres')
+    for level in np.unique(segments):
+        level_stacks = min(int(level), stacks)
+        key = ('sphere', int(level), level_stacks, color)
+        geometry = cached_geometry(key, sphere_geometry, int(level), level_stacks, color)
+        draw_instances(geometry, matrices[segments == level])
+
+def draw_cylinder_instances(matrices, base_radius, top_radius, height, slices, color):
+    if len(matrices) == 0:
+        return
+    color = quantize_color(color)
+    segments = instance_lod(matrices, max(base_radius, top_radius), slices, 'cylinders')
+    for level in np.unique(segments):
+        key = ('cylinder', base_radius, top_radius, height, int(level), color)
+        geometry = cached_geometry(key, cylinder_geometry, base_radius, top_radius, height, int(level), color)
+        draw_instances(geometry, matrices[segments == level])
+
+def draw_triangle_cube(x, y, z, size, color):
+    color = quantize_color(color)
+    
+    glPushMatrix()
+    glTranslatef(x, y, z)
+    glScalef(size, size, size)
+    draw_cached_mesh(('cube', color), cube_geometry, color)
+    glPopMatrix()
+
+def draw_triangle_sphere(radius, slices, stacks, color):
+    color = quantize_color(color)
+    slices = current_lod(radius, slices, 'spheres')
+    stacks = min(slices, stacks)
+    
+    glPushMatrix()
+    glScalef(radius, radius, radius)
+    draw_cached_mesh(('sphere', slices, stacks, color), sphere_geometry, slices, stacks, color)
+    glPopMatrix()
+
+def draw_triangle_cylinder(base_radius, top_radius, height, slices, color):
+    color = quantize_color(color)
+    slices = current_lod(max(base_radius, top_radius), slices, 'cylinders')
+    key = ('cylinder', base_radius, top_radius, height, slices, color)
+    draw_cached_mesh(key, cylinder_geometry, base_radius, top_radius, height, slices, color)
 
 def draw_triangle_cone(base_radius, height, slices, color):
     draw_triangle_cylinder(base_radius, 0.0, height, slices, color)
 
 
 def draw_robot_player():
-    global player_x, player_y, player_z, player_is_sliding, player_animation_phase
+    global player_z, player_is_sliding, player_animation_phase
     global player_cheat_mode, player_has_shield, player_charging
     global player_charge_start_time, player_damage_flash, player_speed_boost_active
     
+    set_lod_origin(view_player_x, view_player_y, player_z)
     glPushMatrix()
-    glTranslatef(player_x, player_y, player_z)
+    glTranslatef(view_player_x, view_player_y, player_z)
     
     if player_is_sliding:
         glRotatef(-45, 1, 0, 0)
@@ -436,7 +1417,7 @@ def draw_robot_player():
     draw_triangle_cylinder(0.15, 0.1, 0.4, 8, (0.5, 0.5, 0.55))
     
     if player_charging:
-        charge_time = time.time() - player_charge_start_time
+        charge_time = sim_time - player_charge_start_time
         charge_size = min(charge_time * 0.6, 1.2)
         charge_pulse = 1.0 + 0.2 * math.sin(charge_time * 10)
         
@@ -469,55 +1450,46 @@ def draw_robot_player():
         glScalef(shield_pulse, shield_pulse, shield_pulse)
         
         glLineWidth(2.5)
-        glColor3f(0.0, 1.0, 0.0)
-        
-        for h in range(-2, 3):
-            height = h * 0.5
-            radius = math.sqrt(max(0, 2.2**2 - height**2))
-            
-            glBegin(GL_LINES)
-            segments = 24
-            for i in range(segments):
-                theta1 = 2 * math.pi * i / segments
-                theta2 = 2 * math.pi * (i + 1) / segments
-                
-                x1 = radius * math.cos(theta1)
-                z1 = radius * math.sin(theta1)
-                x2 = radius * math.cos(theta2)
-                z2 = radius * math.sin(theta2)
-                
-                glVertex3f(x1, height, z1)
-                glVertex3f(x2, height, z2)
-            glEnd()
-        
-        for i in range(4):
-            angle = i * math.pi / 4
-            
-            glBegin(GL_LINES)
-            segments = 24
-            for j in range(segments):
-                theta1 = 2 * math.pi * j / segments
-                theta2 = 2 * math.pi * (j + 1) / segments
-                
-                y1 = 2.2 * math.sin(theta1)
-                r1 = 2.2 * math.cos(theta1)
-                y2 = 2.2 * math.sin(theta2)
-                r2 = 2.2 * math.cos(theta2)
-                
-                x1 = r1 * math.cos(angle)
-                z1 = r1 * math.sin(angle)
-                x2 = r2 * math.cos(angle)
-                z2 = r2 * math.sin(angle)
-                
-                glVertex3f(x1, y1, z1)
-                glVertex3f(x2, y2, z2)
-            glEnd()
-        
+        draw_cached_mesh(('shield_wireframe',), shield_wireframe_geometry)
         glLineWidth(1.0)
         glPopMatrix()
     
     glPopMatrix()
 
+def shield_wireframe_geometry():
+    segments = 24
+    theta = 2 * math.pi * np.arange(segments + 1) / segments
+    lines = []
+    
+    for h in range(-2, 3):
+        height = h * 0.5
+        radius = math.sqrt(max(0, 2.2**2 - height**2))
+        ring = np.stack([radius * np.cos(theta), np.full(segments + 1, height), radius * np.sin(theta)], axis=-1)
+        lines.append(np.stack([ring[:-1], ring[1:]], axis=1).reshape(-1, 3))
+    
+    for i in range(4):
+        angle = i * math.pi / 4
+        r = 2.2 * np.cos(theta)
+        ring = np.stack([r * math.cos(angle), 2.2 * np.sin(theta), r * math.sin(angle)], axis=-1)
+        lines.append(np.stack([ring[:-1], ring[1:]], axis=1).reshape(-1, 3))
+    
+    vertices = np.concatenate(lines).astype(np.float32)
+    colors = np.tile(np.array([0.0, 1.0, 0.0], dtype=np.float32), (len(vertices), 1))
+    return GL_LINES, vertices, colors
+
+def wire_cube_geometry(color):
+    s = 0.5
+    corners = np.array([
+        (-s, -s, -s), (s, -s, -s), (s, -s, s), (-s, -s, s),
+        (-s, s, -s), (s, s, -s), (s, s, s), (-s, s, s)
+    ], dtype=np.float32)
+    edges = [0, 1, 1, 2, 2, 3, 3, 0,
+             4, 5, 5, 6, 6, 7, 7, 4,
+             0, 4, 1, 5, 2, 6, 3, 7]
+    vertices = corners[edges]
+    colors = np.tile(np.array(color, dtype=np.float32), (len(vertices), 1))
+    return GL_LINES, vertices, colors
+
 def draw_heart(x, y, size, color):
     glPushMatrix()
     glTranslatef(x, y, 0)
@@ -562,20 +1534,7 @@ def draw_environment():
     global total_distance, environment_stars, environment_buildings, floating_platforms
     
     glDisable(GL_DEPTH_TEST)
-    glBegin(GL_TRIANGLES)
-    
-    glColor3f(*COL_DARK_VOID)
-    glVertex3f(-500, 300, -500)
-    glVertex3f(500, 300, -500)
-    glColor3f(*COL_LIGHTER_SKY)
-    glVertex3f(0, 0, -500)
-    
-    glColor3f(*COL_LIGHTER_SKY)
-    glVertex3f(-500, 0, -500)
-    glVertex3f(500, 0, -500)
-    glVertex3f(0, 0, -500)
-    
-    glEnd()
+    draw_cached_mesh(('sky',), sky_geometry)
     glEnable(GL_DEPTH_TEST)
     
     draw_grid_floor()
@@ -584,17 +1543,76 @@ def draw_environment():
     
     draw_side_walls()
     
-    for building in environment_buildings:
-        draw_triangle_cube(building['x'], building['height'] / 2, building['z'],
-                          building['width'], building['color'])
+    buildings = visible_buildings()
+    platforms = visible_platforms()
     
-    for platform in floating_platforms:
+    if render_backend == 'vbo':
+        draw_environment_batches(buildings, platforms)
+        return
+    
+    scroll = render_scroll_offset()
+    for building in buildings:
+        draw_triangle_cube(building.x, building.height / 2, building.z + scroll,
+                          building.width, building.color)
+    
+    for platform in platforms:
         glPushMatrix()
-        glTranslatef(platform['x'], platform['y'], platform['z'])
-        glRotatef(platform['rot'], 0, 1, 0)
-        draw_triangle_cube(0, 0, 0, platform['size'], platform['color'])
+        glTranslatef(platform.x, platform.y, platform.z)
+        glRotatef(platform.rot, 0, 1, 0)
+        draw_triangle_cube(0, 0, 0, platform.size, platform.color)
         glPopMatrix()
 
+def sky_geometry():
+    vertices = np.array([
+        (-500, 300, -500), (500, 300, -500), (0, 0, -500),
+        (-500, 0, -500), (500, 0, -500), (0, 0, -500)
+    ], dtype=np.float32)
+    colors = np.array([
+        COL_DARK_VOID, COL_DARK_VOID, COL_LIGHTER_SKY,
+        COL_LIGHTER_SKY, COL_LIGHTER_SKY, COL_LIGHTER_SKY
+    ], dtype=np.float32)
+    return GL_TRIANGLES, vertices, colors
+
+def grid_rails_geometry(color):
+    x_index = np.arange(-4, 5)
+    x_fade = 1.0 - np.abs(x_index) / 5.0
+    
+    x_lines = np.zeros((len(x_index), 2, 3), dtype=np.float32)
+    x_lines[:, :, 0] = (x_index * LANE_WIDTH)[:, None]
+    x_lines[:, 0, 2] = 50
+    x_lines[:, 1, 2] = -600
+    
+    colors = np.repeat(x_fade, 2)[:, None] * np.array(color)
+    return GL_LINES, x_lines.reshape(-1, 3), colors.astype(np.float32)
+
+def grid_rungs_geometry(color):
+    z_pos = 50 - np.arange(0, 650, 20)
+    z_pos = z_pos[z_pos > -600]
+    z_fade = np.maximum(0.0, 1.0 - np.abs(z_pos + 200) / 600.0)
+    
+    z_lines = np.zeros((len(z_pos), 2, 3), dtype=np.float32)
+    z_lines[:, 0, 0] = -60
+    z_lines[:, 1, 0] = 60
+    z_lines[:, :, 2] = z_pos[:, None]
+    
+    colors = np.repeat(z_fade, 2)[:, None] * np.array(color)
+    return GL_LINES, z_lines.reshape(-1, 3), colors.astype(np.float32)
+
+def lane_divider_geometry():
+    vertices = np.array([
+        (-LANE_WIDTH, 0.1, 50), (-LANE_WIDTH, 0.1, -600),
+        (LANE_WIDTH, 0.1, 50), (LANE_WIDTH, 0.1, -600)
+    ], dtype=np.float32)
+    colors = np.tile(np.array(COL_NEON_CYAN, dtype=np.float32), (4, 1))
+    return GL_LINES, vertices, colors
+
+def side_wall_geometry():
+    primitive, vertices, colors = cube_geometry(COL_BARRIER_RED)
+    wall = vertices * np.array((2, 1, 600), dtype=np.float32) + np.array((0, 0.5, -300), dtype=np.float32)
+    walls = np.concatenate([wall + np.array((-50, 0, 0), dtype=np.float32),
+                            wall + np.array((50, 0, 0), dtype=np.float32)])
+    return primitive, walls, np.concatenate([colors, colors])
+
 def draw_grid_floor():
     global total_distance, current_speed
     
@@ -607,91 +1625,63 @@ def draw_grid_floor():
         grid_color = color_lerp(COL_NEON_PINK, COL_NEON_CYAN, (speed_ratio - 0.5) * 4)
     else:
         grid_color = color_lerp(COL_NEON_CYAN, COL_NEON_BLUE, (speed_ratio - 0.75) * 4)
+    grid_color = quantize_color(grid_color)
     
-    grid_offset = total_distance % 20
+    grid_offset = (total_distance + render_scroll_offset()) % 20
     
     glLineWidth(2.5)
-    glBegin(GL_LINES)
-    
-    for x in range(-4, 5):
-        x_pos = x * LANE_WIDTH
-        fade_factor = 1.0 - abs(x) / 5.0
-        glColor3f(grid_color[0] * fade_factor, 
-                 grid_color[1] * fade_factor, 
-                 grid_color[2] * fade_factor)
-        glVertex3f(x_pos, 0, 50)
-        glVertex3f(x_pos, 0, -600)
-    
-    for z in range(0, 650, 20):
-        z_pos = 50 - z + grid_offset
-        dist_fade = 1.0 - abs(z_pos + 200) / 600.0
-        dist_fade = max(0.0, dist_fade)
-        
-        glColor3f(grid_color[0] * dist_fade, 
-                 grid_color[1] * dist_fade, 
-                 grid_color[2] * dist_fade)
-        
-        if z_pos > -600:
-            glVertex3f(-60, 0, z_pos)
-            glVertex3f(60, 0, z_pos)
-    
-    glEnd()
+    draw_cached_mesh(('grid_rails', grid_color), grid_rails_geometry, grid_color)
+    glPushMatrix()
+    glTranslatef(0, 0, grid_offset)
+    draw_cached_mesh(('grid_rungs', grid_color), grid_rungs_geometry, grid_color)
+    glPopMatrix()
     glLineWidth(1.0)
 
 def draw_lane_dividers():
     glLineWidth(3.0)
-    glBegin(GL_LINES)
-    glColor3f(*COL_NEON_CYAN)
-    
-    glVertex3f(-LANE_WIDTH, 0.1, 50)
-    glVertex3f(-LANE_WIDTH, 0.1, -600)
-    
-    glVertex3f(LANE_WIDTH, 0.1, 50)
-    glVertex3f(LANE_WIDTH, 0.1, -600)
-    
-    glEnd()
+    draw_cached_mesh(('lane_dividers',), lane_divider_geometry)
     glLineWidth(1.0)
 
 def draw_side_walls():
-    pulse = 1.0 + 0.1 * math.sin(time.time() * 2)
-    wall_height = 10.0 * pulse
-    
-    glPushMatrix()
-    glTranslatef(-50, wall_height / 2, -300)
-    glScalef(2, wall_height, 600)
-    draw_triangle_cube(0, 0, 0, 1.0, COL_BARRIER_RED)
-    glPopMatrix()
+    pulse = 1.0 + 0.1 * math.sin(game_time() * 2)
     
     glPushMatrix()
-    glTranslatef(50, wall_height / 2, -300)
-    glScalef(2, wall_height, 600)
-    draw_triangle_cube(0, 0, 0, 1.0, COL_BARRIER_RED)
+    glScalef(1, 10.0 * pulse, 1)
+    draw_cached_mesh(('side_walls',), side_wall_geometry)
     glPopMatrix()
 
 
 def draw_obstacles():
-    for obs in obstacles:
-        if obs['type'] == 'barrier':
-            draw_triangle_cube(obs['x'], 2.5, obs['z'], 4.5, COL_BARRIER_RED)
+    visible = visible_obstacles()
+    
+    if render_backend == 'vbo':
+        draw_obstacle_batches(visible)
+        return
+    
+    offset = render_scroll_offset()
+    for obs in visible:
+        set_lod_origin(obs.x, obs.y, obs.z + offset, obs.scale)
+        if obs.type == 'barrier':
+            draw_triangle_cube(obs.x, 2.5, obs.z, 4.5, COL_BARRIER_RED)
             
-            for i in range(obs['hp']):
+            for i in range(obs.hp):
                 glPushMatrix()
-                glTranslatef(obs['x'] - 1 + i * 1, 5.5, obs['z'])
+                glTranslatef(obs.x - 1 + i * 1, 5.5, obs.z)
                 draw_triangle_cube(0, 0, 0, 0.4, COL_WHITE)
                 glPopMatrix()
         
-        elif obs['type'] == 'spike':
+        elif obs.type == 'spike':
             glPushMatrix()
-            glTranslatef(obs['x'], 0, obs['z'])
-            glRotatef(obs.get('rot', 0), 0, 1, 0)
+            glTranslatef(obs.x, 0, obs.z)
+            glRotatef(obs.rot, 0, 1, 0)
             glRotatef(-90, 1, 0, 0)
             draw_triangle_cone(1.2, 4.0, 12, COL_NEON_ORANGE)
             glPopMatrix()
         
-        elif obs['type'] == 'beam':
+        elif obs.type == 'beam':
             glPushMatrix()
-            glTranslatef(obs['x'], 2.0, obs['z'])
-            glRotatef(obs.get('rot', 0), 0, 0, 1)
+            glTranslatef(obs.x, 2.0, obs.z)
+            glRotatef(obs.rot, 0, 0, 1)
             glRotatef(90, 0, 1, 0)
             draw_triangle_cylinder(1.0, 1.0, 14.0, 12, COL_GRAY)
             
@@ -701,65 +1691,58 @@ def draw_obstacles():
             draw_triangle_sphere(1.2, 8, 8, COL_WARNING)
             glPopMatrix()
         
-        elif obs['type'] == 'crusher':
-            scale = 3.5 + 0.8 * math.sin(time.time() * 4)
-            draw_triangle_cube(obs['x'], 2.5, obs['z'], scale, COL_NEON_PINK)
+        elif obs.type == 'crusher':
+            scale = 3.5 + 0.8 * math.sin(game_time() * 4)
+            draw_triangle_cube(obs.x, 2.5, obs.z, scale, COL_NEON_PINK)
         
-        elif obs['type'] == 'hazard':
+        elif obs.type == 'hazard':
             glPushMatrix()
-            glTranslatef(obs['x'], obs['y'], obs['z'])
-            scale = obs.get('scale', 1.0)
+            glTranslatef(obs.x, obs.y, obs.z)
+            scale = obs.scale
             glScalef(scale, scale, scale)
             draw_triangle_sphere(1.0, 12, 12, COL_NEON_PURPLE)
             glPopMatrix()
 
 def draw_collectibles():
-    for col in collectibles:
+    visible = visible_collectibles()
+    
+    if render_backend == 'vbo':
+        draw_collectible_batches(visible)
+        return
+    
+    offset = render_scroll_offset()
+    for col in visible:
         glPushMatrix()
-        glTranslatef(col['x'], col['y'], col['z'])
-        glRotatef(col['rot'], 0, 1, 0)
+        glTranslatef(col.x, col.y, col.z)
+        glRotatef(col.rot, 0, 1, 0)
         
-        pulse = 1.0 + 0.2 * math.sin(col['rot'] * 0.05)
+        pulse = 1.0 + 0.2 * math.sin(col.rot * 0.05)
         glScalef(pulse, pulse, pulse)
+        set_lod_origin(col.x, col.y, col.z + offset, pulse)
         
-        if col['type'] == 'gem_green':
+        if col.type == 'gem_green':
             draw_triangle_sphere(0.6, 10, 10, COL_NEON_GREEN)
-        elif col['type'] == 'gem_blue':
+        elif col.type == 'gem_blue':
             draw_triangle_sphere(0.7, 10, 10, COL_NEON_BLUE)
-        elif col['type'] == 'gem_purple':
+        elif col.type == 'gem_purple':
             draw_triangle_sphere(0.8, 10, 10, COL_NEON_PURPLE)
-        elif col['type'] == 'gem_gold':
+        elif col.type == 'gem_gold':
             draw_triangle_sphere(1.0, 12, 12, COL_GOLD)
-        elif col['type'] == 'shield':
+        elif col.type == 'shield':
             draw_triangle_sphere(1.0, 12, 12, COL_NEON_GREEN)
             glPushMatrix()
             glScalef(1.3, 1.3, 1.3)
-            s = 0.5
             glLineWidth(2.0)
-            glBegin(GL_LINES)
-            glColor3f(*COL_NEON_CYAN)
-            glVertex3f(-s, -s, -s); glVertex3f(s, -s, -s)
-            glVertex3f(s, -s, -s); glVertex3f(s, -s, s)
-            glVertex3f(s, -s, s); glVertex3f(-s, -s, s)
-            glVertex3f(-s, -s, s); glVertex3f(-s, -s, -s)
-            glVertex3f(-s, s, -s); glVertex3f(s, s, -s)
-            glVertex3f(s, s, -s); glVertex3f(s, s, s)
-            glVertex3f(s, s, s); glVertex3f(-s, s, s)
-            glVertex3f(-s, s, s); glVertex3f(-s, s, -s)
-            glVertex3f(-s, -s, -s); glVertex3f(-s, s, -s)
-            glVertex3f(s, -s, -s); glVertex3f(s, s, -s)
-            glVertex3f(s, -s, s); glVertex3f(s, s, s)
-            glVertex3f(-s, -s, s); glVertex3f(-s, s, s)
-            glEnd()
+            draw_cached_mesh(('wire_cube', COL_NEON_CYAN), wire_cube_geometry, COL_NEON_CYAN)
             glLineWidth(1.0)
             glPopMatrix()
-        elif col['type'] == 'speed':
+        elif col.type == 'speed':
             glRotatef(90, 1, 0, 0)
             draw_triangle_cylinder(0.5, 0.5, 1.2, 10, COL_NEON_YELLOW)
             for i in range(3):
                 glTranslatef(0, 0, 0.3)
                 draw_triangle_cylinder(0.6, 0.6, 0.1, 8, COL_NEON_ORANGE)
-        elif col['type'] == 'grenade':
+        elif col.type == 'grenade':
             draw_triangle_cube(0, 0, 0, 0.8, COL_NEON_ORANGE)
             glTranslatef(0, 0.5, 0)
             draw_triangle_cube(0, 0, 0, 0.6, COL_NEON_ORANGE)
@@ -768,12 +1751,18 @@ def draw_collectibles():
         
         glPopMatrix()
 
+def projectile_lag():
+    return (1.0 - render_alpha) * physics_step * PROJECTILE_SPEED
+
 def draw_projectiles():
-    for proj in projectiles:
+    lag = projectile_lag()
+    
+    for proj in visible_projectiles():
+        set_lod_origin(proj.x, proj.y, proj.z + lag)
         glPushMatrix()
-        glTranslatef(proj['x'], proj['y'], proj['z'])
+        glTranslatef(proj.x, proj.y, proj.z + lag)
         
-        if proj['type'] == 'laser':
+        if proj.type == 'laser':
             draw_triangle_sphere(0.3, 8, 8, COL_NEON_YELLOW)
             
             for i in range(1, 4):
@@ -785,30 +1774,191 @@ def draw_projectiles():
                 draw_triangle_sphere(0.3, 6, 6, trail_col)
                 glPopMatrix()
         
-        elif proj['type'] == 'charge':
-            pulse = 1.0 + 0.3 * math.sin(time.time() * 10)
+        elif proj.type == 'charge':
+            pulse = 1.0 + 0.3 * math.sin(game_time() * 10)
             glScalef(pulse, pulse, pulse)
             draw_triangle_sphere(0.8, 12, 12, COL_NEON_PINK)
         
-        elif proj['type'] == 'grenade':
-            glRotatef(proj.get('rot', 0), 1, 1, 0)
+        elif proj.type == 'grenade':
+            glRotatef(proj.rot, 1, 1, 0)
             draw_triangle_cube(0, 0, 0, 0.6, COL_NEON_ORANGE)
         
         glPopMatrix()
 
 def draw_particles():
-    for part in particles:
+    visible = visible_particles()
+    
+    if render_backend == 'vbo':
+        draw_particle_batch(visible)
+        return
+    
+    for i in np.flatnonzero(visible):
         glPushMatrix()
-        glTranslatef(part['x'], part['y'], part['z'])
+        glTranslatef(*particle_positions[i])
         
-        life_ratio = part['life'] / 1.0
+        life_ratio = particle_life[i] / 1.0
         size = life_ratio * 0.5
-        color = tuple(c * life_ratio for c in part['color'])
+        color = tuple(particle_colors[i] * life_ratio)
         
         draw_triangle_cube(0, 0, 0, size, color)
         glPopMatrix()
 
 
+def draw_environment_batches(buildings, platforms):
+    cube = cached_geometry(('cube', COL_WHITE), cube_geometry, COL_WHITE)
+    
+    if buildings:
+        heights = column(buildings, 'height')
+        widths = column(buildings, 'width')
+        m = translate(transform_stack(len(buildings)), column(buildings, 'x'),
+                      heights / 2, column(buildings, 'z') + render_scroll_offset())
+        tints = np.array([quantize_color(b.color) for b in buildings])
+        draw_instances(cube, scale(m, widths), cube_face_colors(tints))
+    
+    if platforms:
+        m = translate(transform_stack(len(platforms)), column(platforms, 'x'),
+                      column(platforms, 'y'), column(platforms, 'z'))
+        m = rotate(m, column(platforms, 'rot'), (0, 1, 0))
+        tints = np.array([quantize_color(p.color) for p in platforms])
+        draw_instances(cube, scale(m, column(platforms, 'size')), cube_face_colors(tints))
+
+def draw_obstacle_batches(visible):
+    groups = group_by_type(visible)
+    
+    barriers = groups.get('barrier', [])
+    if barriers:
+        m = translate(transform_stack(len(barriers)), column(barriers, 'x'), 2.5, column(barriers, 'z'))
+        draw_cube_instances(scale(m, 4.5), COL_BARRIER_RED)
+        
+        pips = np.array([(obs.x - 1 + i, obs.z) for obs in barriers for i in range(obs.hp)])
+        if len(pips):
+            m = translate(transform_stack(len(pips)), pips[:, 0], 5.5, pips[:, 1])
+            draw_cube_instances(scale(m, 0.4), COL_WHITE)
+    
+    spikes = groups.get('spike', [])
+    if spikes:
+        m = translate(transform_stack(len(spikes)), column(spikes, 'x'), 0, column(spikes, 'z'))
+        m = rotate(m, column(spikes, 'rot'), (0, 1, 0))
+        m = rotate(m, -90, (1, 0, 0))
+        draw_cylinder_instances(m, 1.2, 0.0, 4.0, 12, COL_NEON_ORANGE)
+    
+    beams = groups.get('beam', [])
+    if beams:
+        m = translate(transform_stack(len(beams)), column(beams, 'x'), 2.0, column(beams, 'z'))
+        m = rotate(m, column(beams, 'rot'), (0, 0, 1))
+        m = rotate(m, 90, (0, 1, 0))
+        draw_cylinder_instances(m, 1.0, 1.0, 14.0, 12, COL_GRAY)
+        
+        ends = np.concatenate([translate(m, 0, 0, 7), translate(m, 0, 0, -7)])
+        draw_sphere_instances(ends, 1.2, 8, 8, COL_WARNING)
+    
+    crushers = groups.get('crusher', [])
+    if crushers:
+        crusher_scale = 3.5 + 0.8 * math.sin(game_time() * 4)
+        m = translate(transform_stack(len(crushers)), column(crushers, 'x'), 2.5, column(crushers, 'z'))
+        draw_cube_instances(scale(m, crusher_scale), COL_NEON_PINK)
+    
+    hazards = groups.get('hazard', [])
+    if hazards:
+        m = translate(transform_stack(len(hazards)), column(hazards, 'x'), column(hazards, 'y'), column(hazards, 'z'))
+        m = scale(m, column(hazards, 'scale'))
+        draw_sphere_instances(m, 1.0, 12, 12, COL_NEON_PURPLE)
+
+def draw_collectible_batches(visible):
+    gem_styles = {
+        'gem_green': (0.6, 10, COL_NEON_GREEN),
+        'gem_blue': (0.7, 10, COL_NEON_BLUE),
+        'gem_purple': (0.8, 10, COL_NEON_PURPLE),
+        'gem_gold': (1.0, 12, COL_GOLD),
+        'shield': (1.0, 12, COL_NEON_GREEN),
+    }
+    
+    for col_type, group in group_by_type(visible).items():
+        rot = column(group, 'rot')
+        pulse = 1.0 + 0.2 * np.sin(rot * 0.05)
+        m = translate(transform_stack(len(group)), column(group, 'x'), column(group, 'y'), column(group, 'z'))
+        m = rotate(m, rot, (0, 1, 0))
+        m = scale(m, pulse)
+        
+        if col_type in gem_styles:
+            radius, detail, color = gem_styles[col_type]
+            draw_sphere_instances(m, radius, detail, detail, color)
+        
+        if col_type == 'shield':
+            glLineWidth(2.0)
+            geometry = cached_geometry(('wire_cube', COL_NEON_CYAN), wire_cube_geometry, COL_NEON_CYAN)
+            draw_instances(geometry, scale(m, 1.3))
+            glLineWidth(1.0)
+        elif col_type == 'speed':
+            m = rotate(m, 90, (1, 0, 0))
+            draw_cylinder_instances(m, 0.5, 0.5, 1.2, 10, COL_NEON_YELLOW)
+            rings = np.concatenate([translate(m, 0, 0, 0.3 * (i + 1)) for i in range(3)])
+            draw_cylinder_instances(rings, 0.6, 0.6, 0.1, 8, COL_NEON_ORANGE)
+        elif col_type == 'grenade':
+            draw_cube_instances(scale(m, 0.8), COL_NEON_ORANGE)
+            draw_cube_instances(scale(translate(m, 0, 0.5, 0), 0.6), COL_NEON_ORANGE)
+            draw_cube_instances(scale(translate(m, 0, 0.9, 0), 0.4), COL_NEON_ORANGE)
+
+def draw_particle_batch(visible):
+    count = int(np.count_nonzero(visible))
+    if count == 0:
+        return
+    
+    life_ratio = particle_life[:particle_count][visible] / 1.0
+    positions = particle_positions[:particle_count][visible]
+    m = translate(transform_stack(count), positions[:, 0], positions[:, 1], positions[:, 2])
+    m = scale(m, life_ratio * 0.5)
+    
+    tints = particle_colors[:particle_count][visible] * life_ratio[:, None]
+    geometry = cached_geometry(('cube', COL_WHITE), cube_geometry, COL_WHITE)
+    draw_instances(geometry, m, cube_face_colors(tints))
+
+
+def glyph_lists():
+    global glyph_list_base
+    
+    if glyph_list_base is None:
+        glyph_list_base = glGenLists(HUD_FONT_GLYPHS)
+        for code in range(HUD_FONT_GLYPHS):
+            glNewList(glyph_list_base + code, GL_COMPILE)
+            glutBitmapCharacter(GLUT_BITMAP_HELVETICA_18, code)
+            glEndList()
+    return glyph_list_base
+
+def text_codes(text):
+    return text.encode('ascii', 'replace')
+
+def text_list(text):
+    list_id = text_cache.get(text)
+    
+    if list_id is None:
+        base = glyph_lists()
+        list_id = glGenLists(1)
+        glNewList(list_id, GL_COMPILE)
+        for code in text_codes(text):
+            glCallList(base + code)
+        glEndList()
+        text_cache[text] = list_id
+        
+        if len(text_cache) > HUD_TEXT_CACHE_SIZE:
+            _, evicted = text_cache.popitem(last=False)
+            glDeleteLists(evicted, 1)
+    else:
+        text_cache.move_to_end(text)
+    
+    return list_id
+
+def draw_text(x, y, text, color, cached=True):
+    glColor3f(*color)
+    glRasterPos2f(x, y)
+    
+    if cached:
+        glCallList(text_list(text))
+    else:
+        glListBase(glyph_lists())
+        glCallLists(text_codes(text))
+        glListBase(0)
+
 def draw_hud():
     global current_score, total_distance, player_health, player_grenades
     global game_state, combo_multiplier, player_cheat_mode, player_god_mode, current_speed
@@ -822,12 +1972,6 @@ def draw_hud():
     glLoadIdentity()
     glDisable(GL_DEPTH_TEST)
     
-    def draw_text(x, y, text, color):
-        glColor3f(*color)
-        glRasterPos2f(x, y)
-        for char in text:
-            glutBitmapCharacter(GLUT_BITMAP_HELVETICA_18, ord(char))
-    
     if game_state == "menu":
         draw_text(-0.35, 0.3, "CYBER RUNNER 2077", COL_NEON_CYAN)
         draw_text(-0.25, 0.15, "NEON HORIZON", COL_NEON_PINK)
@@ -836,7 +1980,7 @@ def draw_hud():
         draw_text(-0.6, -0.3, "WASD: Move/Slide  |  SPACE: Jump  |  MOUSE: Shoot  |  F/1/2/3: Camera", COL_GRAY)
         draw_text(-0.4, -0.4, "C: God Mode  |  V: AI  |  B: Slow Motion  |  P: Pause", COL_GRAY)
         
-        pulse = 0.8 + 0.2 * math.sin(time.time() * 3)
+        pulse = 0.8 + 0.2 * math.sin(game_time() * 3)
         glBegin(GL_TRIANGLES)
         glColor3f(COL_NEON_GREEN[0] * pulse, COL_NEON_GREEN[1] * pulse, COL_NEON_GREEN[2] * pulse)
         glVertex2f(-0.15, -0.55)
@@ -854,7 +1998,7 @@ def draw_hud():
             combo_text = f"x{combo_multiplier} COMBO!"
             draw_text(-0.95, 0.90, combo_text, COL_GOLD)
         
-        draw_text(-0.95, 0.82, f"DISTANCE: {int(total_distance)}m", COL_WHITE)
+        draw_text(-0.95, 0.82, f"DISTANCE: {int(total_distance)}m", COL_WHITE, cached=False)
         
         draw_text(-0.15, 0.90, "HP:", COL_WARNING)
         for i in range(player_health):
@@ -892,7 +2036,7 @@ def draw_hud():
         
         draw_text(0.70, 0.90, f"GRENADES: {player_grenades}/{MAX_GRENADES}", COL_NEON_ORANGE)
         
-        draw_text(0.70, 0.82, f"SCORE: {int(current_score)}", COL_NEON_CYAN)
+        draw_text(0.70, 0.82, f"SCORE: {int(current_score)}", COL_NEON_CYAN, cached=False)
         
         speed_ratio = current_speed / MAX_SPEED
         bar_width = speed_ratio * 0.3
@@ -909,7 +2053,7 @@ def draw_hud():
         glVertex2f(0.65, -0.85)
         glEnd()
         
-        draw_text(0.67, -0.93, f"SPEED: {int(speed_ratio * 100)}%", COL_WHITE)
+        draw_text(0.67, -0.93, f"SPEED: {int(speed_ratio * 100)}%", COL_WHITE, cached=False)
         
         active_y = 0.74
         if player_has_shield:
@@ -932,7 +2076,7 @@ def draw_hud():
         if player_perfect_dodge_count >= 5:
             draw_text(-0.2, -0.75, f"PERFECT DODGES: {player_perfect_dodge_count}", COL_NEON_CYAN)
         
-        current_time = time.time()
+        current_time = game_time()
         global on_screen_messages
         on_screen_messages = [(msg, t) for msg, t in on_screen_messages if current_time - t < MESSAGE_DISPLAY_DURATION]
         
@@ -982,28 +2126,108 @@ def draw_hud():
     glMatrixMode(GL_MODELVIEW)
     glPopMatrix()
 
-
-def update_game():
-    global last_time, game_state, current_speed, total_distance, current_score
-    global difficulty_level, last_speed_up_score, loading_countdown, obstacle_spawn_rate
-    global combo_multiplier, combo_last_collect_time, player_perfect_dodge_count
-    global player_shield_timer, player_has_shield, player_speed_boost_timer, player_speed_boost_active
-    
-    current_time = time.time()
-    dt = current_time - last_time
-    last_time = current_time
+def draw_profile_overlay():
+    glMatrixMode(GL_PROJECTION)
+    glPushMatrix()
+    glLoadIdentity()
+    glMatrixMode(GL_MODELVIEW)
+    glPushMatrix()
+    glLoadIdentity()
+    glDisable(GL_DEPTH_TEST)
     
-    if dt > 0.1:
-        dt = 0.1
+    lines = [f"{'STAGE (ms)':<18}{'P50':>7}{'P95':>7}{'P99':>7}"]
+    for entry in profile_summary():
+        lines.append(f"{entry['stage']:<18}{entry['p50_ms']:>7.2f}{entry['p95_ms']:>7.2f}{entry['p99_ms']:>7.2f}")
+    headers = (0, len(lines))
+    lines.append(f"{'CULLING':<18}{'DRAWN':>7}{'CULLED':>14}")
+    for category, (drawn, culled) in sorted(cull_stats.items()):
+        lines.append(f"{category:<18}{drawn:>7}{culled:>14}")
+    headers += (len(lines),)
+    lines.append(f"{'POOL':<18}{'LIVE':>7}{'PEAK/CAP':>14}")
+    for name, stats in pool_stats().items():
+        lines.append(f"{name:<18}{stats['live']:>7}{stats['peak']:>7}/{stats['capacity']:<6}")
+    headers += (len(lines),)
+    lines.append(f"{'LOD':<18}{'REDUCED':>7}{'TOTAL':>14}")
+    for kind, (reduced, total) in sorted(lod_stats.items()):
+        lines.append(f"{kind:<18}{reduced:>7}{total:>14}")
+    
+    top = 0.78
+    bottom = top - 0.02 - len(lines) * 0.055
+    glBegin(GL_TRIANGLES)
+    glColor3f(0.0, 0.0, 0.0)
+    glVertex2f(0.28, top)
+    glVertex2f(0.98, top)
+    glVertex2f(0.98, bottom)
+    glVertex2f(0.28, top)
+    glVertex2f(0.98, bottom)
+    glVertex2f(0.28, bottom)
+    glEnd()
+    
+    for i, line in enumerate(lines):
+        draw_text(0.30, top - 0.055 - i * 0.055, line, COL_NEON_CYAN if i in headers else COL_WHITE, cached=i in headers)
+    
+    glEnable(GL_DEPTH_TEST)
+    glMatrixMode(GL_PROJECTION)
+    glPopMatrix()
+    glMatrixMode(GL_MODELVIEW)
+    glPopMatrix()
+
+
+def set_physics_rate(hz):
+    global physics_step
+    physics_step = 1.0 / hz
+
+def update_game():
+    global last_time, dt_accumulator, render_alpha
+    
+    current_time = game_time()
+    frame_dt = current_time - last_time
+    last_time = current_time
+    
+    if frame_dt > MAX_FRAME_TIME:
+        frame_dt = MAX_FRAME_TIME
     
     if slow_motion and game_state == "playing":
-        dt *= 0.5
+        frame_dt *= 0.5
+    
+    dt_accumulator += frame_dt
+    
+    with profile_scope('update'):
+        while dt_accumulator >= physics_step:
+            advance_physics()
+            dt_accumulator -= physics_step
+    
+    render_alpha = dt_accumulator / physics_step
+
+def advance_physics():
+    global prev_player_x, prev_player_y, sim_tick, sim_time
+    
+    prev_player_x = player_x
+    prev_player_y = player_y
+    step_game(physics_step)
+    sim_tick += 1
+    sim_time = sim_tick * physics_step
+
+def start_session(seed):
+    global sim_tick, sim_time
+    
+    sim_tick = 0
+    sim_time = 0.0
+    init_game(seed)
+
+def step_game(dt):
+    global last_distance_delta, game_state, current_speed, total_distance, current_score
+    global difficulty_level, last_speed_up_score, loading_countdown, obstacle_spawn_rate
+    global combo_multiplier, combo_last_collect_time, player_perfect_dodge_count
+    global player_shield_timer, player_has_shield, player_speed_boost_timer, player_speed_boost_active
+    
+    last_distance_delta = 0.0
     
     if game_state == "loading":
         loading_countdown -= dt
         if loading_countdown <= 0:
             game_state = "playing"
-            print("[START] Game Started!")
+            log_event('START', "Game Started!")
         return
     
     if game_state in ["menu", "paused", "gameover", "victory"]:
@@ -1018,7 +2242,7 @@ def update_game():
                 player_has_shield = False
                 player_shield_timer = 0
                 show_message("Shield Expired!")
-                print("[SHIELD] Shield expired!")
+                log_event('SHIELD', "Shield expired!")
         
         if player_speed_boost_active:
             player_speed_boost_timer -= dt
@@ -1026,49 +2250,51 @@ def update_game():
                 player_speed_boost_active = False
                 player_speed_boost_timer = 0
                 show_message("Speed Boost Expired!")
-                print("[SPEED] Speed boost expired!")
+                log_event('SPEED', "Speed boost expired!")
         
         speed_multiplier = 1.5 if player_speed_boost_active else 1.0
         current_speed = min(MAX_SPEED * speed_multiplier, current_speed + dt * SPEED_INCREMENT)
         distance_delta = current_speed * dt
         total_distance += distance_delta
+        last_distance_delta = distance_delta
         
         score_delta = distance_delta * 0.1
         if slow_motion:
             score_delta *= 0.5
         current_score += score_delta
         
-        if int(current_score / 500) > int(last_speed_up_score / 500):
+        if int(current_score / DIFFICULTY_SCORE_STEP) > int(last_speed_up_score / DIFFICULTY_SCORE_STEP):
             difficulty_level += 1
-            obstacle_spawn_rate = min(0.08, obstacle_spawn_rate + 0.008)
+            obstacle_spawn_rate = min(MAX_OBSTACLE_SPAWN_RATE, obstacle_spawn_rate + OBSTACLE_SPAWN_RATE_STEP)
             last_speed_up_score = current_score
-            print(f"[SPEED UP] Level {difficulty_level}! Speed: {int(current_speed)}")
+            log_event('SPEED UP', f"Level {difficulty_level}! Speed: {int(current_speed)}")
         
         if current_score >= VICTORY_SCORE and game_state == "playing":
             game_state = "victory"
-            print("[VICTORY] You Win!")
+            log_event('VICTORY', "You Win!")
             return
         
-        update_player(dt)
-        update_environment(distance_delta)
-        update_obstacles(dt, distance_delta)
-        update_collectibles(dt, distance_delta)
-        update_projectiles(dt)
-        update_particles(dt)
-        update_floating_platforms(dt)
-        
-        if len(obstacles) < 8 and random.random() < obstacle_spawn_rate:
-            spawn_obstacle()
+        with profile_scope('step.player'):
+            update_player(dt)
         
-        if len(collectibles) < 6 and random.random() < 0.05:
-            spawn_collectible()
+        with profile_scope('step.world'):
+            update_environment(distance_delta)
+            update_obstacles(dt, distance_delta)
+            update_collectibles(dt, distance_delta)
+            update_projectiles(dt)
+            update_particles(dt)
+            update_floating_platforms(dt)
+            
+            stream_track()
         
         if player_god_mode:
-            update_ai()
+            with profile_scope('step.ai'):
+                update_ai()
         
-        check_collisions()
+        with profile_scope('step.collisions'):
+            check_collisions()
         
-        if time.time() - combo_last_collect_time > COMBO_TIMEOUT:
+        if sim_time - combo_last_collect_time > COMBO_TIMEOUT:
             combo_multiplier = 1
 
 def update_player(dt):
@@ -1099,274 +2325,556 @@ def update_player(dt):
         player_damage_flash -= dt * 3.0
         player_damage_flash = max(0, player_damage_flash)
 
+def chunk_random(seed, kind, index):
+    return random.Random(f"{seed}:{kind}:{index}")
+
+def track_chunk(seed, index):
+    source = chunk_random(seed, 'track', index)
+    start = TRACK_SPAWN_DISTANCE + index * TRACK_CHUNK_LENGTH
+    slots = []
+    
+    for i in range(int(TRACK_CHUNK_LENGTH // TRACK_SLOT_SPACING)):
+        slots.append(obstacle_slot(source, start + (i + source.random()) * TRACK_SLOT_SPACING))
+        slots.append(collectible_slot(source, start + (i + source.random()) * TRACK_SLOT_SPACING))
+    
+    slots.sort(key=lambda slot: slot.at)
+    return TrackChunk(index, start, start + TRACK_CHUNK_LENGTH, slots)
+
+def scenery_chunk(seed, index):
+    source = chunk_random(seed, 'scenery', index)
+    start = index * TRACK_CHUNK_LENGTH
+    slots = [building_slot(source, start + source.uniform(0, TRACK_CHUNK_LENGTH))
+             for i in range(SCENERY_BUILDINGS_PER_CHUNK)]
+    
+    slots.sort(key=lambda slot: slot.at)
+    return TrackChunk(index, start, start + TRACK_CHUNK_LENGTH, slots)
+
+def obstacle_slot(source, at):
+    obs_type = source.choice(obstacle_types(at - TRACK_SPAWN_DISTANCE))
+    return TrackSlot('obstacle', at, source.random(), {
+        'lane': source.randint(0, 2),
+        'obs_type': obs_type,
+        'direction': source.choice([-1, 1]),
+        'rot': source.uniform(0, 360),
+        'phase': source.uniform(0, 6.28),
+    })
+
+def collectible_slot(source, at):
+    return TrackSlot('collectible', at, source.random(), {
+        'lane': source.randint(0, 2),
+        'quota_roll': source.random(),
+        'pick_roll': source.random(),
+        'type_roll': source.random(),
+    })
+
+def building_slot(source, at):
+    return TrackSlot('building', at, 0.0, {
+        'x': source.choice([-1, 1]) * source.uniform(60, 150),
+        'width': source.uniform(15, 40),
+        'height': source.uniform(30, 120),
+        'color': (0.1, 0.1, source.uniform(0.2, 0.5)),
+    })
+
+def start_streams(seed):
+    global track_stream, track_loaded, scenery_stream, scenery_loaded, scenery_distance
+    
+    track_stream = ChunkStream(track_chunk, seed)
+    scenery_stream = ChunkStream(scenery_chunk, seed)
+    track_slots.clear()
+    scenery_slots.clear()
+    track_loaded = 0.0
+    scenery_loaded = 0.0
+    scenery_distance = 0.0
+
+def feed_stream(stream, slots, loaded, horizon):
+    while loaded <= horizon:
+        chunk = stream.take()
+        slots.extend(chunk.slots)
+        loaded = chunk.end
+    return loaded
+
+def stream_track():
+    global track_loaded
+    
+    horizon = total_distance + TRACK_SPAWN_DISTANCE
+    track_loaded = feed_stream(track_stream, track_slots, track_loaded, horizon)
+    
+    while track_slots and track_slots[0].at <= horizon:
+        slot = track_slots.popleft()
+        z = total_distance - slot.at
+        if z > 0:
+            continue
+        
+        if slot.kind == 'obstacle':
+            if len(obstacles) < TRACK_OBSTACLE_LIMIT and slot.roll < obstacle_spawn_rate * TRACK_OBSTACLE_DENSITY:
+                spawn_obstacle(z=z, **slot.params)
+        elif len(collectibles) < TRACK_COLLECTIBLE_LIMIT and slot.roll < TRACK_COLLECTIBLE_CHANCE:
+            spawn_collectible(z=z, **slot.params)
+
+def stream_scenery():
+    global scenery_loaded
+    
+    horizon = scenery_distance + SCENERY_SPAWN_DISTANCE
+    scenery_loaded = feed_stream(scenery_stream, scenery_slots, scenery_loaded, horizon)
+    
+    while scenery_slots and scenery_slots[0].at <= horizon:
+        slot = scenery_slots.popleft()
+        spawn_building(z=scenery_distance - slot.at, **slot.params)
+
 def update_environment(distance_delta):
-    global environment_buildings
+    global scenery_distance
     
     for building in environment_buildings:
-        building['z'] += distance_delta
+        building.z += distance_delta
+        if building.z >= 100:
+            environment_buildings.remove(building)
     
-    environment_buildings = [b for b in environment_buildings if b['z'] < 100]
+    environment_buildings.compact()
     
-    while len(environment_buildings) < 40:
-        spawn_building()
+    scenery_distance += distance_delta
+    stream_scenery()
 
-def spawn_building(initial=False):
-    z_pos = random.uniform(-200, -800) if initial else random.uniform(-800, -900)
-    x_pos = random.choice([-1, 1]) * random.uniform(60, 150)
-    
-    building = {
-        'x': x_pos,
-        'z': z_pos,
-        'width': random.uniform(15, 40),
-        'height': random.uniform(30, 120),
-        'color': (0.1, 0.1, random.uniform(0.2, 0.5))
-    }
-    environment_buildings.append(building)
+def spawn_building(x, z, width, height, color):
+    building = Building(
+        x=x,
+        z=z,
+        width=width,
+        height=height,
+        color=color
+    )
+    environment_buildings.add(building)
 
 def update_floating_platforms(dt):
-    global floating_platforms
-    
     for platform in floating_platforms:
-        platform['rot'] += 30 * dt
+        platform.rot += 30 * dt
     
     if len(floating_platforms) < 20:
         spawn_floating_platform()
 
 def spawn_floating_platform(initial=False):
-    z_pos = random.uniform(-200, -600) if initial else random.uniform(-600, -700)
-    
-    platform = {
-        'x': random.uniform(-80, 80),
-        'y': random.uniform(15, 40),
-        'z': z_pos,
-        'size': random.uniform(2, 5),
-        'rot': random.uniform(0, 360),
-        'color': (random.uniform(0.2, 0.4), random.uniform(0.2, 0.4), random.uniform(0.4, 0.6))
-    }
-    floating_platforms.append(platform)
+    z_pos = rng.uniform(-200, -600) if initial else rng.uniform(-600, -700)
+    
+    platform = Platform(
+        x=rng.uniform(-80, 80),
+        y=rng.uniform(15, 40),
+        z=z_pos,
+        size=rng.uniform(2, 5),
+        rot=rng.uniform(0, 360),
+        color=(rng.uniform(0.2, 0.4), rng.uniform(0.2, 0.4), rng.uniform(0.4, 0.6))
+    )
+    floating_platforms.add(platform)
 
 def update_obstacles(dt, distance_delta):
-    global obstacles, stats_obstacles_dodged, player_perfect_dodge_count
+    global stats_obstacles_dodged, player_perfect_dodge_count
     
-    for obs in obstacles[:]:
-        obs['z'] += distance_delta
+    for obs in obstacles:
+        obs.z += distance_delta
         
-        if obs['type'] == 'spike':
-            obs['rot'] = obs.get('rot', 0) + 45 * dt
+        if obs.type == 'spike':
+            obs.rot += 45 * dt
         
-        elif obs['type'] == 'beam':
-            obs['rot'] = obs.get('rot', 0) + 90 * dt
+        elif obs.type == 'beam':
+            obs.rot += 90 * dt
         
-        elif obs['type'] == 'crusher':
-            obs['x'] += obs['dir'] * 18.0 * dt
-            if abs(obs['x']) > LANE_WIDTH * 1.5:
-                obs['dir'] *= -1
+        elif obs.type == 'crusher':
+            obs.x += obs.dir * 18.0 * dt
+            if abs(obs.x) > LANE_WIDTH * 1.5:
+                obs.dir *= -1
         
-        elif obs['type'] == 'hazard':
-            obs['y'] = 2.0 + 1.5 * abs(math.sin(time.time() * 2 + obs.get('phase', 0)))
-            obs['scale'] = 0.8 + 0.4 * math.sin(time.time() * 3)
+        elif obs.type == 'hazard':
+            obs.y = 2.0 + 1.5 * abs(math.sin(sim_time * 2 + obs.phase))
+            obs.scale = 0.8 + 0.4 * math.sin(sim_time * 3)
         
-        if obs['z'] > 10:
+        if obs.z > 10 and obs.z - distance_delta >= 3.0:
             obstacles.remove(obs)
             stats_obstacles_dodged += 1
             player_perfect_dodge_count += 1
-
-def spawn_obstacle():
-    lane = random.randint(0, 2)
-    x = (lane - 1) * LANE_WIDTH
-    z = -600
     
+    obstacles.compact()
+
+def obstacle_types(distance):
     types = ['barrier']
-    if total_distance > 500:
+    if distance > 500:
         types.append('spike')
-    if total_distance > 1000:
+    if distance > 1000:
         types.extend(['beam', 'hazard'])
-    if total_distance > 1500:
+    if distance > 1500:
         types.append('crusher')
+    return types
+
+def spawn_obstacle(lane, z, obs_type, direction, rot, phase):
+    x = (lane - 1) * LANE_WIDTH
     
-    obs_type = random.choice(types)
-    
-    obs = {
-        'type': obs_type,
-        'x': x,
-        'y': 0,
-        'z': z,
-        'hp': 3 if obs_type == 'barrier' else 1,
-        'dir': random.choice([-1, 1]),
-        'rot': random.uniform(0, 360),
-        'phase': random.uniform(0, 6.28)
-    }
-    obstacles.append(obs)
+    return obstacles.spawn(
+        obs_type=obs_type,
+        x=x,
+        y=0,
+        z=z,
+        hp=3 if obs_type == 'barrier' else 1,
+        direction=direction,
+        rot=rot,
+        phase=phase
+    )
 
 def update_collectibles(dt, distance_delta):
-    for col in collectibles[:]:
-        col['z'] += distance_delta
-        col['rot'] += 120 * dt
+    for col in collectibles:
+        col.z += distance_delta
+        col.rot += 120 * dt
         
-        if col['z'] > 10:
+        if col.z > 10 and col.z - distance_delta >= 5.0:
             collectibles.remove(col)
+    
+    collectibles.compact()
 
-def spawn_collectible():
+def pick_collectible(odds, roll, needed_powerups=None):
+    for col_type, threshold in odds:
+        if roll < threshold and (needed_powerups is None or col_type not in POWERUP_TYPES or col_type in needed_powerups):
+            return col_type
+    return 'gem_blue'
+
+def spawn_collectible(lane, z, quota_roll, pick_roll, type_roll):
     global shield_spawn_count, speed_spawn_count, grenade_spawn_count
     
-    lane = random.randint(0, 2)
     x = (lane - 1) * LANE_WIDTH
-    z = -600
     y = 2.5
     
-    if total_distance < 2000:
+    if total_distance < POWERUP_QUOTA_DISTANCE:
         needed_powerups = []
-        if shield_spawn_count < 2:
+        if shield_spawn_count < POWERUP_QUOTA:
             needed_powerups.append('shield')
-        if speed_spawn_count < 2:
+        if speed_spawn_count < POWERUP_QUOTA:
             needed_powerups.append('speed')
-        if grenade_spawn_count < 2:
+        if grenade_spawn_count < POWERUP_QUOTA:
             needed_powerups.append('grenade')
         
-        if needed_powerups and random.random() < 0.6:
-            col_type = random.choice(needed_powerups)
+        if needed_powerups and quota_roll < POWERUP_QUOTA_CHANCE:
+            col_type = needed_powerups[int(pick_roll * len(needed_powerups))]
             if col_type == 'shield':
                 shield_spawn_count += 1
-                print(f"[SPAWN] Shield {shield_spawn_count}/2 spawned at distance {int(total_distance)}m")
+                log_event('SPAWN', f"Shield {shield_spawn_count}/{POWERUP_QUOTA} spawned at distance {int(total_distance)}m")
             elif col_type == 'speed':
                 speed_spawn_count += 1
-                print(f"[SPAWN] Speed boost {speed_spawn_count}/2 spawned at distance {int(total_distance)}m")
+                log_event('SPAWN', f"Speed boost {speed_spawn_count}/{POWERUP_QUOTA} spawned at distance {int(total_distance)}m")
             elif col_type == 'grenade':
                 grenade_spawn_count += 1
-                print(f"[SPAWN] Grenade pack {grenade_spawn_count}/2 spawned at distance {int(total_distance)}m")
+                log_event('SPAWN', f"Grenade pack {grenade_spawn_count}/{POWERUP_QUOTA} spawned at distance {int(total_distance)}m")
         else:
-            r = random.random()
-            if r < 0.20:
-                col_type = 'gem_green'
-            elif r < 0.40:
-                col_type = 'gem_blue'
-            elif r < 0.55:
-                col_type = 'gem_purple'
-            elif r < 0.70:
-                col_type = 'gem_gold'
-            elif r < 0.80 and shield_spawn_count < 2:
-                col_type = 'shield'
+            col_type = pick_collectible(EARLY_COLLECTIBLE_ODDS, type_roll, needed_powerups)
+            if col_type == 'shield':
                 shield_spawn_count += 1
-            elif r < 0.90 and speed_spawn_count < 2:
-                col_type = 'speed'
+            elif col_type == 'speed':
                 speed_spawn_count += 1
-            elif grenade_spawn_count < 2:
-                col_type = 'grenade'
+            elif col_type == 'grenade':
                 grenade_spawn_count += 1
-            else:
-                col_type = 'gem_blue'
     else:
-        r = random.random()
-        if r < 0.15:
-            col_type = 'gem_green'
-        elif r < 0.30:
-            col_type = 'gem_blue'
-        elif r < 0.42:
-            col_type = 'gem_purple'
-        elif r < 0.52:
-            col_type = 'gem_gold'
-        elif r < 0.68:
-            col_type = 'shield'
-        elif r < 0.84:
-            col_type = 'speed'
-        else:
-            col_type = 'grenade'
-    
-    col = {
-        'type': col_type,
-        'x': x,
-        'y': y,
-        'z': z,
-        'rot': 0
-    }
-    collectibles.append(col)
-    print(f"[COLLECTIBLE] Spawned {col_type} at lane {lane}, x={x:.1f}, y={y:.1f}, z={z:.1f}")
+        col_type = pick_collectible(LATE_COLLECTIBLE_ODDS, type_roll)
+    
+    collectibles.spawn(col_type=col_type, x=x, y=y, z=z)
+    log_event('COLLECTIBLE', f"Spawned {col_type} at lane {lane}, x={x:.1f}, y={y:.1f}, z={z:.1f}")
 
 def update_projectiles(dt):
-    for proj in projectiles[:]:
-        proj['z'] -= 180.0 * dt
-        proj['life'] -= dt
-        
-        if proj['type'] == 'grenade':
-            proj['y'] += proj['vy'] * dt
-            proj['vy'] += GRAVITY * dt
-            proj['rot'] = proj.get('rot', 0) + 360 * dt
+    for proj in projectiles:
+        proj.z -= PROJECTILE_SPEED * dt
+        proj.life -= dt
+        
+        if proj.type == 'grenade':
+            proj.y += proj.vy * dt
+            proj.vy += GRAVITY * dt
+            proj.rot += 360 * dt
             
-            if proj['y'] <= 0:
-                spawn_explosion(proj['x'], 0, proj['z'], COL_NEON_ORANGE, 15)
+            if proj.y <= 0:
+                spawn_explosion(proj.x, 0, proj.z, COL_NEON_ORANGE, 15)
                 projectiles.remove(proj)
                 continue
         
-        if proj['life'] <= 0 or proj['z'] < -700:
-            if proj in projectiles:
-                projectiles.remove(proj)
+        if proj.life <= 0 or proj.z < -700:
+            projectiles.remove(proj)
+    
+    projectiles.compact()
 
 def update_particles(dt):
-    for part in particles[:]:
-        part['x'] += part['vx'] * dt
-        part['y'] += part['vy'] * dt
-        part['z'] += part['vz'] * dt
-        part['vy'] += GRAVITY * dt * 0.5
-        part['life'] -= dt
-        
-        if part['life'] <= 0:
-            particles.remove(part)
+    global particle_count
+    
+    n = particle_count
+    if n == 0:
+        return
+    
+    particle_positions[:n] += particle_velocities[:n] * dt
+    particle_velocities[:n, 1] += GRAVITY * dt * 0.5
+    particle_life[:n] -= dt
+    
+    alive = particle_life[:n] > 0
+    remaining = int(np.count_nonzero(alive))
+    if remaining == n:
+        return
+    
+    holes = np.flatnonzero(~alive[:remaining])
+    movers = np.flatnonzero(alive[remaining:]) + remaining
+    for arr in (particle_positions, particle_velocities, particle_life, particle_colors):
+        arr[holes] = arr[movers]
+    particle_count = remaining
 
 def spawn_explosion(x, y, z, color, count=10):
-    for i in range(count):
-        part = {
-            'x': x,
-            'y': y,
-            'z': z,
-            'vx': random.uniform(-15, 15),
-            'vy': random.uniform(10, 25),
-            'vz': random.uniform(-15, 15),
-            'life': random.uniform(0.5, 1.2),
-            'color': color
+    global particle_count, particle_peak, particles_dropped
+    
+    requested = count
+    count = min(count, PARTICLE_CAPACITY - particle_count)
+    particles_dropped += requested - max(count, 0)
+    if count <= 0:
+        return
+    
+    start = particle_count
+    end = start + count
+    
+    particle_positions[start:end] = (x, y, z)
+    particle_velocities[start:end, 0] = particle_rng.uniform(-15, 15, count)
+    particle_velocities[start:end, 1] = particle_rng.uniform(10, 25, count)
+    particle_velocities[start:end, 2] = particle_rng.uniform(-15, 15, count)
+    particle_life[start:end] = particle_rng.uniform(0.5, 1.2, count)
+    particle_colors[start:end] = color
+    particle_count = end
+    particle_peak = max(particle_peak, end)
+
+def pool_stats():
+    return {
+        'obstacles': obstacles.stats(),
+        'collectibles': collectibles.stats(),
+        'projectiles': projectiles.stats(),
+        'particles': {
+            'live': particle_count,
+            'free': PARTICLE_CAPACITY - particle_count,
+            'capacity': PARTICLE_CAPACITY,
+            'peak': particle_peak,
+            'rejected': particles_dropped,
+        },
+    }
+
+class PlanNode:
+    __slots__ = ('actions', 'lane', 'moves', 'jumps', 'slides', 'grounded', 'slide_free', 'last')
+    
+    def __init__(self, actions, lane, moves, jumps, slides, grounded, slide_free, last):
+        self.actions = actions
+        self.lane = lane
+        self.moves = moves
+        self.jumps = jumps
+        self.slides = slides
+        self.grounded = grounded
+        self.slide_free = slide_free
+        self.last = last
+    
+    def x_at(self, n):
+        for start, target, x in reversed(self.moves):
+            if start <= n:
+                return target + (x - target) * (1.0 - 12.0 * physics_step) ** (n - start)
+    
+    def y_at(self, n):
+        for start, arc in reversed(self.jumps):
+            if start <= n:
+                return arc[n - start] if n - start < len(arc) else 0.0
+        return 0.0
+    
+    def sliding_at(self, n):
+        return any(start <= n < end for start, end in self.slides)
+
+def jump_arc(y, vy):
+    arc = [y]
+    while True:
+        y += vy * physics_step
+        vy += GRAVITY * physics_step
+        if y <= 0:
+            return arc
+        arc.append(y)
+
+def slide_ticks(timer):
+    ticks = 0
+    while timer > 0:
+        ticks += 1
+        timer -= physics_step
+    return ticks
+
+def fresh_motion():
+    if physics_step not in planner_motion:
+        arc = jump_arc(0.0, JUMP_FORCE)
+        leads = {
+            'left': int(PLANNER_LANE_LEAD / physics_step),
+            'right': int(PLANNER_LANE_LEAD / physics_step),
+            'jump': arc.index(max(arc)),
+            'slide': int(PLANNER_SLIDE_LEAD / physics_step),
         }
-        particles.append(part)
+        planner_motion[physics_step] = (arc, slide_ticks(1.0), leads)
+    return planner_motion[physics_step]
 
-def update_ai():
-    global player_lane_index, player_is_jumping, player_velocity_y, player_is_sliding, player_slide_timer
+def occupancy_grid(tick, speed, entries):
+    far = speed * PLANNER_HORIZON
+    step = speed * physics_step
+    reach = 3.0 + PLANNER_MARGIN
+    bin_ticks = max(1, round(PLANNER_BIN / physics_step))
+    
+    cells = []
+    for x, z, code in entries:
+        if -far < z and z - step < reach:
+            lane = min(2, max(0, round(x / LANE_WIDTH + 1)))
+            impact = (tick + int(-z / step)) // bin_ticks
+            cells.append((impact * 3 + lane) * PLANNER_CELL_CODES + code)
+    return tuple(sorted(cells))
+
+def planner_contacts(now, speed, obstacles, ticks):
+    step = speed * physics_step
+    reach = 3.0 + PLANNER_MARGIN
+    contacts = []
+    
+    for obs_type, x, y, z, direction, phase in obstacles:
+        first = max(0, math.ceil((-reach - z) / step))
+        last = min(ticks, math.floor((reach - z) / step) + 1)
+        for n in range(0 if obs_type == 'crusher' else first, last + 1):
+            if n > 0 and obs_type == 'crusher':
+                x += direction * 18.0 * physics_step
+                if abs(x) > LANE_WIDTH * 1.5:
+                    direction *= -1
+            if n < first:
+                continue
+            if n > 0 and obs_type == 'hazard':
+                y = 2.0 + 1.5 * abs(math.sin((now + n * physics_step) * 2 + phase))
+            contacts.append((n, obs_type, x, y))
     
-    my_x = (player_lane_index - 1) * LANE_WIDTH
-    nearest_dist = 999
-    threat = None
+    contacts.sort()
+    return contacts
+
+def plan_hit(node, contacts):
+    reach = 3.0 + PLANNER_MARGIN
+    
+    for n, obs_type, x, y in contacts:
+        if abs(x - node.x_at(n)) >= reach:
+            continue
+        player_height = node.y_at(n)
+        if player_height > 4.0 + PLANNER_CLEARANCE and obs_type != 'beam':
+            continue
+        if obs_type == 'spike' and player_height > 3.0 + PLANNER_CLEARANCE:
+            continue
+        if obs_type == 'beam' and node.sliding_at(n):
+            continue
+        if obs_type == 'hazard' and abs(y - player_height) > 2.0 + PLANNER_CLEARANCE:
+            continue
+        return n, obs_type
+    return None
+
+def extend_plan(node, offset, action):
+    arc, slide_length, leads = fresh_motion()
+    moves, jumps, slides = node.moves, node.jumps, node.slides
+    lane, grounded, slide_free = node.lane, node.grounded, node.slide_free
+    
+    if action in ('left', 'right'):
+        lane += -1 if action == 'left' else 1
+        if not 0 <= lane <= 2:
+            return None
+        moves = moves + [(offset, (lane - 1) * LANE_WIDTH, node.x_at(offset))]
+    elif action == 'jump':
+        if offset < grounded:
+            return None
+        jumps = jumps + [(offset, arc)]
+        grounded = offset + len(arc)
+    else:
+        if offset < slide_free:
+            return None
+        slides = slides + [(offset, offset + slide_length)]
+        slide_free = offset + slide_length
     
-    for obs in obstacles:
-        if obs['z'] < 0 and obs['z'] > -150:
-            if abs(obs['x'] - my_x) < 6:
-                dist = abs(obs['z'])
-                if dist < nearest_dist:
-                    nearest_dist = dist
-                    threat = obs
-    
-    if threat and nearest_dist < 50:
-        if threat['type'] in ['spike', 'hazard']:
-            if not player_is_jumping and player_y == 0:
-                player_is_jumping = True
-                player_velocity_y = JUMP_FORCE
-        elif threat['type'] == 'beam':
-            if not player_is_sliding:
-                player_is_sliding = True
-                player_slide_timer = 1.0
-        else:
-            safe_lanes = [0, 1, 2]
-            for obs in obstacles:
-                if obs['z'] < 0 and obs['z'] > -100:
-                    obs_lane = round((obs['x'] / LANE_WIDTH) + 1)
-                    if obs_lane in safe_lanes:
-                        safe_lanes.remove(obs_lane)
-            
-            if safe_lanes and player_lane_index not in safe_lanes:
-                player_lane_index = random.choice(safe_lanes)
+    return PlanNode(node.actions + ((offset, action),), lane, moves, jumps, slides, grounded, slide_free, offset)
+
+def search_plan(node, depth, contacts):
+    hit = plan_hit(node, contacts)
+    if hit is None or depth == 0:
+        return node, hit
+    
+    leads = fresh_motion()[2]
+    best, best_hit = node, hit
+    n, obs_type = hit
+    for action in PLANNER_RESPONSES[obs_type]:
+        earliest = node.last
+        if action == 'jump':
+            earliest = max(earliest, node.grounded)
+        elif action == 'slide':
+            earliest = max(earliest, node.slide_free)
+        
+        for offset in sorted({max(earliest, n - leads[action]), earliest}, reverse=True):
+            if offset > n:
+                continue
+            child = extend_plan(node, offset, action)
+            if child is None:
+                continue
+            found, found_hit = search_plan(child, depth - 1, contacts)
+            if found_hit is None:
+                return found, None
+            if found_hit[0] > best_hit[0]:
+                best, best_hit = found, found_hit
+    return best, best_hit
+
+def plan_moves(now, speed, player, obstacles, collectibles):
+    lane, x, y, vy, jumping, sliding, slide_timer = player
+    current_arc = jump_arc(y, vy) if jumping else []
+    current_slide = slide_ticks(slide_timer) if sliding else 0
+    root = PlanNode((), lane, [(0, (lane - 1) * LANE_WIDTH, x)], [(0, current_arc)], [(0, current_slide)],
+                    len(current_arc), current_slide, 0)
+    contacts = planner_contacts(now, speed, obstacles, int(PLANNER_HORIZON / physics_step))
+    
+    openings = []
+    ahead = [(z, col_x) for col_x, z in collectibles if -speed * PLANNER_HORIZON < z < -speed * PLANNER_LANE_LEAD]
+    if ahead:
+        target = min(2, max(0, round(max(ahead)[1] / LANE_WIDTH + 1)))
+        opening = root
+        while opening is not None and opening.lane != target:
+            opening = extend_plan(opening, 0, 'left' if target < opening.lane else 'right')
+        if opening is not root and opening is not None:
+            openings.append(opening)
+    openings.append(root)
+    
+    best, best_hit = None, None
+    for opening in openings:
+        found, found_hit = search_plan(opening, PLANNER_DEPTH - len(opening.actions), contacts)
+        if found_hit is None:
+            return found.actions
+        if best is None or found_hit[0] > best_hit[0]:
+            best, best_hit = found, found_hit
+    return best.actions
+
+def apply_ai_action(action):
+    global player_lane_index, player_is_jumping, player_velocity_y, player_is_sliding, player_slide_timer
     
-    for col in collectibles:
-        if col['z'] < 0 and col['z'] > -100:
-            col_lane = round((col['x'] / LANE_WIDTH) + 1)
-            if col_lane != player_lane_index and abs(col['z']) > 30:
-                player_lane_index = col_lane
-                break
+    if action == 'left' and player_lane_index > 0:
+        player_lane_index -= 1
+    elif action == 'right' and player_lane_index < 2:
+        player_lane_index += 1
+    elif action == 'jump' and not player_is_jumping and player_y == 0:
+        player_is_jumping = True
+        player_velocity_y = JUMP_FORCE
+    elif action == 'slide' and not player_is_sliding:
+        player_is_sliding = True
+        player_slide_timer = 1.0
+
+def update_ai():
+    global ai_grid, ai_plan
+    
+    entries = [(obs.x, obs.z, OBSTACLE_TYPES.index(obs.type)) for obs in obstacles]
+    entries.extend((col.x, col.z, len(OBSTACLE_TYPES)) for col in collectibles)
+    grid = occupancy_grid(sim_tick, current_speed, entries)
+    
+    if grid != ai_grid:
+        ai_grid = grid
+        player = (player_lane_index, player_x, player_y, player_velocity_y,
+                  player_is_jumping, player_is_sliding, player_slide_timer)
+        plan = plan_moves(sim_time, current_speed, player,
+                          [(obs.type, obs.x, obs.y, obs.z, obs.dir, obs.phase) for obs in obstacles],
+                          [(col.x, col.z) for col in collectibles])
+        ai_plan = tuple((sim_tick + offset, action) for offset, action in plan)
+    
+    while ai_plan and ai_plan[0][0] <= sim_tick:
+        apply_ai_action(ai_plan[0][1])
+        ai_plan = ai_plan[1:]
+
+def build_z_index(entities):
+    z_order = sorted(range(len(entities)), key=lambda i: entities[i].z)
+    z_keys = [entities[i].z for i in z_order]
+    return z_order, z_keys
 
 def check_collisions():
     global player_health, game_state, player_has_shield, current_score
@@ -1374,6 +2882,7 @@ def check_collisions():
     global stats_gems_collected, player_damage_flash, obstacles
     global collectibles, projectiles, player_perfect_dodge_count
     global player_shield_timer, player_speed_boost_active, player_speed_boost_timer
+    global stats_killed_by
     
     player_box = {
         'x': player_x,
@@ -1382,149 +2891,168 @@ def check_collisions():
         'radius': 1.5
     }
     
-    for obs in obstacles[:]:
-        dx = abs(obs['x'] - player_box['x'])
-        dz = abs(obs['z'] - player_box['z'])
+    for obs in obstacles:
+        dx = abs(obs.x - player_box['x'])
         
-        if dx < 3.0 and dz < 3.0:
+        if dx < 3.0 and swept_gap(obs.z - player_box['z'], last_distance_delta) < 3.0:
             collision = True
             
-            if player_y > 4.0 and obs['type'] != 'beam':
+            if player_y > 4.0 and obs.type != 'beam':
                 collision = False
-            elif obs['type'] == 'spike' and player_y > 3.0:
+            elif obs.type == 'spike' and player_y > 3.0:
                 collision = False
-            elif obs['type'] == 'beam' and player_is_sliding:
+            elif obs.type == 'beam' and player_is_sliding:
                 collision = False
-            elif obs['type'] == 'hazard':
-                dy = abs(obs.get('y', 2.0) - player_y)
+            elif obs.type == 'hazard':
+                dy = abs(obs.y - player_y)
                 if dy > 2.0:
                     collision = False
             
             if collision:
                 if player_cheat_mode:
                     obstacles.remove(obs)
-                    spawn_explosion(obs['x'], 2, obs['z'], COL_GOLD, 12)
+                    spawn_explosion(obs.x, 2, obs.z, COL_GOLD, 12)
                     current_score += 50
                 elif player_has_shield:
                     player_has_shield = False
                     player_shield_timer = 0
                     obstacles.remove(obs)
-                    spawn_explosion(obs['x'], 2, obs['z'], COL_NEON_GREEN, 12)
+                    spawn_explosion(obs.x, 2, obs.z, COL_NEON_GREEN, 12)
                     show_message("SHIELD DESTROYED! No Damage Taken")
-                    print("[SHIELD] Shield absorbed damage!")
+                    log_event('SHIELD', "Shield absorbed damage!")
                 else:
                     player_health -= 1
                     player_damage_flash = 1.0
                     player_perfect_dodge_count = 0
+                    stats_hits_by_type[obs.type] = stats_hits_by_type.get(obs.type, 0) + 1
                     obstacles.remove(obs)
                     spawn_explosion(player_x, player_y + 1, player_z, COL_WARNING, 15)
-                    print(f"[HIT] Health: {player_health}/3")
+                    log_event('HIT', f"Health: {player_health}/3")
                     
                     if player_health <= 0:
                         game_state = "gameover"
-                        print("[GAME OVER]")
+                        stats_killed_by = obs.type
+                        log_event('GAME OVER', "Player destroyed")
+                        obstacles.compact()
                         return
     
-    for proj in projectiles[:]:
-        for obs in obstacles[:]:
-            dist = distance_3d(proj['x'], proj['y'], proj['z'], 
-                              obs['x'], obs.get('y', 2), obs['z'])
+    obstacles.compact()
+    
+    candidates_by_z = obstacles.items
+    z_order, z_keys = build_z_index(candidates_by_z)
+    hit_radius_sq = PROJECTILE_HIT_RADIUS ** 2
+    closing = last_distance_delta + PROJECTILE_SPEED * physics_step
+    
+    for proj in projectiles:
+        lo = bisect.bisect_left(z_keys, proj.z - PROJECTILE_HIT_RADIUS)
+        hi = bisect.bisect_right(z_keys, proj.z + closing + PROJECTILE_HIT_RADIUS)
+        candidates = sorted(i for i in z_order[lo:hi] if candidates_by_z[i].alive)
+        
+        for obs_index in candidates:
+            obs = candidates_by_z[obs_index]
+            dx = obs.x - proj.x
+            dy = obs.y - proj.y
+            dz = swept_gap(obs.z - proj.z, closing)
             
-            if dist < 4.0:
-                if proj['type'] == 'charge':
+            if dx * dx + dy * dy + dz * dz < hit_radius_sq:
+                if proj.type == 'charge':
                     damage = 10
-                elif proj['type'] == 'grenade':
+                elif proj.type == 'grenade':
                     damage = 10
                 else:
                     damage = 1
                 
-                obs['hp'] -= damage
+                obs.hp -= damage
                 
-                if proj['type'] != 'charge' and proj in projectiles:
+                if proj.type != 'charge':
                     projectiles.remove(proj)
                 
-                if obs['hp'] <= 0:
-                    if obs in obstacles:
-                        obstacles.remove(obs)
-                    current_score += 20 if obs['type'] == 'barrier' else 15
-                    spawn_explosion(obs['x'], 2, obs['z'], COL_NEON_PINK, 10)
-                    print(f"[DESTROYED] +{20 if obs['type'] == 'barrier' else 15} points")
+                if obs.hp <= 0:
+                    obstacles.remove(obs)
+                    current_score += 20 if obs.type == 'barrier' else 15
+                    spawn_explosion(obs.x, 2, obs.z, COL_NEON_PINK, 10)
+                    log_event('DESTROYED', f"+{20 if obs.type == 'barrier' else 15} points")
                 
                 break
     
-    for col in collectibles[:]:
-        dist = distance_3d(player_x, player_y, player_z, 
-                          col['x'], col['y'], col['z'])
+    projectiles.compact()
+    obstacles.compact()
+    
+    for col in collectibles:
+        dz = swept_gap(col.z - player_z, last_distance_delta)
+        dist = math.sqrt((col.x - player_x)**2 + (col.y - player_y)**2 + dz**2)
         
-        if col['z'] > -50 and col['z'] < 50:
-            print(f"[DEBUG] Collectible {col['type']} at x={col['x']:.1f}, y={col['y']:.1f}, z={col['z']:.1f} | Player at x={player_x:.1f}, y={player_y:.1f}, z={player_z:.1f} | Distance={dist:.2f}")
+        if col.z > -50 and col.z < 50 and log_enabled('DEBUG'):
+            log_event('DEBUG', f"Collectible {col.type} at x={col.x:.1f}, y={col.y:.1f}, z={col.z:.1f} | Player at x={player_x:.1f}, y={player_y:.1f}, z={player_z:.1f} | Distance={dist:.2f}")
         
         if dist < 5.0:
             collectibles.remove(col)
             stats_gems_collected += 1
             
-            print(f"[COLLECT] *** COLLECTED {col['type']} *** at distance {dist:.2f} | Current score before: {int(current_score)}")
+            log_event('COLLECT', f"*** COLLECTED {col.type} *** at distance {dist:.2f} | Current score before: {int(current_score)}")
             
-            if col['type'] == 'gem_green':
+            if col.type == 'gem_green':
                 points = 10 * combo_multiplier
                 current_score += points
                 update_combo()
                 show_message(f"Green Gem is collected! +{points}pts")
-                spawn_explosion(col['x'], col['y'], col['z'], COL_NEON_GREEN, 12)
-                print(f"[SCORE] Green gem +{points} points | New score: {int(current_score)}")
-            elif col['type'] == 'gem_blue':
+                spawn_explosion(col.x, col.y, col.z, COL_NEON_GREEN, 12)
+                log_event('SCORE', f"Green gem +{points} points | New score: {int(current_score)}")
+            elif col.type == 'gem_blue':
                 points = 25 * combo_multiplier
                 current_score += points
                 update_combo()
                 show_message(f"Blue Gem is collected! +{points}pts")
-                spawn_explosion(col['x'], col['y'], col['z'], COL_NEON_BLUE, 12)
-                print(f"[SCORE] Blue gem +{points} points | New score: {int(current_score)}")
-            elif col['type'] == 'gem_purple':
+                spawn_explosion(col.x, col.y, col.z, COL_NEON_BLUE, 12)
+                log_event('SCORE', f"Blue gem +{points} points | New score: {int(current_score)}")
+            elif col.type == 'gem_purple':
                 points = 50 * combo_multiplier
                 current_score += points
                 update_combo()
                 show_message(f"Purple Gem is collected! +{points}pts")
-                spawn_explosion(col['x'], col['y'], col['z'], COL_NEON_PURPLE, 12)
-                print(f"[SCORE] *** PURPLE GEM *** +{points} points | New score: {int(current_score)}")
-                print(f"[MESSAGE] Showing message: Purple Gem is collected! +{points}pts")
-            elif col['type'] == 'gem_gold':
+                spawn_explosion(col.x, col.y, col.z, COL_NEON_PURPLE, 12)
+                log_event('SCORE', f"*** PURPLE GEM *** +{points} points | New score: {int(current_score)}")
+                log_event('MESSAGE', f"Showing message: Purple Gem is collected! +{points}pts")
+            elif col.type == 'gem_gold':
                 points = 100 * combo_multiplier
                 current_score += points
                 update_combo()
                 show_message(f"Gold Gem is collected! +{points}pts")
-                spawn_explosion(col['x'], col['y'], col['z'], COL_GOLD, 15)
-                print(f"[SCORE] Gold gem +{points} points | New score: {int(current_score)}")
-            elif col['type'] == 'shield':
+                spawn_explosion(col.x, col.y, col.z, COL_GOLD, 15)
+                log_event('SCORE', f"Gold gem +{points} points | New score: {int(current_score)}")
+            elif col.type == 'shield':
                 current_score += 75
                 player_has_shield = True
                 player_shield_timer = SHIELD_DURATION
                 show_message("Shield is collected! +75pts")
-                spawn_explosion(col['x'], col['y'], col['z'], COL_NEON_GREEN, 15)
-                print(f"[SHIELD] *** SHIELD ACTIVATED *** +75 points | New score: {int(current_score)}")
-            elif col['type'] == 'speed':
+                spawn_explosion(col.x, col.y, col.z, COL_NEON_GREEN, 15)
+                log_event('SHIELD', f"*** SHIELD ACTIVATED *** +75 points | New score: {int(current_score)}")
+            elif col.type == 'speed':
                 current_score += 60
                 player_speed_boost_active = True
                 player_speed_boost_timer = SPEED_BOOST_DURATION
                 show_message("Speed Boost is collected! +60pts")
-                spawn_explosion(col['x'], col['y'], col['z'], COL_NEON_YELLOW, 15)
-                print(f"[SPEED] Speed boost activated! +60 points | New score: {int(current_score)}")
-            elif col['type'] == 'grenade':
+                spawn_explosion(col.x, col.y, col.z, COL_NEON_YELLOW, 15)
+                log_event('SPEED', f"Speed boost activated! +60 points | New score: {int(current_score)}")
+            elif col.type == 'grenade':
                 current_score += 50
                 player_grenades = min(MAX_GRENADES, player_grenades + 3)
                 show_message(f"Grenade Pack is collected! +50pts")
-                spawn_explosion(col['x'], col['y'], col['z'], COL_NEON_ORANGE, 15)
-                print(f"[GRENADE] Grenade pack collected! +50 points | New score: {int(current_score)}")
+                spawn_explosion(col.x, col.y, col.z, COL_NEON_ORANGE, 15)
+                log_event('GRENADE', f"Grenade pack collected! +50 points | New score: {int(current_score)}")
+    
+    collectibles.compact()
     
     if player_perfect_dodge_count >= 10:
         current_score += 100
         show_message("PERFECT DODGE BONUS +100pts!")
-        print("[BONUS] Perfect Dodge +100 points!")
+        log_event('BONUS', "Perfect Dodge +100 points!")
         player_perfect_dodge_count = 0
 
 def update_combo():
     global combo_multiplier, combo_last_collect_time
     
-    time_since_last = time.time() - combo_last_collect_time
+    time_since_last = sim_time - combo_last_collect_time
     
     if time_since_last < COMBO_TIMEOUT:
         if combo_multiplier == 1:
@@ -1533,50 +3061,60 @@ def update_combo():
             combo_multiplier = 3
         elif combo_multiplier == 3:
             combo_multiplier = 5
-        print(f"[COMBO] x{combo_multiplier}")
+        log_event('COMBO', f"x{combo_multiplier}")
     else:
         combo_multiplier = 1
     
-    combo_last_collect_time = time.time()
+    combo_last_collect_time = sim_time
 
 
 def handle_keyboard(key, x, y):
     global player_lane_index, player_is_jumping, player_velocity_y
     global player_is_sliding, player_slide_timer, game_state
     global player_cheat_mode, player_god_mode, slow_motion, camera_mode
-    global loading_countdown
+    global loading_countdown, profile_overlay, ai_grid
     
     k = key.lower()
     
     if k == b'\x1b':
+        stop_recording()
         sys.exit(0)
     
+    if k == b'o':
+        profile_overlay = not profile_overlay
+        return
+    
+    record_input(INPUT_KEY, key[0])
+    
     if game_state == "menu":
         if k == b' ':
             game_state = "loading"
             loading_countdown = 3.0
-            print("[LOADING] Get ready...")
+            log_event('LOADING', "Get ready...")
         return
     
     if game_state in ["gameover", "victory"]:
         if k == b'r':
             init_game()
+            reset_profile()
             game_state = "loading"
             loading_countdown = 3.0
-            print("[RESTART] Restarting game...")
+            log_event('RESTART', "Restarting game...")
         elif k == b'c' and game_state == "victory":
             game_state = "playing"
-            print("[CONTINUE] Continuing after victory...")
+            log_event('CONTINUE', "Continuing after victory...")
         elif k == b'q' or k == b'm':
             init_game()
+            reset_profile()
         return
     
     if game_state == "paused":
         if k == b'p' or k == b'r':
             game_state = "playing"
-            print("[RESUME] Game resumed")
+            log_event('RESUME', "Game resumed")
         elif k == b'q':
             init_game()
+            reset_profile()
         return
     
     if game_state == "playing":
@@ -1597,41 +3135,45 @@ def handle_keyboard(key, x, y):
         
         elif k == b'p':
             game_state = "paused"
-            print("[PAUSE] Game paused")
+            log_event('PAUSE', "Game paused")
         elif k == b'r':
             init_game()
+            reset_profile()
             game_state = "loading"
             loading_countdown = 3.0
         
         elif k == b'f':
             camera_mode = "first" if camera_mode != "first" else "third"
-            print(f"[CAMERA] {camera_mode.upper()} person view")
+            log_event('CAMERA', f"{camera_mode.upper()} person view")
         elif k == b'1':
             camera_mode = "side"
-            print("[CAMERA] Side view")
+            log_event('CAMERA', "Side view")
         elif k == b'2':
             camera_mode = "top"
-            print("[CAMERA] Top-down view")
+            log_event('CAMERA', "Top-down view")
         elif k == b'3':
             camera_mode = "cinematic"
-            print("[CAMERA] Cinematic view")
+            log_event('CAMERA', "Cinematic view")
         elif k == b'4':
             camera_mode = "third"
-            print("[CAMERA] Third person view (default)")
+            log_event('CAMERA', "Third person view (default)")
         
         elif k == b'c':
             player_cheat_mode = not player_cheat_mode
-            print(f"[CHEAT] Cheat Mode: {'ON' if player_cheat_mode else 'OFF'}")
+            log_event('CHEAT', f"Cheat Mode: {'ON' if player_cheat_mode else 'OFF'}")
         elif k == b'v':
             player_god_mode = not player_god_mode
-            print(f"[CHEAT] God Mode (AI): {'ON' if player_god_mode else 'OFF'}")
+            ai_grid = None
+            log_event('CHEAT', f"God Mode (AI): {'ON' if player_god_mode else 'OFF'}")
         elif k == b'b':
             slow_motion = not slow_motion
-            print(f"[CHEAT] Slow Motion: {'ON' if slow_motion else 'OFF'}")
+            log_event('CHEAT', f"Slow Motion: {'ON' if slow_motion else 'OFF'}")
 
 def handle_special_keys(key, x, y):
     global camera_offset_y, camera_rotation
     
+    record_input(INPUT_SPECIAL, key)
+    
     if game_state == "playing":
         if key == GLUT_KEY_UP:
             camera_offset_y += 2.0
@@ -1645,57 +3187,97 @@ def handle_special_keys(key, x, y):
 def handle_mouse(button, state, x, y):
     global player_charging, player_charge_start_time, projectiles, player_grenades
     
+    record_input(INPUT_MOUSE, button, state)
+    
     if game_state != "playing":
         return
     
     if button == GLUT_LEFT_BUTTON:
         if state == GLUT_DOWN:
             player_charging = True
-            player_charge_start_time = time.time()
+            player_charge_start_time = sim_time
         elif state == GLUT_UP:
             player_charging = False
-            charge_duration = time.time() - player_charge_start_time
+            charge_duration = sim_time - player_charge_start_time
             
             if charge_duration > 1.0:
                 proj_type = 'charge'
-                print("[WEAPON] Charge shot!")
+                log_event('WEAPON', "Charge shot!")
             else:
                 proj_type = 'laser'
             
-            proj = {
-                'type': proj_type,
-                'x': player_x + 0.8,
-                'y': player_y + 1.5,
-                'z': player_z - 2.0,
-                'life': 4.0,
-                'vy': 0
-            }
-            projectiles.append(proj)
+            projectiles.spawn(
+                proj_type=proj_type,
+                x=player_x + 0.8,
+                y=player_y + 1.5,
+                z=player_z - 2.0,
+                life=4.0,
+                vy=0
+            )
     
     elif button == GLUT_RIGHT_BUTTON and state == GLUT_DOWN:
         if player_grenades > 0 or player_cheat_mode:
+            proj = projectiles.spawn(
+                proj_type='grenade',
+                x=player_x,
+                y=player_y + 2.0,
+                z=player_z - 1.0,
+                life=5.0,
+                vy=18.0
+            )
+            if proj is None:
+                return
             if not player_cheat_mode:
                 player_grenades -= 1
-            
-            proj = {
-                'type': 'grenade',
-                'x': player_x,
-                'y': player_y + 2.0,
-                'z': player_z - 1.0,
-                'vy': 18.0,
-                'life': 5.0,
-                'rot': 0
-            }
-            projectiles.append(proj)
-            print(f"[WEAPON] Grenade launched! ({player_grenades} remaining)")
+            log_event('WEAPON', f"Grenade launched! ({player_grenades} remaining)")
+
+
+def setup_viewport(width, height):
+    glClearColor(*COL_DARK_VOID, 1.0)
+    glEnable(GL_DEPTH_TEST)
+    
+    glViewport(0, 0, width, height)
+    
+    glMatrixMode(GL_PROJECTION)
+    glLoadIdentity()
+    gluPerspective(60.0, float(width) / float(height), 0.1, 1000.0)
+    glMatrixMode(GL_MODELVIEW)
 
+def create_offscreen_context(width, height):
+    from OpenGL import EGL
+    
+    display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+    if not EGL.eglInitialize(display, None, None):
+        raise RuntimeError("could not initialise an EGL display")
+    
+    config_attribs = (EGL.EGLint * 13)(
+        EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+        EGL.EGL_RED_SIZE, 8, EGL.EGL_GREEN_SIZE, 8, EGL.EGL_BLUE_SIZE, 8,
+        EGL.EGL_DEPTH_SIZE, 24,
+        EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+        EGL.EGL_NONE)
+    config = EGL.EGLConfig()
+    num_configs = EGL.EGLint()
+    EGL.eglChooseConfig(display, config_attribs, ctypes.pointer(config), 1, ctypes.pointer(num_configs))
+    if num_configs.value < 1:
+        raise RuntimeError("no EGL config supports desktop OpenGL pbuffers")
+    
+    surface_attribs = (EGL.EGLint * 5)(EGL.EGL_WIDTH, width, EGL.EGL_HEIGHT, height, EGL.EGL_NONE)
+    surface = EGL.eglCreatePbufferSurface(display, config, surface_attribs)
+    EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+    context = EGL.eglCreateContext(display, config, EGL.EGL_NO_CONTEXT, None)
+    if not EGL.eglMakeCurrent(display, surface, surface, context):
+        raise RuntimeError("could not make the offscreen EGL context current")
+    
+    setup_viewport(width, height)
+    return display, surface, context
 
 def setup_camera():
-    global camera_mode, player_x, player_y, camera_offset_y
+    global camera_mode, camera_offset_y
     global camera_rotation, camera_cinematic_angle
     
     if game_state == "menu":
-        t = time.time() * 0.3
+        t = game_time() * 0.3
         cam_x = 100 * math.sin(t)
         cam_y = 50
         cam_z = 100 * math.cos(t)
@@ -1706,7 +3288,7 @@ def setup_camera():
     
     elif game_state in ["playing", "paused"]:
         if camera_mode == "third":
-            cam_x = player_x * 0.7
+            cam_x = view_player_x * 0.7
             cam_y = 20.0 + camera_offset_y
             cam_z = player_z + 35.0
             
@@ -1716,58 +3298,94 @@ def setup_camera():
                 cam_x += radius * math.sin(angle)
                 cam_z += radius * (1 - math.cos(angle))
             
-            look_x = player_x
-            look_y = player_y + 3.0
+            look_x = view_player_x
+            look_y = view_player_y + 3.0
             look_z = player_z - 30.0
             
             gluLookAt(cam_x, cam_y, cam_z, look_x, look_y, look_z, 0, 1, 0)
         
         elif camera_mode == "first":
-            gluLookAt(player_x, player_y + 1.8, player_z - 0.5,
-                     player_x, player_y + 1.8, -500,
+            gluLookAt(view_player_x, view_player_y + 1.8, player_z - 0.5,
+                     view_player_x, view_player_y + 1.8, -500,
                      0, 1, 0)
         
         elif camera_mode == "side":
             gluLookAt(40, 15, player_z,
-                     player_x, player_y + 2, player_z - 20,
+                     view_player_x, view_player_y + 2, player_z - 20,
                      0, 1, 0)
         
         elif camera_mode == "top":
-            gluLookAt(player_x, 60, player_z + 10,
-                     player_x, 0, player_z - 30,
+            gluLookAt(view_player_x, 60, player_z + 10,
+                     view_player_x, 0, player_z - 30,
                      0, 0, -1)
         
         elif camera_mode == "cinematic":
             camera_cinematic_angle += 0.01
             radius = 30.0
-            cam_x = player_x + radius * math.sin(camera_cinematic_angle)
+            cam_x = view_player_x + radius * math.sin(camera_cinematic_angle)
             cam_z = player_z + radius * math.cos(camera_cinematic_angle)
             cam_y = 25.0
             
             gluLookAt(cam_x, cam_y, cam_z,
-                     player_x, player_y + 2, player_z - 20,
+                     view_player_x, view_player_y + 2, player_z - 20,
                      0, 1, 0)
     
     elif game_state in ["gameover", "victory"]:
         gluLookAt(0, 40, 60, 0, 5, -50, 0, 1, 0)
 
-def display():
+def update_view_state():
+    global view_player_x, view_player_y
+    
+    view_player_x = lerp(prev_player_x, player_x, render_alpha)
+    view_player_y = lerp(prev_player_y, player_y, render_alpha)
+
+def render_scroll_offset():
+    return -(1.0 - render_alpha) * last_distance_delta
+
+def render_scene():
     glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
     glLoadIdentity()
     
+    update_view_state()
     setup_camera()
+    update_view_frustum()
     
-    draw_environment()
+    with profile_scope('draw.environment'):
+        draw_environment()
     
     if game_state != "menu":
-        draw_robot_player()
+        with profile_scope('draw.player'):
+            draw_robot_player()
+    
+    glPushMatrix()
+    glTranslatef(0, 0, render_scroll_offset())
+    with profile_scope('draw.obstacles'):
+        draw_obstacles()
+    with profile_scope('draw.pickups'):
+        draw_collectibles()
+    glPopMatrix()
     
-    draw_obstacles()
-    draw_collectibles()
-    draw_projectiles()
-    draw_particles()
+    with profile_scope('draw.projectiles'):
+        draw_projectiles()
+    with profile_scope('draw.particles'):
+        draw_particles()
+
+def display():
+    global profile_last_frame
     
-    draw_hud()
+    frame_start = time.perf_counter()
+    if profile_last_frame is not None:
+        profile_scope('frame').record((frame_start - profile_last_frame) * 1000.0)
+    profile_last_frame = frame_start
+    
+    with profile_scope('display'):
+        render_scene()
+        
+        with profile_scope('draw.hud'):
+            draw_hud()
+        
+        if profile_overlay:
+            draw_profile_overlay()
     
     glutSwapBuffers()
 
@@ -1778,24 +3396,1468 @@ def idle():
 
 
 
+def png_chunk(tag, data):
+    return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff)
+
+def encode_png(pixels, width, height):
+    rows = np.empty((height, width * 3 + 1), dtype=np.uint8)
+    rows[:, 0] = 0
+    rows[:, 1:] = np.frombuffer(pixels, dtype=np.uint8).reshape(height, width * 3)[::-1]
+    
+    return (b'\x89PNG\r\n\x1a\n'
+            + png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + png_chunk(b'IDAT', zlib.compress(rows.tobytes(), CAPTURE_PNG_LEVEL))
+            + png_chunk(b'IEND', b''))
+
+class FrameWriter:
+    def __init__(self, path, width, height, fps):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.frames = queue.Queue(maxsize=CAPTURE_QUEUE_DEPTH)
+        self.encoder = None
+        self.error = None
+        
+        if path.lower().endswith(CAPTURE_VIDEO_EXTENSIONS):
+            try:
+                self.encoder = subprocess.Popen(
+                    [CAPTURE_FFMPEG, '-loglevel', 'error', '-y',
+                     '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f'{width}x{height}', '-r', f'{fps:g}',
+                     '-i', '-', '-vf', 'vflip', '-pix_fmt', 'yuv420p', path],
+                    stdin=subprocess.PIPE)
+            except FileNotFoundError:
+                raise SystemExit(f"{CAPTURE_FFMPEG} not found; capture to a directory to write a PNG sequence instead")
+            writers = 1
+        else:
+            os.makedirs(path, exist_ok=True)
+            writers = CAPTURE_PNG_WRITERS
+        
+        self.threads = [threading.Thread(target=self.run, daemon=True) for _ in range(writers)]
+        for thread in self.threads:
+            thread.start()
+    
+    def submit(self, index, pixels):
+        if self.error is not None:
+            raise self.error
+        self.frames.put((index, pixels))
+    
+    def run(self):
+        while True:
+            item = self.frames.get()
+            if item is None:
+                return
+            if self.error is not None:
+                continue
+            
+            index, pixels = item
+            try:
+                if self.encoder is not None:
+                    self.encoder.stdin.write(pixels)
+                else:
+                    with open(os.path.join(self.path, f'frame_{index:06d}.png'), 'wb') as f:
+                        f.write(encode_png(pixels, self.width, self.height))
+            except (OSError, ValueError) as error:
+                self.error = error
+    
+    def close(self):
+        for thread in self.threads:
+            self.frames.put(None)
+        for thread in self.threads:
+            thread.join()
+        
+        if self.encoder is not None:
+            try:
+                self.encoder.stdin.close()
+            except OSError:
+                pass
+            if self.encoder.wait() != 0 and self.error is None:
+                self.error = RuntimeError(f"{CAPTURE_FFMPEG} exited with status {self.encoder.returncode}")
+        
+        if self.error is not None:
+            raise self.error
+
+def start_recording(path):
+    global replay_file
+    
+    replay_file = open(path, 'wb')
+    replay_file.write(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, session_seed, 1.0 / physics_step))
+    atexit.register(stop_recording)
+    log_event('REPLAY', f"Recording inputs to {path} (seed {session_seed})")
+
+def record_input(kind, code, state=0):
+    if replay_file is not None:
+        replay_file.write(REPLAY_EVENT.pack(sim_tick, kind, code, state))
+
+def stop_recording():
+    global replay_file
+    
+    if replay_file is None:
+        return
+    
+    replay_file.write(REPLAY_EVENT.pack(sim_tick, INPUT_END, 0, 0))
+    replay_file.write(REPLAY_FOOTER.pack(total_distance, current_score))
+    replay_file.close()
+    replay_file = None
+    log_event('REPLAY', f"Recording stopped at tick {sim_tick}")
+
+def load_replay(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    
+    magic, version, seed, physics_hz = REPLAY_HEADER.unpack_from(data, 0)
+    if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+        raise ValueError(f"{path} is not a version {REPLAY_VERSION} replay file")
+    
+    events = []
+    offset = REPLAY_HEADER.size
+    end_tick = None
+    final_state = None
+    while offset + REPLAY_EVENT.size <= len(data):
+        tick, kind, code, state = REPLAY_EVENT.unpack_from(data, offset)
+        offset += REPLAY_EVENT.size
+        if kind == INPUT_END:
+            end_tick = tick
+            final_state = REPLAY_FOOTER.unpack_from(data, offset)
+            break
+        events.append((tick, kind, code, state))
+    
+    if end_tick is None:
+        end_tick = events[-1][0] if events else 0
+    
+    return {
+        'seed': seed,
+        'physics_hz': physics_hz,
+        'events': events,
+        'end_tick': end_tick,
+        'final_state': final_state,
+    }
+
+def dispatch_input(kind, code, state):
+    if kind == INPUT_KEY:
+        handle_keyboard(bytes([code]), 0, 0)
+    elif kind == INPUT_SPECIAL:
+        handle_special_keys(code, 0, 0)
+    elif kind == INPUT_MOUSE:
+        handle_mouse(code, state, 0, 0)
+
+def run_replay_session(replay, on_tick=None):
+    set_physics_rate(replay['physics_hz'])
+    sim_clock = [0.0]
+    set_game_clock(lambda: sim_clock[0])
+    start_session(replay['seed'])
+    
+    events = replay['events']
+    next_event = 0
+    while sim_tick < replay['end_tick']:
+        while next_event < len(events) and events[next_event][0] <= sim_tick:
+            dispatch_input(*events[next_event][1:])
+            next_event += 1
+        sim_clock[0] = (sim_tick + 1) * physics_step
+        advance_physics()
+        if on_tick is not None and on_tick():
+            break
+    
+    while next_event < len(events):
+        dispatch_input(*events[next_event][1:])
+        next_event += 1
+    
+    return {
+        'ticks': sim_tick,
+        'state': game_state,
+        'distance': total_distance,
+        'score': int(current_score),
+        'matches': replay['final_state'] == (total_distance, current_score),
+    }
+
+def begin_headless_session(sim_clock, seed, god_mode=True):
+    global game_state, player_god_mode, player_cheat_mode, slow_motion
+    
+    set_game_clock(lambda: sim_clock[0])
+    
+    start_session(seed)
+    game_state = "playing"
+    player_god_mode = god_mode
+    player_cheat_mode = False
+    slow_motion = False
+
+def advance_headless_session(sim_clock, max_ticks, on_tick=None):
+    while sim_tick < max_ticks and game_state == "playing":
+        sim_clock[0] = (sim_tick + 1) * physics_step
+        advance_physics()
+        if on_tick is not None and on_tick():
+            break
+
+def run_headless_session(max_ticks, seed, god_mode=True, on_tick=None):
+    sim_clock = [0.0]
+    begin_headless_session(sim_clock, seed, god_mode)
+    advance_headless_session(sim_clock, max_ticks, on_tick)
+    return headless_result(seed)
+
+def headless_result(seed):
+    return {
+        'seed': seed,
+        'ticks': sim_tick,
+        'sim_seconds': sim_time,
+        'state': game_state,
+        'distance': total_distance,
+        'score': int(current_score),
+        'health': player_health,
+        'obstacles_dodged': stats_obstacles_dodged,
+        'gems_collected': stats_gems_collected,
+        'hits_by_type': dict(stats_hits_by_type),
+        'killed_by': stats_killed_by,
+    }
+
+def pick_collectible_codes(odds, rolls, needed_powerups=None):
+    codes = np.full(len(rolls), COLLECTIBLE_TYPES.index('gem_blue'))
+    chosen = np.zeros(len(rolls), dtype=bool)
+    
+    for col_type, threshold in odds:
+        pick = ~chosen & (rolls < threshold)
+        if needed_powerups is not None and col_type in POWERUP_TYPES:
+            pick &= needed_powerups[:, POWERUP_TYPES.index(col_type)]
+        codes[pick] = COLLECTIBLE_TYPES.index(col_type)
+        chosen |= pick
+    return codes
+
+class BatchSimulation:
+    STATES = ('playing', 'gameover', 'victory')
+    COMBO_NEXT = np.array([1, 2, 3, 5, 5, 5])
+    LAST_IN_ORDER = np.iinfo(np.int64).max
+    
+    def __init__(self, seeds, max_ticks):
+        n = len(seeds)
+        self.seeds = list(seeds)
+        self.max_ticks = max_ticks
+        self.tick = 0
+        self.rows = np.arange(n)
+        self.order = np.arange(n)
+        self.finished = {}
+        self.next_seq = 0
+        
+        self.state = np.zeros(n, dtype=np.int8)
+        self.ticks = np.zeros(n, dtype=np.int64)
+        self.speed = np.full(n, float(INITIAL_SPEED))
+        self.distance = np.zeros(n)
+        self.score = np.zeros(n)
+        self.level = np.ones(n, dtype=np.int64)
+        self.spawn_rate = np.full(n, INITIAL_OBSTACLE_SPAWN_RATE)
+        self.last_speed_up = np.zeros(n)
+        
+        self.lane = np.ones(n, dtype=np.int64)
+        self.x = np.zeros(n)
+        self.y = np.zeros(n)
+        self.vy = np.zeros(n)
+        self.jumping = np.zeros(n, dtype=bool)
+        self.sliding = np.zeros(n, dtype=bool)
+        self.slide_timer = np.zeros(n)
+        self.health = np.full(n, PLAYER_START_HEALTH, dtype=np.int64)
+        self.grenades = np.full(n, PLAYER_START_GRENADES, dtype=np.int64)
+        self.shield = np.zeros(n, dtype=bool)
+        self.shield_timer = np.zeros(n)
+        self.boost = np.zeros(n, dtype=bool)
+        self.boost_timer = np.zeros(n)
+        self.combo = np.ones(n, dtype=np.int64)
+        self.combo_time = np.zeros(n)
+        self.perfect = np.zeros(n, dtype=np.int64)
+        self.dodged = np.zeros(n, dtype=np.int64)
+        self.gems = np.zeros(n, dtype=np.int64)
+        self.powerups = np.zeros((n, len(POWERUP_TYPES)), dtype=np.int64)
+        self.hits = np.zeros((n, len(OBSTACLE_TYPES)), dtype=np.int64)
+        self.killed_by = np.full(n, -1)
+        
+        self.ai_grid = np.full((n, TRACK_OBSTACLE_LIMIT + TRACK_COLLECTIBLE_LIMIT), -1)
+        self.ai_plan_tick = np.full((n, PLANNER_DEPTH), self.LAST_IN_ORDER)
+        self.ai_plan_action = np.zeros((n, PLANNER_DEPTH), dtype=np.int64)
+        
+        self.obs_alive = np.zeros((n, TRACK_OBSTACLE_LIMIT), dtype=bool)
+        self.obs_seq = np.zeros((n, TRACK_OBSTACLE_LIMIT), dtype=np.int64)
+        self.obs_type = np.zeros((n, TRACK_OBSTACLE_LIMIT), dtype=np.int64)
+        self.obs_x = np.zeros((n, TRACK_OBSTACLE_LIMIT))
+        self.obs_y = np.zeros((n, TRACK_OBSTACLE_LIMIT))
+        self.obs_z = np.zeros((n, TRACK_OBSTACLE_LIMIT))
+        self.obs_dir = np.zeros((n, TRACK_OBSTACLE_LIMIT))
+        self.obs_phase = np.zeros((n, TRACK_OBSTACLE_LIMIT))
+        
+        self.col_alive = np.zeros((n, TRACK_COLLECTIBLE_LIMIT), dtype=bool)
+        self.col_seq = np.zeros((n, TRACK_COLLECTIBLE_LIMIT), dtype=np.int64)
+        self.col_type = np.zeros((n, TRACK_COLLECTIBLE_LIMIT), dtype=np.int64)
+        self.col_x = np.zeros((n, TRACK_COLLECTIBLE_LIMIT))
+        self.col_z = np.zeros((n, TRACK_COLLECTIBLE_LIMIT))
+        self.col_y = np.full((n, TRACK_COLLECTIBLE_LIMIT), 2.5)
+        
+        slots = 2 * int(TRACK_CHUNK_LENGTH // TRACK_SLOT_SPACING)
+        self.slot_count = slots
+        self.slot_ptr = np.zeros(n, dtype=np.int64)
+        self.chunk_index = np.zeros(n, dtype=np.int64)
+        self.slot_at = np.zeros((n, slots))
+        self.slot_roll = np.zeros((n, slots))
+        self.slot_obstacle = np.zeros((n, slots), dtype=bool)
+        self.slot_lane = np.zeros((n, slots), dtype=np.int64)
+        self.slot_type = np.zeros((n, slots), dtype=np.int64)
+        self.slot_dir = np.zeros((n, slots))
+        self.slot_phase = np.zeros((n, slots))
+        self.slot_quota_roll = np.zeros((n, slots))
+        self.slot_pick_roll = np.zeros((n, slots))
+        self.slot_type_roll = np.zeros((n, slots))
+        for row in range(n):
+            self.load_chunk(row)
+    
+    def load_chunk(self, row):
+        slots = track_chunk(self.seeds[row], int(self.chunk_index[row])).slots
+        params = [slot.params for slot in slots]
+        self.slot_at[row] = [slot.at for slot in slots]
+        self.slot_roll[row] = [slot.roll for slot in slots]
+        self.slot_obstacle[row] = [slot.kind == 'obstacle' for slot in slots]
+        self.slot_lane[row] = [values['lane'] for values in params]
+        self.slot_type[row] = [OBSTACLE_TYPES.index(values.get('obs_type', 'barrier')) for values in params]
+        self.slot_dir[row] = [values.get('direction', 0) for values in params]
+        self.slot_phase[row] = [values.get('phase', 0.0) for values in params]
+        self.slot_quota_roll[row] = [values.get('quota_roll', 0.0) for values in params]
+        self.slot_pick_roll[row] = [values.get('pick_roll', 0.0) for values in params]
+        self.slot_type_roll[row] = [values.get('type_roll', 0.0) for values in params]
+        self.chunk_index[row] += 1
+        self.slot_ptr[row] = 0
+    
+    def sequence(self, count):
+        seq = np.arange(self.next_seq, self.next_seq + count)
+        self.next_seq += count
+        return seq
+    
+    def first_in_order(self, mask, seq):
+        return np.where(mask, seq, self.LAST_IN_ORDER).argmin(axis=1)
+    
+    def step(self):
+        dt = physics_step
+        now = self.tick * physics_step
+        started = self.state == 0
+        live = started.copy()
+        
+        ticking = live & self.shield
+        self.shield_timer[ticking] -= dt
+        expired = ticking & (self.shield_timer <= 0)
+        self.shield[expired] = False
+        self.shield_timer[expired] = 0
+        
+        ticking = live & self.boost
+        self.boost_timer[ticking] -= dt
+        expired = ticking & (self.boost_timer <= 0)
+        self.boost[expired] = False
+        self.boost_timer[expired] = 0
+        
+        top_speed = np.where(self.boost, MAX_SPEED * 1.5, MAX_SPEED * 1.0)
+        self.speed = np.where(live, np.minimum(top_speed, self.speed + dt * SPEED_INCREMENT), self.speed)
+        delta = np.where(live, self.speed * dt, 0.0)
+        self.distance += delta
+        self.score += delta * 0.1
+        
+        level_up = live & (np.floor(self.score / DIFFICULTY_SCORE_STEP) > np.floor(self.last_speed_up / DIFFICULTY_SCORE_STEP))
+        self.level[level_up] += 1
+        self.spawn_rate[level_up] = np.minimum(MAX_OBSTACLE_SPAWN_RATE, self.spawn_rate[level_up] + OBSTACLE_SPAWN_RATE_STEP)
+        self.last_speed_up[level_up] = self.score[level_up]
+        
+        won = live & (self.score >= VICTORY_SCORE)
+        self.state[won] = 2
+        live &= ~won
+        
+        self.step_player(live, dt)
+        self.step_world(live, dt, delta, now)
+        self.stream_track(live)
+        self.step_ai(live, now)
+        self.check_collisions(live, delta, now)
+        
+        self.combo[live & (now - self.combo_time > COMBO_TIMEOUT)] = 1
+        self.ticks[started] = self.tick + 1
+        self.tick += 1
+    
+    def step_player(self, live, dt):
+        target_x = (self.lane - 1) * LANE_WIDTH
+        self.x = np.where(live, self.x + (target_x - self.x) * 12.0 * dt, self.x)
+        
+        jumping = live & self.jumping
+        self.y[jumping] += self.vy[jumping] * dt
+        self.vy[jumping] += GRAVITY * dt
+        landed = jumping & (self.y <= 0)
+        self.y[landed] = 0
+        self.vy[landed] = 0
+        self.jumping[landed] = False
+        
+        sliding = live & self.sliding
+        self.slide_timer[sliding] -= dt
+        self.sliding[sliding & (self.slide_timer <= 0)] = False
+    
+    def step_world(self, live, dt, delta, now):
+        moving = self.obs_alive & live[:, None]
+        self.obs_z = np.where(moving, self.obs_z + delta[:, None], self.obs_z)
+        
+        crushers = moving & (self.obs_type == OBSTACLE_TYPES.index('crusher'))
+        self.obs_x[crushers] += self.obs_dir[crushers] * 18.0 * dt
+        self.obs_dir[crushers & (np.abs(self.obs_x) > LANE_WIDTH * 1.5)] *= -1
+        
+        hazards = moving & (self.obs_type == OBSTACLE_TYPES.index('hazard'))
+        self.obs_y[hazards] = 2.0 + 1.5 * np.abs(np.sin(now * 2 + self.obs_phase[hazards]))
+        
+        passed = moving & (self.obs_z > 10) & (self.obs_z - delta[:, None] >= 3.0)
+        self.obs_alive[passed] = False
+        dodged = passed.sum(axis=1)
+        self.dodged += dodged
+        self.perfect += dodged
+        
+        moving = self.col_alive & live[:, None]
+        self.col_z = np.where(moving, self.col_z + delta[:, None], self.col_z)
+        self.col_alive[moving & (self.col_z > 10) & (self.col_z - delta[:, None] >= 5.0)] = False
+    
+    def stream_track(self, live):
+        horizon = self.distance + TRACK_SPAWN_DISTANCE
+        
+        while True:
+            at = self.slot_at[self.rows, self.slot_ptr]
+            rows = np.flatnonzero(live & (at <= horizon))
+            if len(rows) == 0:
+                break
+            
+            ptr = self.slot_ptr[rows]
+            z = self.distance[rows] - at[rows]
+            roll = self.slot_roll[rows, ptr]
+            obstacle = self.slot_obstacle[rows, ptr]
+            
+            spawn = (z <= 0) & obstacle
+            spawn &= self.obs_alive[rows].sum(axis=1) < TRACK_OBSTACLE_LIMIT
+            spawn &= roll < self.spawn_rate[rows] * TRACK_OBSTACLE_DENSITY
+            if spawn.any():
+                r, p = rows[spawn], ptr[spawn]
+                col = self.obs_alive[r].argmin(axis=1)
+                self.obs_alive[r, col] = True
+                self.obs_seq[r, col] = self.sequence(len(r))
+                self.obs_type[r, col] = self.slot_type[r, p]
+                self.obs_x[r, col] = (self.slot_lane[r, p] - 1) * LANE_WIDTH
+                self.obs_y[r, col] = 0
+                self.obs_z[r, col] = z[spawn]
+                self.obs_dir[r, col] = self.slot_dir[r, p]
+                self.obs_phase[r, col] = self.slot_phase[r, p]
+            
+            spawn = (z <= 0) & ~obstacle
+            spawn &= self.col_alive[rows].sum(axis=1) < TRACK_COLLECTIBLE_LIMIT
+            spawn &= roll < TRACK_COLLECTIBLE_CHANCE
+            if spawn.any():
+                r, p = rows[spawn], ptr[spawn]
+                col = self.col_alive[r].argmin(axis=1)
+                self.col_alive[r, col] = True
+                self.col_seq[r, col] = self.sequence(len(r))
+                self.col_type[r, col] = self.collectible_types(r, p)
+                self.col_x[r, col] = (self.slot_lane[r, p] - 1) * LANE_WIDTH
+                self.col_z[r, col] = z[spawn]
+            
+            self.slot_ptr[rows] += 1
+            for row in rows[self.slot_ptr[rows] == self.slot_count]:
+                self.load_chunk(row)
+    
+    def collectible_types(self, rows, ptr):
+        early = self.distance[rows] < POWERUP_QUOTA_DISTANCE
+        needed_powerups = self.powerups[rows] < POWERUP_QUOTA
+        needed = needed_powerups.sum(axis=1)
+        
+        quota = early & (needed > 0) & (self.slot_quota_roll[rows, ptr] < POWERUP_QUOTA_CHANCE)
+        nth = (self.slot_pick_roll[rows, ptr] * needed).astype(np.int64)
+        quota_pick = (needed_powerups & (np.cumsum(needed_powerups, axis=1) == nth[:, None] + 1)).argmax(axis=1)
+        quota_codes = quota_pick + COLLECTIBLE_TYPES.index(POWERUP_TYPES[0])
+        
+        type_roll = self.slot_type_roll[rows, ptr]
+        codes = np.where(quota, quota_codes,
+                         np.where(early, pick_collectible_codes(EARLY_COLLECTIBLE_ODDS, type_roll, needed_powerups),
+                                  pick_collectible_codes(LATE_COLLECTIBLE_ODDS, type_roll)))
+        
+        powerup = codes - COLLECTIBLE_TYPES.index(POWERUP_TYPES[0])
+        counted = early & (powerup >= 0)
+        np.add.at(self.powerups, (rows[counted], powerup[counted]), 1)
+        return codes
+    
+    def step_ai(self, live, now):
+        x = np.concatenate([self.obs_x, self.col_x], axis=1)
+        z = np.concatenate([self.obs_z, self.col_z], axis=1)
+        codes = np.concatenate([self.obs_type, np.full(self.col_type.shape, len(OBSTACLE_TYPES))], axis=1)
+        alive = np.concatenate([self.obs_alive, self.col_alive], axis=1)
+        
+        far = (self.speed * PLANNER_HORIZON)[:, None]
+        step = (self.speed * physics_step)[:, None]
+        inside = alive & live[:, None] & (-far < z) & (z - step < 3.0 + PLANNER_MARGIN)
+        lanes = np.clip(np.round(x / LANE_WIDTH + 1), 0, 2).astype(np.int64)
+        impact = (self.tick + (-z / step).astype(np.int64)) // max(1, round(PLANNER_BIN / physics_step))
+        grid = np.where(inside, (impact * 3 + lanes) * PLANNER_CELL_CODES + codes, self.LAST_IN_ORDER)
+        grid.sort(axis=1)
+        
+        changed = live & np.any(grid != self.ai_grid, axis=1)
+        self.ai_grid[changed] = grid[changed]
+        for row in np.flatnonzero(changed):
+            self.plan_row(row, now)
+        
+        for column in range(PLANNER_DEPTH):
+            due = live & (self.ai_plan_tick[:, column] <= self.tick)
+            if not due.any():
+                continue
+            action = self.ai_plan_action[:, column]
+            self.ai_plan_tick[due, column] = self.LAST_IN_ORDER
+            
+            left = due & (action == PLANNER_ACTIONS.index('left')) & (self.lane > 0)
+            self.lane[left] -= 1
+            right = due & (action == PLANNER_ACTIONS.index('right')) & (self.lane < 2)
+            self.lane[right] += 1
+            
+            jump = due & (action == PLANNER_ACTIONS.index('jump')) & ~self.jumping & (self.y == 0)
+            self.jumping[jump] = True
+            self.vy[jump] = JUMP_FORCE
+            
+            slide = due & (action == PLANNER_ACTIONS.index('slide')) & ~self.sliding
+            self.sliding[slide] = True
+            self.slide_timer[slide] = 1.0
+    
+    def plan_row(self, row, now):
+        alive = self.obs_alive[row]
+        obstacles = zip([OBSTACLE_TYPES[code] for code in self.obs_type[row][alive]],
+                        self.obs_x[row][alive].tolist(), self.obs_y[row][alive].tolist(), self.obs_z[row][alive].tolist(),
+                        self.obs_dir[row][alive].tolist(), self.obs_phase[row][alive].tolist())
+        alive = self.col_alive[row]
+        collectibles = zip(self.col_x[row][alive].tolist(), self.col_z[row][alive].tolist())
+        player = (int(self.lane[row]), float(self.x[row]), float(self.y[row]), float(self.vy[row]),
+                  bool(self.jumping[row]), bool(self.sliding[row]), float(self.slide_timer[row]))
+        
+        plan = plan_moves(now, float(self.speed[row]), player, list(obstacles), list(collectibles))
+        self.ai_plan_tick[row] = self.LAST_IN_ORDER
+        for column, (offset, action) in enumerate(plan):
+            self.ai_plan_tick[row, column] = self.tick + offset
+            self.ai_plan_action[row, column] = PLANNER_ACTIONS.index(action)
+    
+    def check_collisions(self, live, delta, now):
+        travel = delta[:, None]
+        dx = np.abs(self.obs_x - self.x[:, None])
+        dz = np.maximum(0.0, np.maximum(self.obs_z - travel, -self.obs_z))
+        y = self.y[:, None]
+        touching = self.obs_alive & live[:, None] & (dx < 3.0) & (dz < 3.0)
+        
+        clear = (y > 4.0) & (self.obs_type != OBSTACLE_TYPES.index('beam'))
+        clear |= (self.obs_type == OBSTACLE_TYPES.index('spike')) & (y > 3.0)
+        clear |= (self.obs_type == OBSTACLE_TYPES.index('beam')) & self.sliding[:, None]
+        clear |= (self.obs_type == OBSTACLE_TYPES.index('hazard')) & (np.abs(self.obs_y - y) > 2.0)
+        pending = touching & ~clear
+        
+        while pending.any():
+            rows = np.flatnonzero(pending.any(axis=1))
+            cols = self.first_in_order(pending[rows], self.obs_seq[rows])
+            pending[rows, cols] = False
+            self.obs_alive[rows, cols] = False
+            
+            shielded = self.shield[rows]
+            self.shield[rows[shielded]] = False
+            self.shield_timer[rows[shielded]] = 0
+            
+            rows, cols = rows[~shielded], cols[~shielded]
+            obs_type = self.obs_type[rows, cols]
+            self.health[rows] -= 1
+            self.perfect[rows] = 0
+            self.hits[rows, obs_type] += 1
+            
+            dead = self.health[rows] <= 0
+            self.state[rows[dead]] = 1
+            self.killed_by[rows[dead]] = obs_type[dead]
+            pending[rows[dead]] = False
+        
+        live = live & (self.state == 0)
+        dz = np.maximum(0.0, np.maximum(self.col_z - travel, -self.col_z))
+        dist = np.sqrt((self.col_x - self.x[:, None]) ** 2 + (self.col_y - self.y[:, None]) ** 2 + dz ** 2)
+        pending = self.col_alive & live[:, None] & (dist < 5.0)
+        
+        while pending.any():
+            rows = np.flatnonzero(pending.any(axis=1))
+            cols = self.first_in_order(pending[rows], self.col_seq[rows])
+            pending[rows, cols] = False
+            self.col_alive[rows, cols] = False
+            self.gems[rows] += 1
+            
+            col_type = self.col_type[rows, cols]
+            points = np.array(COLLECTIBLE_POINTS)[col_type]
+            gem = col_type < COLLECTIBLE_TYPES.index(POWERUP_TYPES[0])
+            self.score[rows] += np.where(gem, points * self.combo[rows], points)
+            
+            combo_rows = rows[gem]
+            recent = now - self.combo_time[combo_rows] < COMBO_TIMEOUT
+            self.combo[combo_rows] = np.where(recent, self.COMBO_NEXT[self.combo[combo_rows]], 1)
+            self.combo_time[combo_rows] = now
+            
+            shield = rows[col_type == COLLECTIBLE_TYPES.index('shield')]
+            self.shield[shield] = True
+            self.shield_timer[shield] = SHIELD_DURATION
+            
+            speed = rows[col_type == COLLECTIBLE_TYPES.index('speed')]
+            self.boost[speed] = True
+            self.boost_timer[speed] = SPEED_BOOST_DURATION
+            
+            grenade = rows[col_type == COLLECTIBLE_TYPES.index('grenade')]
+            self.grenades[grenade] = np.minimum(MAX_GRENADES, self.grenades[grenade] + 3)
+        
+        bonus = live & (self.perfect >= 10)
+        self.score[bonus] += 100
+        self.perfect[bonus] = 0
+    
+    def drop_finished(self):
+        keep = self.state == 0
+        for row in np.flatnonzero(~keep):
+            self.finished[int(self.order[row])] = self.result(row)
+        
+        n = len(keep)
+        for name, value in list(vars(self).items()):
+            if isinstance(value, np.ndarray) and value.shape[:1] == (n,):
+                setattr(self, name, value[keep])
+        self.seeds = [seed for seed, kept in zip(self.seeds, keep) if kept]
+        self.rows = np.arange(len(self.seeds))
+    
+    def run(self):
+        while self.tick < self.max_ticks and len(self.seeds):
+            self.step()
+            if self.tick % BATCH_COMPACT_TICKS == 0 and np.mean(self.state != 0) >= BATCH_COMPACT_FRACTION:
+                self.drop_finished()
+        return self.results()
+    
+    def results(self):
+        for row in range(len(self.seeds)):
+            self.finished[int(self.order[row])] = self.result(row)
+        return [self.finished[index] for index in sorted(self.finished)]
+    
+    def result(self, row):
+        return {
+            'seed': self.seeds[row],
+            'ticks': int(self.ticks[row]),
+            'sim_seconds': int(self.ticks[row]) * physics_step,
+            'state': self.STATES[self.state[row]],
+            'distance': float(self.distance[row]),
+            'score': int(self.score[row]),
+            'health': int(self.health[row]),
+            'obstacles_dodged': int(self.dodged[row]),
+            'gems_collected': int(self.gems[row]),
+            'hits_by_type': {OBSTACLE_TYPES[i]: int(count) for i, count in enumerate(self.hits[row]) if count},
+            'killed_by': OBSTACLE_TYPES[self.killed_by[row]] if self.killed_by[row] >= 0 else None,
+        }
+
+class Session:
+    __slots__ = ('state', 'clock', 'seed', 'max_ticks')
+    
+    def __init__(self, seed, max_ticks, god_mode=True):
+        self.state = GameState()
+        self.clock = [0.0]
+        self.seed = seed
+        self.max_ticks = max_ticks
+        self.state.activate()
+        begin_headless_session(self.clock, seed, god_mode)
+    
+    def running(self):
+        return self.state.sim_tick < self.max_ticks and self.state.game_state == "playing"
+    
+    def step(self, ticks=1):
+        self.state.activate()
+        advance_headless_session(self.clock, min(sim_tick + ticks, self.max_ticks))
+        return self.running()
+    
+    def result(self):
+        self.state.activate()
+        return headless_result(self.seed)
+
+def run_sessions(seeds, max_ticks, god_mode=True, batch_ticks=SESSION_BATCH_TICKS):
+    previous = active_state
+    sessions = [Session(seed, max_ticks, god_mode) for seed in seeds]
+    
+    running = list(sessions)
+    while running:
+        running = [session for session in running if session.step(batch_ticks)]
+    
+    results = []
+    for session in sessions:
+        results.append(session.result())
+    previous.activate()
+    return results
+
+class RunnerEnv:
+    __slots__ = ('session', 'seed', 'seed_stride', 'max_ticks', 'frame_skip', 'observation')
+    
+    def __init__(self, seed=0, max_ticks=ENV_MAX_TICKS, frame_skip=ENV_FRAME_SKIP, observation=None, seed_stride=1):
+        self.session = None
+        self.seed = seed
+        self.seed_stride = seed_stride
+        self.max_ticks = max_ticks
+        self.frame_skip = frame_skip
+        self.observation = np.zeros(ENV_OBSERVATION_SIZE, dtype=np.float32) if observation is None else observation
+    
+    def reset(self, seed=None):
+        if seed is not None:
+            self.seed = seed
+        elif self.session is not None:
+            self.seed = (self.seed + self.seed_stride) % 2**32
+        self.close()
+        self.session = Session(self.seed, self.max_ticks, god_mode=False)
+        write_observation(self.observation)
+        return self.observation, {}
+    
+    def step(self, action):
+        self.session.state.activate()
+        health = player_health
+        score = current_score
+        
+        for kind, code, state in ENV_ACTION_INPUTS[action]:
+            dispatch_input(kind, code, state)
+        self.session.step(self.frame_skip)
+        
+        reward = current_score - score - ENV_HIT_PENALTY * (health - player_health)
+        terminated = game_state != "playing"
+        truncated = not terminated and sim_tick >= self.max_ticks
+        write_observation(self.observation)
+        
+        info = {'episode': headless_result(self.seed)} if terminated or truncated else {}
+        return self.observation, reward, terminated, truncated, info
+    
+    def close(self):
+        self.session = None
+
+def write_observation(out):
+    out[:] = 0.0
+    out[:ENV_PLAYER_FEATURES] = (
+        player_lane_index - 1,
+        player_x / LANE_WIDTH,
+        player_y * -2.0 * GRAVITY / JUMP_FORCE ** 2,
+        player_velocity_y / JUMP_FORCE,
+        player_is_jumping,
+        player_is_sliding,
+        player_slide_timer,
+        player_health / PLAYER_START_HEALTH,
+        player_grenades / MAX_GRENADES,
+        player_shield_timer / SHIELD_DURATION,
+        player_speed_boost_timer / SPEED_BOOST_DURATION,
+        current_speed / MAX_SPEED,
+    )
+    
+    occupancy = out[ENV_OCCUPANCY_OFFSET:ENV_OBSTACLE_OFFSET].reshape(3, ENV_OCCUPANCY_BINS)
+    rows = out[ENV_OBSTACLE_OFFSET:ENV_COLLECTIBLE_OFFSET].reshape(TRACK_OBSTACLE_LIMIT, ENV_OBSTACLE_FEATURES)
+    nearest = sorted(obstacles, key=lambda obs: abs(obs.z))[:TRACK_OBSTACLE_LIMIT]
+    for row, obs in zip(rows, nearest):
+        row[:4] = (1.0, obs.x / LANE_WIDTH, obs.y, obs.z / TRACK_SPAWN_DISTANCE)
+        row[4 + OBSTACLE_TYPES.index(obs.type)] = 1.0
+    for obs in obstacles:
+        if -ENV_OCCUPANCY_RANGE < obs.z <= 0:
+            lane = min(2, max(0, round(obs.x / LANE_WIDTH + 1)))
+            occupancy[lane, int(-obs.z / ENV_OCCUPANCY_RANGE * ENV_OCCUPANCY_BINS)] = 1.0
+    
+    rows = out[ENV_COLLECTIBLE_OFFSET:].reshape(TRACK_COLLECTIBLE_LIMIT, ENV_COLLECTIBLE_FEATURES)
+    nearest = sorted(collectibles, key=lambda col: abs(col.z))[:TRACK_COLLECTIBLE_LIMIT]
+    for row, col in zip(rows, nearest):
+        row[:3] = (1.0, col.x / LANE_WIDTH, col.z / TRACK_SPAWN_DISTANCE)
+        row[3 + COLLECTIBLE_TYPES.index(col.type)] = 1.0
+
+def env_buffer_layout(num_envs):
+    layout = []
+    offset = 0
+    for name, dtype, shape in ENV_BUFFERS:
+        shape = (num_envs,) + shape
+        layout.append((name, dtype, shape, offset))
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        offset += -(-nbytes // ENV_BUFFER_ALIGN) * ENV_BUFFER_ALIGN
+    return layout, offset
+
+def env_buffers(memory, num_envs):
+    layout, size = env_buffer_layout(num_envs)
+    return {name: np.ndarray(shape, dtype, memory.buf, offset) for name, dtype, shape, offset in layout}
+
+def env_worker(pipe, memory_name, num_envs, first, last, seed, max_ticks, frame_skip, physics_hz, log_level):
+    worker_init(physics_hz, log_level)
+    memory = multiprocessing.shared_memory.SharedMemory(name=memory_name)
+    buffers = env_buffers(memory, num_envs)
+    actions = buffers['actions']
+    final_observations = buffers['final_observations']
+    rewards = buffers['rewards']
+    terminated = buffers['terminated']
+    truncated = buffers['truncated']
+    envs = [RunnerEnv((seed + i) % 2**32, max_ticks, frame_skip, buffers['observations'][i], num_envs)
+            for i in range(first, last)]
+    
+    try:
+        while True:
+            command = pipe.recv()
+            if command == 'step':
+                episodes = []
+                for i, env in enumerate(envs, first):
+                    observation, reward, done, cut, info = env.step(int(actions[i]))
+                    rewards[i] = reward
+                    terminated[i] = done
+                    truncated[i] = cut
+                    if done or cut:
+                        final_observations[i] = observation
+                        episodes.append(info['episode'])
+                        env.reset()
+                pipe.send(episodes)
+            elif command == 'reset':
+                for env in envs:
+                    env.reset()
+                rewards[first:last] = 0.0
+                terminated[first:last] = False
+                truncated[first:last] = False
+                pipe.send(None)
+            elif command == 'close':
+                break
+    finally:
+        for env in envs:
+            env.close()
+        pipe.close()
+        envs = env = observation = buffers = actions = final_observations = rewards = terminated = truncated = None
+        memory.close()
+
+class VectorEnv:
+    __slots__ = ('num_envs', 'memory', 'observations', 'final_observations', 'rewards', 'terminated', 'truncated', 'actions',
+                 'pipes', 'workers')
+    
+    def __init__(self, num_envs, workers=None, seed=0, max_ticks=ENV_MAX_TICKS, frame_skip=ENV_FRAME_SKIP):
+        self.num_envs = num_envs
+        layout, size = env_buffer_layout(num_envs)
+        self.memory = multiprocessing.shared_memory.SharedMemory(create=True, size=size)
+        buffers = env_buffers(self.memory, num_envs)
+        self.observations = buffers['observations']
+        self.final_observations = buffers['final_observations']
+        self.rewards = buffers['rewards']
+        self.terminated = buffers['terminated']
+        self.truncated = buffers['truncated']
+        self.actions = buffers['actions']
+        
+        self.pipes = []
+        self.workers = []
+        bounds = np.linspace(0, num_envs, min(num_envs, workers or os.cpu_count() or 1) + 1).astype(int)
+        for first, last in zip(bounds[:-1], bounds[1:]):
+            pipe, worker_pipe = multiprocessing.Pipe()
+            worker = multiprocessing.Process(
+                target=env_worker, name=f"env-{first}-{last}", daemon=True,
+                args=(worker_pipe, self.memory.name, num_envs, int(first), int(last), seed, max_ticks, frame_skip,
+                      1.0 / physics_step, log.level))
+            worker.start()
+            worker_pipe.close()
+            self.pipes.append(pipe)
+            self.workers.append(worker)
+    
+    def reset(self):
+        for pipe in self.pipes:
+            pipe.send('reset')
+        for pipe in self.pipes:
+            pipe.recv()
+        return self.observations, {}
+    
+    def step(self, actions):
+        self.actions[:] = actions
+        for pipe in self.pipes:
+            pipe.send('step')
+        episodes = []
+        for pipe in self.pipes:
+            episodes.extend(pipe.recv())
+        info = {
+            'episodes': episodes,
+            'final_observation': self.final_observations,
+            '_final_observation': self.terminated | self.truncated,
+        }
+        return self.observations, self.rewards, self.terminated, self.truncated, info
+    
+    def close(self):
+        if self.memory is None:
+            return
+        for pipe in self.pipes:
+            pipe.send('close')
+        for worker in self.workers:
+            worker.join()
+        for pipe in self.pipes:
+            pipe.close()
+        self.observations = self.final_observations = None
+        self.rewards = self.terminated = self.truncated = self.actions = None
+        self.memory.close()
+        self.memory.unlink()
+        self.memory = None
+
+def run_headless(args):
+    if args.replay:
+        replay = load_replay(args.replay)
+        result = run_replay_session(replay)
+        flush_logging()
+        verdict = "MATCH" if result['matches'] else "MISMATCH"
+        print(f"[REPLAY] {args.replay}: {result['state']} after {result['ticks']} ticks | "
+              f"Distance: {int(result['distance'])}m | Score: {result['score']} | {verdict}")
+        return
+    
+    total_ticks = 0
+    start = time.perf_counter()
+    base_seed = args.seed if args.seed is not None else random.randrange(2**32)
+    
+    seeds = [(base_seed + run) % 2**32 for run in range(args.runs)]
+    if args.vectorized:
+        if args.no_ai:
+            raise SystemExit("--vectorized only simulates god mode AI runs and cannot be combined with --no-ai")
+        results = BatchSimulation(seeds, args.ticks).run()
+    elif args.concurrent > 1:
+        results = []
+        for first in range(0, args.runs, args.concurrent):
+            results.extend(run_sessions(seeds[first:first + args.concurrent], args.ticks, not args.no_ai))
+    else:
+        results = (run_headless_session(args.ticks, seed, not args.no_ai) for seed in seeds)
+    
+    for run, result in enumerate(results):
+        seed = result['seed']
+        total_ticks += result['ticks']
+        flush_logging()
+        print(f"[HEADLESS] Run {run + 1}/{args.runs} (seed {seed}): {result['state']} after {result['ticks']} ticks | "
+              f"Distance: {int(result['distance'])}m | Score: {result['score']}")
+    
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print(f"[HEADLESS] {args.runs} runs, {total_ticks} ticks in {elapsed:.2f}s ({total_ticks / elapsed:.0f} ticks/s)")
+
+def bench_dense_obstacles(tick):
+    global total_distance
+    
+    if tick == 0:
+        total_distance = 2000.0
+        while len(obstacles) < BENCH_DENSE_OBSTACLES:
+            spawn_obstacle(z=rng.uniform(-600, -20), **obstacle_slot(rng, total_distance + TRACK_SPAWN_DISTANCE).params)
+    while len(obstacles) < BENCH_DENSE_OBSTACLES:
+        spawn_obstacle(z=-TRACK_SPAWN_DISTANCE, **obstacle_slot(rng, total_distance + TRACK_SPAWN_DISTANCE).params)
+
+def bench_particle_storm(tick):
+    if tick % BENCH_STORM_INTERVAL == 0:
+        spawn_explosion(rng.uniform(-15, 15), 2, rng.uniform(-80, -20), COL_NEON_PINK, BENCH_STORM_PARTICLES)
+
+def bench_max_speed(tick):
+    global current_speed
+    current_speed = MAX_SPEED
+
+def bench_god_mode_ai(tick):
+    global player_cheat_mode
+    
+    if tick == 0:
+        player_cheat_mode = False
+    if game_state in ("gameover", "victory"):
+        handle_keyboard(b'r', 0, 0)
+    elif game_state == "playing" and tick % BENCH_CRASH_INTERVAL == BENCH_CRASH_INTERVAL - 1:
+        spawn_obstacle(player_lane_index, -1.0, 'barrier', 1, 0.0, 0.0)
+
+BENCH_SCENARIOS = {
+    'dense_obstacles': bench_dense_obstacles,
+    'particle_storm': bench_particle_storm,
+    'max_speed': bench_max_speed,
+    'god_mode_ai': bench_god_mode_ai,
+}
+
+def begin_bench_session(seed):
+    global game_state, player_god_mode, player_cheat_mode, slow_motion
+    
+    sim_clock = [0.0]
+    set_game_clock(lambda: sim_clock[0])
+    start_session(seed)
+    game_state = "playing"
+    player_god_mode = True
+    player_cheat_mode = True
+    slow_motion = False
+    return sim_clock
+
+def timing_stats(samples, prefix):
+    times = np.array(samples) * 1000.0
+    p50, p95, p99 = np.percentile(times, PROFILE_PERCENTILES)
+    return {
+        f'{prefix}_mean_ms': float(times.mean()),
+        f'{prefix}_p50_ms': float(p50),
+        f'{prefix}_p95_ms': float(p95),
+        f'{prefix}_p99_ms': float(p99),
+    }
+
+def best_trial(trials):
+    return {key: (max if key.endswith('_per_sec') else min)(trial[key] for trial in trials) for key in trials[0]}
+
+def time_simulation(scenario, ticks, seed):
+    sim_clock = begin_bench_session(seed)
+    gc_before = gc.get_stats()[0]['collections']
+    samples = []
+    
+    for tick in range(ticks):
+        scenario(tick)
+        sim_clock[0] = (sim_tick + 1) * physics_step
+        start = time.perf_counter()
+        advance_physics()
+        samples.append(time.perf_counter() - start)
+    
+    result = {'ticks': ticks, 'ticks_per_sec': ticks / max(sum(samples), 1e-9)}
+    result.update(timing_stats(samples, 'tick'))
+    result['gc_gen0_per_1k_ticks'] = (gc.get_stats()[0]['collections'] - gc_before) * 1000.0 / ticks
+    return result
+
+def bench_simulation(scenario, ticks, seed, trials):
+    result = best_trial([time_simulation(scenario, ticks, seed) for trial in range(trials)])
+    
+    sim_clock = begin_bench_session(seed)
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    for tick in range(BENCH_ALLOC_TICKS):
+        scenario(tick)
+        sim_clock[0] = (sim_tick + 1) * physics_step
+        advance_physics()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result['alloc_peak_kib'] = peak / 1024.0
+    result['alloc_net_blocks'] = sys.getallocatedblocks() - blocks_before
+    result['pools'] = pool_stats()
+    return result
+
+def bench_rendering(scenario, frames, seed, trials):
+    return best_trial([time_rendering(scenario, frames, seed) for trial in range(trials)])
+
+def time_rendering(scenario, frames, seed):
+    sim_clock = begin_bench_session(seed)
+    samples = []
+    
+    for frame in range(frames):
+        scenario(frame)
+        sim_clock[0] = (sim_tick + 1) * physics_step
+        start = time.perf_counter()
+        advance_physics()
+        render_scene()
+        glFinish()
+        samples.append(time.perf_counter() - start)
+    
+    result = {'frames': frames, 'frames_per_sec': frames / max(sum(samples), 1e-9)}
+    result.update(timing_stats(samples, 'frame'))
+    return result
+
+def bench_settings(args):
+    return {
+        'bench_ticks': args.bench_ticks,
+        'bench_frames': args.bench_frames,
+        'seed': args.seed if args.seed is not None else 1,
+        'physics_hz': 1.0 / physics_step,
+        'renderer': args.renderer,
+        'bench_trials': args.bench_trials,
+    }
+
+def compare_bench(results, baseline, tolerance, noise_floor_ms):
+    regressions = []
+    for name, sections in results.items():
+        for section, metrics in sections.items():
+            reference = baseline.get(name, {}).get(section, {})
+            for metric, direction in BENCH_GATES.items():
+                if metric not in metrics or metric not in reference or reference[metric] <= 0:
+                    continue
+                change = (metrics[metric] - reference[metric]) / reference[metric]
+                if metric.endswith('_ms') and abs(metrics[metric] - reference[metric]) <= noise_floor_ms:
+                    continue
+                if change * direction < -tolerance:
+                    regressions.append(f"{name}.{section}.{metric}: {reference[metric]:.3f} -> {metrics[metric]:.3f} ({change:+.1%})")
+    return regressions
+
+def run_benchmarks(args):
+    names = args.bench_scenarios.split(',') if args.bench_scenarios else list(BENCH_SCENARIOS)
+    unknown = [name for name in names if name not in BENCH_SCENARIOS]
+    if unknown:
+        raise SystemExit(f"unknown benchmark scenario(s): {', '.join(unknown)}")
+    
+    settings = bench_settings(args)
+    seed = settings['seed']
+    baseline = None
+    if args.bench_baseline:
+        with open(args.bench_baseline) as f:
+            baseline = json.load(f)
+        recorded = baseline.get('settings', {})
+        mismatched = [name for name in BENCH_SETTINGS if recorded.get(name) != settings[name]]
+        if mismatched:
+            raise SystemExit(f"{args.bench_baseline} was recorded with different settings: " +
+                             ', '.join(f"{name} {recorded.get(name)} != {settings[name]}" for name in mismatched))
+    
+    render = not HEADLESS
+    if render:
+        try:
+            create_offscreen_context(BENCH_WIDTH, BENCH_HEIGHT)
+            init_renderer(args.renderer)
+        except Exception as error:
+            log_event('BENCH', f"Offscreen OpenGL unavailable, skipping render benchmarks: {error}")
+            render = False
+    
+    results = {}
+    for name in names:
+        scenario = BENCH_SCENARIOS[name]
+        results[name] = {'sim': bench_simulation(scenario, args.bench_ticks, seed, args.bench_trials)}
+        sim = results[name]['sim']
+        flush_logging()
+        print(f"[BENCH] {name:<16} sim    {sim['ticks_per_sec']:>9.0f} ticks/s | p50 {sim['tick_p50_ms']:.3f} "
+              f"p95 {sim['tick_p95_ms']:.3f} p99 {sim['tick_p99_ms']:.3f} ms | "
+              f"peak {sim['alloc_peak_kib']:.0f} KiB, {sim['gc_gen0_per_1k_ticks']:.1f} gen0 GCs/1k ticks")
+        
+        if render:
+            results[name]['render'] = bench_rendering(scenario, args.bench_frames, seed, args.bench_trials)
+            frame = results[name]['render']
+            flush_logging()
+            print(f"[BENCH] {name:<16} render {frame['frames_per_sec']:>9.1f} fps     | p50 {frame['frame_p50_ms']:.3f} "
+                  f"p95 {frame['frame_p95_ms']:.3f} p99 {frame['frame_p99_ms']:.3f} ms")
+    
+    if args.bench_out:
+        with open(args.bench_out, 'w') as f:
+            json.dump({'settings': settings, 'scenarios': results}, f, indent=2)
+        print(f"[BENCH] Results written to {args.bench_out}")
+    
+    if baseline is not None:
+        regressions = compare_bench(results, baseline.get('scenarios', {}), args.bench_tolerance, args.bench_noise_floor)
+        for regression in regressions:
+            print(f"[BENCH] REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"[BENCH] No regressions against {args.bench_baseline} "
+              f"(tolerance {args.bench_tolerance:.0%}, noise floor {args.bench_noise_floor:.3f} ms)")
+    return 0
+
+BALANCE_SEEDS = 32
+BALANCE_PARAMETERS = (
+    'INITIAL_OBSTACLE_SPAWN_RATE', 'MAX_OBSTACLE_SPAWN_RATE', 'OBSTACLE_SPAWN_RATE_STEP', 'DIFFICULTY_SCORE_STEP',
+    'INITIAL_SPEED', 'MAX_SPEED', 'SPEED_INCREMENT', 'VICTORY_SCORE',
+    'PLAYER_START_HEALTH', 'PLAYER_START_GRENADES', 'SHIELD_DURATION', 'SPEED_BOOST_DURATION',
+    'TRACK_OBSTACLE_DENSITY', 'TRACK_COLLECTIBLE_CHANCE',
+    'POWERUP_QUOTA', 'POWERUP_QUOTA_DISTANCE', 'POWERUP_QUOTA_CHANCE',
+    'EARLY_COLLECTIBLE_ODDS', 'LATE_COLLECTIBLE_ODDS',
+)
+BALANCE_PERCENTILES = (10, 50, 90)
+balance_defaults = {name: globals()[name] for name in BALANCE_PARAMETERS}
+
+def load_balance_grid(text):
+    if os.path.exists(text):
+        with open(text) as f:
+            grid = json.load(f)
+    else:
+        grid = json.loads(text)
+    
+    unknown = sorted(set(grid) - set(BALANCE_PARAMETERS))
+    if unknown:
+        raise SystemExit(f"Unknown balance parameters: {', '.join(unknown)} (choose from {', '.join(BALANCE_PARAMETERS)})")
+    
+    for name, values in grid.items():
+        if not isinstance(values, list) or name.endswith('_ODDS') and values and isinstance(values[0][0], str):
+            values = [values]
+        if name.endswith('_ODDS'):
+            values = [tuple((col_type, threshold) for col_type, threshold in odds) for odds in values]
+        grid[name] = values
+    return grid
+
+def balance_combinations(grid):
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+def worker_init(physics_hz, log_level):
+    global log_listener, log_queue
+    log_listener = None
+    log_queue = queue.Queue()
+    init_logging(log_level)
+    set_physics_rate(physics_hz)
+
+def balance_task(task):
+    combo_index, params, seed, max_ticks = task
+    globals().update(params)
+    
+    try:
+        start = time.perf_counter()
+        result = run_headless_session(max_ticks, seed)
+        result['elapsed'] = time.perf_counter() - start
+    finally:
+        globals().update(balance_defaults)
+    return combo_index, result
+
+def summarize_balance(params, results):
+    distances = np.array([result['distance'] for result in results])
+    scores = np.array([result['score'] for result in results])
+    ticks = sum(result['ticks'] for result in results)
+    elapsed = sum(result['elapsed'] for result in results)
+    
+    deaths = {}
+    hits = {}
+    for result in results:
+        if result['killed_by'] is not None:
+            deaths[result['killed_by']] = deaths.get(result['killed_by'], 0) + 1
+        for obs_type, count in result['hits_by_type'].items():
+            hits[obs_type] = hits.get(obs_type, 0) + count
+    
+    summary = {'params': params, 'runs': len(results)}
+    summary['victory_rate'] = sum(result['state'] == 'victory' for result in results) / len(results)
+    summary['gameover_rate'] = sum(result['state'] == 'gameover' for result in results) / len(results)
+    summary['distance_mean'] = float(distances.mean())
+    for p, value in zip(BALANCE_PERCENTILES, np.percentile(distances, BALANCE_PERCENTILES)):
+        summary[f'distance_p{p}'] = float(value)
+    summary['score_mean'] = float(scores.mean())
+    summary['score_p50'] = float(np.percentile(scores, 50))
+    summary['deaths_by_type'] = deaths
+    summary['hits_by_type'] = hits
+    summary['ticks'] = ticks
+    summary['ticks_per_sec'] = ticks / max(elapsed, 1e-9)
+    return summary
+
+def export_balance(path, summaries):
+    if path.endswith('.json'):
+        with open(path, 'w') as f:
+            json.dump(summaries, f, indent=2)
+        return
+    
+    param_names = list(summaries[0]['params']) if summaries else []
+    obs_types = sorted({obs_type for summary in summaries for obs_type in summary['hits_by_type']})
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(param_names + ['runs', 'victory_rate', 'gameover_rate', 'distance_mean'] +
+                        [f'distance_p{p}' for p in BALANCE_PERCENTILES] + ['score_mean', 'score_p50', 'ticks_per_sec'] +
+                        [f'deaths_{obs_type}' for obs_type in obs_types] + [f'hits_{obs_type}' for obs_type in obs_types])
+        for summary in summaries:
+            writer.writerow([json.dumps(summary['params'][name]) for name in param_names] +
+                            [summary['runs'], summary['victory_rate'], summary['gameover_rate'], summary['distance_mean']] +
+                            [summary[f'distance_p{p}'] for p in BALANCE_PERCENTILES] +
+                            [summary['score_mean'], summary['score_p50'], summary['ticks_per_sec']] +
+                            [summary['deaths_by_type'].get(obs_type, 0) for obs_type in obs_types] +
+                            [summary['hits_by_type'].get(obs_type, 0) for obs_type in obs_types])
+
+def run_balance(args):
+    combos = balance_combinations(load_balance_grid(args.balance))
+    base_seed = args.seed if args.seed is not None else 0
+    seeds = [(base_seed + i) % 2**32 for i in range(args.balance_seeds)]
+    tasks = [(combo_index, params, seed, args.ticks)
+             for combo_index, params in enumerate(combos) for seed in seeds]
+    workers = args.balance_workers or os.cpu_count() or 1
+    chunksize = max(1, len(tasks) // (workers * 4))
+    
+    print(f"[BALANCE] {len(combos)} combinations x {len(seeds)} seeds on {workers} workers")
+    results = [[] for params in combos]
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers, worker_init, (1.0 / physics_step, log.level)) as pool:
+        for done, (combo_index, result) in enumerate(pool.imap_unordered(balance_task, tasks, chunksize), 1):
+            results[combo_index].append(result)
+            if len(results[combo_index]) == len(seeds):
+                log_event('BALANCE', f"Combination {combo_index + 1}/{len(combos)} done ({done}/{len(tasks)} runs)")
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    
+    summaries = [summarize_balance(params, sorted(runs, key=lambda result: result['seed']))
+                 for params, runs in zip(combos, results)]
+    for combo_index, summary in enumerate(summaries):
+        deaths = ', '.join(f"{obs_type} {count}" for obs_type, count in sorted(summary['deaths_by_type'].items())) or "none"
+        print(f"[BALANCE] #{combo_index + 1} {json.dumps(summary['params'])}")
+        print(f"[BALANCE]     distance mean {summary['distance_mean']:.0f}m "
+              f"p10/p50/p90 {summary['distance_p10']:.0f}/{summary['distance_p50']:.0f}/{summary['distance_p90']:.0f}m | "
+              f"score mean {summary['score_mean']:.0f} | victory {summary['victory_rate']:.0%} | deaths: {deaths}")
+    
+    total_ticks = sum(summary['ticks'] for summary in summaries)
+    print(f"[BALANCE] {len(tasks)} runs, {total_ticks} ticks in {elapsed:.2f}s ({total_ticks / elapsed:.0f} ticks/s)")
+    
+    if args.balance_out:
+        export_balance(args.balance_out, summaries)
+        print(f"[BALANCE] Report written to {args.balance_out}")
+
+def run_env_bench(args):
+    base_seed = args.seed if args.seed is not None else 0
+    action_rng = np.random.default_rng(base_seed)
+    env = VectorEnv(args.env_count, args.env_workers, base_seed, args.ticks)
+    
+    print(f"[ENV] {env.num_envs} environments on {len(env.workers)} workers, "
+          f"{ENV_OBSERVATION_SIZE} observation values each")
+    episodes = []
+    try:
+        env.reset()
+        start = time.perf_counter()
+        for step in range(args.env_steps):
+            observations, rewards, terminated, truncated, info = env.step(
+                action_rng.integers(len(ENV_ACTIONS), size=env.num_envs))
+            episodes.extend(info['episodes'])
+        elapsed = max(time.perf_counter() - start, 1e-9)
+    finally:
+        env.close()
+    
+    steps = args.env_steps * args.env_count
+    print(f"[ENV] {steps} steps in {elapsed:.2f}s ({steps / elapsed:.0f} steps/s, "
+          f"{steps * ENV_FRAME_SKIP / elapsed:.0f} ticks/s)")
+    if episodes:
+        distances = np.array([episode['distance'] for episode in episodes])
+        scores = np.array([episode['score'] for episode in episodes])
+        print(f"[ENV] {len(episodes)} episodes finished | distance mean {distances.mean():.0f}m | "
+              f"score mean {scores.mean():.0f}")
+
+def parse_size(text):
+    try:
+        width, height = (int(value) for value in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {text!r}")
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError(f"size must be positive, got {text!r}")
+    return width, height
+
+def parse_count(text):
+    try:
+        count = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a whole number, got {text!r}")
+    if count < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {text!r}")
+    return count
+
+def run_capture(args):
+    width, height = args.capture_size
+    create_offscreen_context(width, height)
+    init_renderer(args.renderer)
+    glPixelStorei(GL_PACK_ALIGNMENT, 1)
+    
+    writer = FrameWriter(args.capture, width, height, args.capture_fps)
+    frames_written = [0]
+    
+    def capture_tick():
+        interval = max(1, round(1.0 / (physics_step * args.capture_fps)))
+        if sim_tick % interval:
+            return False
+        render_scene()
+        writer.submit(frames_written[0], bytes(glReadPixels(0, 0, width, height, GL_RGB, GL_UNSIGNED_BYTE)))
+        frames_written[0] += 1
+        return args.capture_frames is not None and frames_written[0] >= args.capture_frames
+    
+    start = time.perf_counter()
+    try:
+        if args.replay:
+            result = run_replay_session(load_replay(args.replay), capture_tick)
+        else:
+            seed = args.seed if args.seed is not None else random.randrange(2**32)
+            result = run_headless_session(args.ticks, seed, not args.no_ai, capture_tick)
+    finally:
+        writer.close()
+    
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    flush_logging()
+    print(f"[CAPTURE] {frames_written[0]} frames ({sim_time:.1f}s of play, {result['state']}) in {elapsed:.2f}s | "
+          f"{frames_written[0] / elapsed:.1f} fps, {sim_time / elapsed:.1f}x real time -> {args.capture}")
+
+def batch_mode(args):
+    return args.headless or args.bench or args.capture is not None or args.balance is not None or args.env_bench
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Cyber Runner 2077: Neon Horizon")
+    parser.add_argument('--renderer', choices=RENDER_BACKENDS, default='vbo',
+                        help="geometry submission backend (default: vbo)")
+    parser.add_argument('--headless', action='store_true',
+                        help="run the simulation without a window or OpenGL")
+    parser.add_argument('--runs', type=int, default=1,
+                        help="number of headless sessions to run")
+    parser.add_argument('--ticks', type=int, default=36000,
+                        help="maximum physics ticks per headless session")
+    parser.add_argument('--concurrent', type=int, default=1,
+                        help="step this many headless sessions side by side in one process")
+    parser.add_argument('--vectorized', action='store_true',
+                        help="advance all headless AI runs in lockstep with the NumPy batch engine")
+    parser.add_argument('--physics-hz', type=float, default=PHYSICS_HZ,
+                        help="fixed simulation rate in ticks per second (default: 120)")
+    parser.add_argument('--no-ai', action='store_true',
+                        help="do not enable the god mode AI in headless sessions")
+    parser.add_argument('--verbose', action='store_true',
+                        help="show game event output from headless sessions")
+    parser.add_argument('--log-level', choices=('DEBUG', 'INFO', 'WARNING', 'ERROR'), default=None,
+                        help="event log level (default: INFO, or WARNING when headless)")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="session seed (headless runs use seed, seed+1, ...)")
+    parser.add_argument('--record', metavar='PATH',
+                        help="record keyboard and mouse input to a replay file")
+    parser.add_argument('--replay', metavar='PATH',
+                        help="replay a recorded session (with --headless)")
+    parser.add_argument('--lod-quality', type=float, default=1.0,
+                        help="sphere/cylinder detail scale; higher is finer, 0 disables LOD (default: 1.0)")
+    parser.add_argument('--profile-out', metavar='PATH',
+                        help="write per-stage frame timings to a .csv or .json file on exit")
+    parser.add_argument('--capture', metavar='PATH',
+                        help="render a replay (--replay) or AI session offscreen to a PNG directory or video file")
+    parser.add_argument('--capture-size', type=parse_size, default=(WINDOW_WIDTH, WINDOW_HEIGHT), metavar='WxH',
+                        help=f"capture resolution (default: {WINDOW_WIDTH}x{WINDOW_HEIGHT})")
+    parser.add_argument('--capture-fps', type=float, default=CAPTURE_FPS,
+                        help="captured frames per second of game time (default: 60)")
+    parser.add_argument('--capture-frames', type=int, default=None,
+                        help="stop after this many captured frames")
+    parser.add_argument('--bench', action='store_true',
+                        help="run the benchmark scenarios (rendering is skipped with --headless)")
+    parser.add_argument('--bench-scenarios', metavar='NAMES',
+                        help=f"comma separated scenarios (default: {','.join(BENCH_SCENARIOS)})")
+    parser.add_argument('--bench-ticks', type=int, default=BENCH_TICKS,
+                        help="simulation ticks per scenario")
+    parser.add_argument('--bench-frames', type=int, default=BENCH_FRAMES,
+                        help="rendered frames per scenario")
+    parser.add_argument('--bench-out', metavar='PATH',
+                        help="write benchmark results to a JSON file")
+    parser.add_argument('--bench-baseline', metavar='PATH',
+                        help="compare against stored results and exit non-zero on regression")
+    parser.add_argument('--bench-trials', type=parse_count, default=BENCH_TRIALS,
+                        help=f"timed repetitions per scenario, keeping the best (default: {BENCH_TRIALS})")
+    parser.add_argument('--bench-noise-floor', type=float, default=BENCH_NOISE_FLOOR_MS,
+                        help=f"ignore timing changes at or below this many ms (default: {BENCH_NOISE_FLOOR_MS})")
+    parser.add_argument('--bench-tolerance', type=float, default=BENCH_TOLERANCE,
+                        help="allowed relative slowdown before a metric counts as a regression")
+    parser.add_argument('--balance', metavar='GRID',
+                        help="run AI sessions for every combination in a JSON parameter grid (path or inline JSON)")
+    parser.add_argument('--balance-seeds', type=parse_count, default=BALANCE_SEEDS,
+                        help=f"seeds per parameter combination, starting at --seed or 0 (default: {BALANCE_SEEDS})")
+    parser.add_argument('--balance-workers', type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument('--balance-out', metavar='PATH',
+                        help="write the balance report to a .json or .csv file")
+    parser.add_argument('--env-bench', action='store_true',
+                        help="step vectorized reset/step environments with random actions and report throughput")
+    parser.add_argument('--env-count', type=int, default=ENV_BENCH_COUNT,
+                        help=f"environments for --env-bench (default: {ENV_BENCH_COUNT})")
+    parser.add_argument('--env-workers', type=int, default=None,
+                        help="environment worker processes (default: CPU count)")
+    parser.add_argument('--env-steps', type=int, default=ENV_BENCH_STEPS,
+                        help=f"vector steps for --env-bench (default: {ENV_BENCH_STEPS})")
+    args = parser.parse_args(argv)
+    
+    if args.record and batch_mode(args):
+        parser.error("--record captures interactive input and cannot be combined with headless, capture, "
+                     "benchmark, balance or environment runs")
+    return args
+
 def main():
+    global profile_enabled, lod_quality
+    
+    args = parse_args(sys.argv[1:])
+    set_physics_rate(args.physics_hz)
+    batch = batch_mode(args)
+    profile_enabled = not batch or args.profile_out is not None
+    lod_quality = args.lod_quality
+    
+    if args.log_level is not None:
+        init_logging(getattr(logging, args.log_level))
+    elif batch and not args.verbose:
+        init_logging(logging.WARNING)
+    else:
+        init_logging(logging.INFO)
+    
+    if args.profile_out:
+        atexit.register(export_profile, args.profile_out)
+    
+    if args.bench:
+        sys.exit(run_benchmarks(args))
+    
+    if args.balance is not None:
+        run_balance(args)
+        return
+    
+    if args.env_bench:
+        run_env_bench(args)
+        return
+    
+    if args.capture is not None:
+        if HEADLESS:
+            raise SystemExit("--capture renders frames and cannot be combined with --headless")
+        run_capture(args)
+        return
+    
+    if args.headless:
+        run_headless(args)
+        return
+    
     glutInit()
     glutInitDisplayMode(GLUT_DOUBLE | GLUT_RGB | GLUT_DEPTH)
     glutInitWindowSize(WINDOW_WIDTH, WINDOW_HEIGHT)
     glutInitWindowPosition(100, 100)
     glutCreateWindow(WINDOW_TITLE)
     
-    glClearColor(*COL_DARK_VOID, 1.0)
-    glEnable(GL_DEPTH_TEST)
-    
-    glViewport(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
-    
-    glMatrixMode(GL_PROJECTION)
-    glLoadIdentity()
-    gluPerspective(60.0, float(WINDOW_WIDTH) / float(WINDOW_HEIGHT), 0.1, 1000.0)
-    glMatrixMode(GL_MODELVIEW)
-    
-    init_game()
+    setup_viewport(WINDOW_WIDTH, WINDOW_HEIGHT)
+    init_renderer(args.renderer)
+    start_session(args.seed if args.seed is not None else random.randrange(2**32))
+    if args.record:
+        start_recording(args.record)
     
     glutDisplayFunc(display)
     glutIdleFunc(idle)
@@ -1814,6 +4876,7 @@ def main():
     print("  F/1/2/3/4 - Camera modes")
     print("  P       - Pause")
     print("  C/V/B   - Cheats (Cheat/God-AI/Slow-Mo)")
+    print("  O       - Frame timing overlay")
     print("=" * 60)
     print("\nStarting game loop...")
     
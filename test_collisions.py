@@ -0,0 +1,51 @@
+import os
+
+os.environ['CYBER_RUNNER_HEADLESS'] = '1'
+
+import numpy as np
+import pytest
+
+import Project_22101090 as game
+
+COARSE_HZ = 5.0
+
+
+@pytest.fixture
+def coarse_physics():
+    game.set_physics_rate(COARSE_HZ)
+    yield
+    game.set_physics_rate(game.PHYSICS_HZ)
+
+
+@pytest.mark.parametrize('start_z', [-2.0, 1.0])
+def test_obstacle_inside_hit_box_is_hit_at_coarse_rate(coarse_physics, start_z):
+    game.begin_headless_session([0.0], seed=1, god_mode=False)
+    game.obstacles.clear()
+    game.collectibles.clear()
+    game.spawn_obstacle(lane=1, z=start_z, obs_type='barrier', direction=1, rot=0.0, phase=0.0)
+
+    game.advance_physics()
+
+    assert game.player_health == game.PLAYER_START_HEALTH - 1
+    assert game.stats_hits_by_type.get('barrier') == 1
+    assert game.stats_obstacles_dodged == 0
+
+
+@pytest.mark.parametrize('start_z', [-2.0, 1.0])
+def test_batch_obstacle_inside_hit_box_is_hit_at_coarse_rate(coarse_physics, start_z):
+    sim = game.BatchSimulation([1], max_ticks=10)
+    sim.obs_alive[:] = False
+    sim.col_alive[:] = False
+    sim.obs_alive[0, 0] = True
+    sim.obs_type[0, 0] = game.OBSTACLE_TYPES.index('barrier')
+    sim.obs_x[0, 0] = 0.0
+    sim.obs_z[0, 0] = start_z
+
+    live = np.array([True])
+    delta = sim.speed * game.physics_step
+    sim.step_world(live, game.physics_step, delta, 0.0)
+    sim.check_collisions(live, delta, 0.0)
+
+    assert sim.health[0] == game.PLAYER_START_HEALTH - 1
+    assert sim.hits[0, game.OBSTACLE_TYPES.index('barrier')] == 1
+    assert sim.dodged[0] == 0